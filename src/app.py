@@ -5,16 +5,27 @@ from db.connection import db, create_db_uri
 from routes.user_routes import user_routes
 from routes.activities_routes import activities_routes
 from routes.semesters import semester_routes
-from routes.export_routes import export_routes
+from routes.export_routes import export_routes, preload_export_controllers
 from apscheduler.schedulers.background import BackgroundScheduler
 from utils.inactive_users import mark_inactive_users
 from routes.research_hotbed_routes import research_hotbed_routes
 from routes.user_research_hotbed_routes import users_research_hotbed_routes
+from utils.logging_config import configure_logging, init_request_id
+from utils.query_stats import init_query_stats
+from utils.last_login import init_last_login_flush
+from utils.semester_summary import rebuild_semester_summaries_command
 
 def create_app():
     app = Flask(__name__) 
     CORS(app)
 
+    # Logs por módulo con nivel según LOG_LEVEL y escritura en segundo plano
+    configure_logging()
+    init_request_id(app)
+
+    # Con QUERY_STATS=1 las respuestas incluyen X-Query-Count y Server-Timing
+    init_query_stats(app)
+
     # Configuración de la base de datos
     app.config['SQLALCHEMY_DATABASE_URI'] = create_db_uri()
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -31,11 +42,26 @@ def create_app():
     app.register_blueprint(users_research_hotbed_routes)
     app.register_blueprint(export_routes)
 
+    # Comandos de mantenimiento (flask --app app rebuild-semester-summaries)
+    app.cli.add_command(rebuild_semester_summaries_command)
+
+    # Worker dedicado a exportaciones: carga pandas/openpyxl/reportlab al iniciar
+    # en lugar de hacerlo en la primera descarga
+    if os.getenv('EXPORT_PRELOAD', '').lower() in ('1', 'true'):
+        preload_export_controllers()
+
     # Inicialización de APScheduler
     scheduler = BackgroundScheduler()
     
     # Agregar job que marque los usuarios inactivos cada 24 horas
-    scheduler.add_job(mark_inactive_users, 'interval', hours=24)
+    def mark_inactive_users_job():
+        with app.app_context():
+            mark_inactive_users()
+
+    scheduler.add_job(mark_inactive_users_job, 'interval', hours=24)
+
+    # Fechas de último login acumuladas en memoria: escritura periódica y al apagar
+    init_last_login_flush(app, scheduler)
 
     # Iniciar el scheduler
     scheduler.start()
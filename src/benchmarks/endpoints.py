@@ -0,0 +1,359 @@
+"""
+Benchmark de los endpoints de la API sobre una base sintética.
+
+Recorre todas las rutas con el cliente de pruebas de Flask y, por endpoint,
+reporta la latencia p50/p95, el número de consultas SQL, la memoria máxima
+asignada durante la solicitud (tracemalloc) y el tamaño de la respuesta. El
+resultado se guarda como JSON para comparar ejecuciones en el tiempo.
+
+La base se copia a un directorio temporal antes de empezar: las rutas de
+escritura no modifican el archivo generado por benchmarks.seed y cada
+ejecución parte de los mismos datos. Las latencias se miden sin tracemalloc;
+la memoria se mide en una solicitud adicional.
+
+Uso (desde src/):
+    python -m benchmarks.seed --database /tmp/sigisi_bench.sqlite
+    python -m benchmarks.endpoints --database /tmp/sigisi_bench.sqlite --output resultados.json
+    python -m benchmarks.endpoints --database /tmp/sigisi_bench.sqlite --only export --compare resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import event, select, func
+from benchmarks.seed import create_benchmark_app, BENCHMARK_PASSWORD
+
+DEFAULT_RUNS = int(os.getenv('ENDPOINT_BENCHMARK_RUNS', 10))
+
+# path es una plantilla ('/get/activities/{activity_id}') que se completa con el
+# contexto de la muestra (ids de ejemplo y lo que devuelva setup); body puede
+# ser una función de ese contexto. setup se ejecuta antes de cada solicitud y
+# no se mide
+Endpoint = namedtuple('Endpoint', ['name', 'method', 'path', 'body', 'setup'], defaults=(None, None))
+
+def sample_context(client):
+    """Ids de ejemplo de la base (el semillero, usuario y semestre con más actividades) y un token"""
+    from db.connection import db
+    from models.users import User
+    from models.research_hotbed import ResearchHotbed
+    from models.users_research_hotbed import UsersResearchHotbed
+    from models.activities_researchHotbed import ActivitiesResearchHotbed
+    from models.activity_semester_summary import ActivitySemesterSummary
+
+    busiest_hotbed = db.session.execute(
+        select(ActivitySemesterSummary.scope_id, ActivitySemesterSummary.semester)
+        .where(ActivitySemesterSummary.scope == 'hotbed')
+        .order_by(ActivitySemesterSummary.total_activities.desc())
+        .limit(1)
+    ).first()
+    if busiest_hotbed is None:
+        raise SystemExit("La base no tiene actividades: genérela con python -m benchmarks.seed")
+    hotbed_id, semester = busiest_hotbed
+
+    user_id = db.session.execute(
+        select(ActivitySemesterSummary.scope_id)
+        .where(ActivitySemesterSummary.scope == 'user', ActivitySemesterSummary.semester == semester)
+        .order_by(ActivitySemesterSummary.total_activities.desc())
+        .limit(1)
+    ).scalar()
+    hotbed = db.session.get(ResearchHotbed, hotbed_id)
+    user = db.session.get(User, user_id)
+    membership_id = db.session.execute(
+        select(UsersResearchHotbed.idusersResearchHotbed).where(UsersResearchHotbed.user_iduser == user_id).limit(1)
+    ).scalar()
+    activity_id = db.session.execute(
+        select(func.min(ActivitiesResearchHotbed.idactivitiesResearchHotbed))
+        .where(ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == membership_id)
+    ).scalar()
+    user_ids = db.session.execute(
+        select(UsersResearchHotbed.user_iduser).where(UsersResearchHotbed.researchHotbed_idresearchHotbed == hotbed_id).limit(20)
+    ).scalars().all()
+
+    response = client.post('/login', json={'email_user': user.email_user, 'password_user': BENCHMARK_PASSWORD})
+    if response.status_code != 200:
+        raise SystemExit(f"No se pudo iniciar sesión con el usuario de ejemplo: {response.get_json()}")
+
+    return {
+        'token': response.get_json()['token'],
+        'email': user.email_user,
+        'user_id': user_id,
+        'user_ids': user_ids,
+        'hotbed_id': hotbed_id,
+        'faculty': hotbed.faculty_researchHotbed,
+        'membership_id': membership_id,
+        'activity_id': activity_id,
+        'semester': semester
+    }
+
+def _activity_body(ctx):
+    return {
+        'title': 'Actividad del benchmark',
+        'date': '2025-03-10',
+        'description': 'Actividad registrada por el benchmark',
+        'type': 'actividad',
+        'duration': 2,
+        'semester': ctx['semester'],
+        'userResearchHotbedId': ctx['membership_id'],
+        'authors_ids': [ctx['membership_id']],
+        'co_authors_ids': []
+    }
+
+def _user_body(ctx):
+    return {
+        'email_user': f"benchmark.registro{time.time_ns()}@benchmark.edu",
+        'password_user': BENCHMARK_PASSWORD,
+        'idSigaa_user': f"R{time.time_ns()}",
+        'name_user': 'Usuario Registrado',
+        'status_user': 'Activo',
+        'type_user': 'Estudiante',
+        'academicProgram_user': 'Ingeniería de Sistemas',
+        'termsAccepted_user': True,
+        'termsAcceptedAt_user': '2025-01-01 00:00:00',
+        'termsVersion_user': '1.0'
+    }
+
+def _register_activity(client, ctx):
+    """Actividad nueva para el benchmark de eliminación"""
+    response = client.post('/registerActivity', json=_activity_body(ctx), headers=_auth(ctx))
+    return {'new_activity_id': response.get_json()['activity_id']}
+
+def _register_user(client, ctx):
+    """Usuario nuevo (sin semilleros) para el benchmark de membresías"""
+    from models.users import User
+    body = _user_body(ctx)
+    client.post('/register', json=body)
+    return {'new_user_id': User.query.filter_by(email_user=body['email_user']).first().iduser}
+
+def _finished_job(client, ctx):
+    """Exportación encolada y terminada para consultar su estado y descargarla"""
+    from utils.export_jobs import export_jobs
+    response = client.post('/export/jobs', headers=_auth(ctx), json={
+        'type': 'research_hotbed', 'research_hotbed_id': ctx['hotbed_id'], 'semester': ctx['semester']
+    })
+    job_id = response.get_json()['job_id']
+    export_jobs.wait(job_id, timeout=300)
+    return {'job_id': job_id}
+
+def _auth(ctx):
+    return {'Authorization': f"Bearer {ctx['token']}"}
+
+def build_endpoints():
+    """Una entrada por ruta de la API (y por formato en las exportaciones)"""
+    return [
+        # Usuarios
+        Endpoint('login', 'POST', '/login', lambda ctx: {'email_user': ctx['email'], 'password_user': BENCHMARK_PASSWORD}),
+        Endpoint('register_user', 'POST', '/register', _user_body),
+        Endpoint('user', 'GET', '/user'),
+        Endpoint('user_update', 'PUT', '/user/update', {'academicProgram_user': 'Ingeniería de Sistemas'}),
+        Endpoint('user_activities', 'GET', '/user/activities?semester={semester}'),
+        Endpoint('user_activities_page', 'GET', '/user/activities?limit=50'),
+        Endpoint('all_users', 'GET', '/allUsers'),
+        Endpoint('update_any_user', 'PUT', '/update/{user_id}', {'academicProgram_user': 'Ingeniería de Sistemas'}),
+        Endpoint('user_activities_profile', 'GET', '/getUserActivities'),
+        # Semestres
+        Endpoint('semesters', 'GET', '/semesters'),
+        Endpoint('current_semester', 'GET', '/semesters/current'),
+        # Semilleros y membresías
+        Endpoint('register_hotbed', 'POST', '/registerResearchHotbed', lambda ctx: {
+            'name_researchHotbed': f'Semillero benchmark {time.time_ns()}',
+            'universityBranch_researchHotbed': 'Sede Principal',
+            'acronym_researchHotbed': 'SBX',
+            'faculty_researchHotbed': ctx['faculty'],
+            'status_researchHotbed': 'Activo',
+            'dateCreation_researchHotbed': '2025-01-01'
+        }),
+        Endpoint('all_hotbeds', 'GET', '/getAllResearchHotbeds'),
+        Endpoint('update_hotbed', 'PUT', '/update/researchHotbed/{hotbed_id}', {'status_researchHotbed': 'Activo'}),
+        Endpoint('add_hotbed_member', 'POST', '/add/user-research-hotbeds/{hotbed_id}/users/{new_user_id}',
+                 {'TypeUser_usersResearchHotbed': 'Estudiante'}, setup=_register_user),
+        Endpoint('hotbed_members', 'GET', '/get/user-research-hotbeds/{hotbed_id}/users'),
+        Endpoint('hotbed_members_legacy', 'GET', '/getUsersByResearchHotbed/{hotbed_id}'),
+        Endpoint('update_hotbed_member', 'PUT', '/update/users-research-hotbeds/{membership_id}',
+                 {'status_usersResearchHotbed': 'Activo'}),
+        Endpoint('user_hotbeds', 'GET', '/get/users/{user_id}/by/research-hotbeds'),
+        # Actividades
+        Endpoint('register_activity', 'POST', '/registerActivity', _activity_body),
+        Endpoint('activity_details', 'GET', '/get/activities/{activity_id}'),
+        Endpoint('activity_cache_stats', 'GET', '/get/activities/cache/stats'),
+        Endpoint('hotbed_activities', 'GET', '/get/research-hotbeds/{hotbed_id}/activities?semester={semester}'),
+        Endpoint('hotbed_activities_page', 'GET', '/get/research-hotbeds/{hotbed_id}/activities?limit=50'),
+        Endpoint('hotbed_activities_legacy', 'GET', '/getActivitiesByResearchHotbed/{hotbed_id}'),
+        Endpoint('update_activity', 'PUT', '/updateActivity/{activity_id}', {'duration': 4}),
+        Endpoint('delete_activity', 'DELETE', '/deleteActivity/{new_activity_id}', setup=_register_activity),
+        # Exportaciones
+        Endpoint('export_hotbed_excel', 'GET', '/export/research-hotbed/{hotbed_id}/excel?semester={semester}'),
+        Endpoint('export_hotbed_csv', 'GET', '/export/research-hotbed/{hotbed_id}/excel?semester={semester}&format=csv'),
+        Endpoint('export_hotbed_pdf', 'GET', '/export/research-hotbed/{hotbed_id}/pdf?semester={semester}'),
+        Endpoint('export_faculty_excel', 'GET', '/export/research-hotbeds/excel?semester={semester}&faculty={faculty}'),
+        Endpoint('export_user_excel', 'GET', '/export/user/{user_id}/excel?semester={semester}'),
+        Endpoint('export_user_ndjson', 'GET', '/export/user/{user_id}/excel?semester={semester}&format=ndjson'),
+        Endpoint('export_user_pdf_alias', 'GET', '/export/user/{user_id}/pdf?semester={semester}'),
+        Endpoint('export_users_excel', 'POST', '/export/users/excel',
+                 lambda ctx: {'user_ids': ctx['user_ids'], 'semester': ctx['semester']}),
+        Endpoint('export_users_bundle', 'POST', '/export/users/excel',
+                 lambda ctx: {'user_ids': ctx['user_ids'], 'semester': ctx['semester'], 'mode': 'bundle'}),
+        Endpoint('export_users_csv', 'POST', '/export/users/excel',
+                 lambda ctx: {'user_ids': ctx['user_ids'], 'semester': ctx['semester'], 'format': 'csv'}),
+        Endpoint('export_users_pdf_alias', 'POST', '/export/users/pdf',
+                 lambda ctx: {'user_ids': ctx['user_ids'], 'semester': ctx['semester']}),
+        Endpoint('export_user_preview', 'GET', '/export/user/{user_id}/preview?semester={semester}'),
+        Endpoint('export_job_create', 'POST', '/export/jobs',
+                 lambda ctx: {'type': 'user', 'user_id': ctx['user_id'], 'semester': ctx['semester']}),
+        Endpoint('export_job_status', 'GET', '/export/jobs/{job_id}', setup=_finished_job),
+        Endpoint('export_job_file', 'GET', '/export/jobs/{job_id}/file', setup=_finished_job),
+    ]
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+def run_endpoint(client, endpoint, ctx, runs, statements):
+    """Ejecuta el endpoint runs veces (más una para memoria) y devuelve sus métricas"""
+    latencies, queries, sizes, statuses = [], [], [], set()
+
+    def request(measure_memory=False):
+        request_ctx = {**ctx, **(endpoint.setup(client, ctx) if endpoint.setup else {})}
+        path = endpoint.path.format(**request_ctx)
+        body = endpoint.body(request_ctx) if callable(endpoint.body) else endpoint.body
+
+        if measure_memory:
+            tracemalloc.start()
+        statements.clear()
+        started = time.perf_counter()
+        response = client.open(path, method=endpoint.method, json=body, headers=_auth(ctx))
+        # Las descargas en streaming se generan al leer el cuerpo
+        data = response.get_data()
+        elapsed = time.perf_counter() - started
+        response.close()
+
+        peak = None
+        if measure_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return elapsed, len(statements), len(data), response.status_code, peak
+
+    request()  # Calentamiento: imports diferidos, cachés y pools
+    for _ in range(runs):
+        elapsed, query_count, size, status, _ = request()
+        latencies.append(elapsed * 1000)
+        queries.append(query_count)
+        sizes.append(size)
+        statuses.add(status)
+    _, _, _, _, peak = request(measure_memory=True)
+
+    return {
+        'method': endpoint.method,
+        'path': endpoint.path,
+        'status': sorted(statuses),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(_percentile(latencies, 0.95), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'queries': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'response_bytes': int(statistics.median(sizes))
+    }
+
+def run_benchmark(database, runs=DEFAULT_RUNS, only=None):
+    """Copia la base, recorre los endpoints y devuelve el reporte completo"""
+    from db.connection import db
+
+    workdir = tempfile.mkdtemp(prefix='sigisi_bench_')
+    # Caché de archivos y spool de exportaciones propios de esta ejecución
+    os.environ['EXPORT_CACHE_DIR'] = os.path.join(workdir, 'export_cache')
+    os.environ['EXPORT_SPOOL_DIR'] = os.path.join(workdir, 'exports')
+    database_copy = os.path.join(workdir, 'bench.sqlite')
+    shutil.copyfile(database, database_copy)
+
+    app = create_benchmark_app(f'sqlite:///{database_copy}')
+    endpoints = [endpoint for endpoint in build_endpoints() if not only or only in endpoint.name]
+    results = {}
+
+    try:
+        with app.app_context():
+            db.create_all()  # Tablas nuevas que la base sembrada aún no tenga
+            client = app.test_client()
+            ctx = sample_context(client)
+
+            statements = []
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                for endpoint in endpoints:
+                    results[endpoint.name] = run_endpoint(client, endpoint, ctx, runs, statements)
+                    print(_format_row(endpoint.name, results[endpoint.name]), flush=True)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            db.session.remove()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'database': os.path.abspath(database),
+        'database_bytes': os.path.getsize(database),
+        'runs': runs,
+        'sample': {key: value for key, value in ctx.items() if key != 'token'},
+        'endpoints': results
+    }
+
+def _format_row(name, result):
+    return (f"{name:<28} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['queries']:>6} "
+            f"{result['peak_memory_kb']:>10.0f} {result['response_bytes']:>10} {','.join(map(str, result['status']))}")
+
+def compare_reports(previous, current):
+    """Líneas con la variación de p50, p95 y consultas respecto a un reporte anterior"""
+    lines = [f"{'endpoint':<28} {'p50 ms':>16} {'p95 ms':>16} {'consultas':>10}"]
+    for name, result in current['endpoints'].items():
+        before = previous['endpoints'].get(name)
+        if before is None:
+            lines.append(f"{name:<28} (nuevo)")
+            continue
+
+        def delta(key):
+            if not before[key]:
+                return f"{result[key]:>8}"
+            return f"{result[key]:>8} ({(result[key] - before[key]) / before[key]:+.0%})"
+
+        lines.append(f"{name:<28} {delta('p50_ms'):>16} {delta('p95_ms'):>16} "
+                     f"{before['queries']:>4}->{result['queries']:<4}")
+    return lines
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los endpoints sobre una base sintética")
+    parser.add_argument('--database', required=True, help="Base SQLite generada con benchmarks.seed")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="Solicitudes medidas por endpoint")
+    parser.add_argument('--only', help="Solo los endpoints cuyo nombre contiene este texto")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el reporte")
+    parser.add_argument('--compare', help="Reporte JSON anterior para comparar")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        parser.error(f"No existe la base {args.database} (usar python -m benchmarks.seed)")
+
+    print(f"{'endpoint':<28} {'p50 ms':>9} {'p95 ms':>9} {'cons.':>6} {'mem. KB':>10} {'bytes':>10} estado")
+    report = run_benchmark(args.database, runs=args.runs, only=args.only)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f"Reporte guardado en {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous_file:
+            previous = json.load(previous_file)
+        print()
+        print('\n'.join(compare_reports(previous, report)))
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
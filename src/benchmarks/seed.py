@@ -0,0 +1,280 @@
+"""
+Conjunto de datos sintético para los benchmarks de la API.
+
+Crea (o completa) una base SQLite con usuarios, semilleros, membresías,
+actividades con sus autores y co-autores, y proyectos, productos y
+reconocimientos repartidos en varios semestres. Las filas se insertan en bloque
+y con una semilla fija, así dos ejecuciones con los mismos parámetros generan
+los mismos datos. Al final se reconstruye la tabla de resumen por semestre.
+
+Todos los usuarios tienen la contraseña BENCHMARK_PASSWORD.
+
+Uso (desde src/):
+    python -m benchmarks.seed --database /tmp/sigisi_bench.sqlite
+    python -m benchmarks.seed --database /tmp/sigisi_bench.sqlite --users 2000 --hotbeds 60 --activities 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+DEFAULT_COUNTS = {
+    'users': 500,
+    'hotbeds': 25,
+    'memberships_per_user': 2,  # Máximo de semilleros por usuario
+    'activities': 5000,
+    'max_co_authors': 3
+}
+
+DEFAULT_SEMESTERS = ('semestre-1-2024', 'semestre-2-2024', 'semestre-1-2025', 'semestre-2-2025')
+
+# Filas por INSERT en bloque
+INSERT_BATCH_SIZE = 1000
+
+FACULTIES = ('Ingeniería', 'Ciencias Básicas', 'Ciencias de la Salud', 'Arquitectura', 'Derecho', 'Economía')
+BRANCHES = ('Sede Principal', 'Sede Norte', 'Sede Sur')
+USER_TYPES = ('Estudiante', 'Estudiante', 'Estudiante', 'Profesor', 'Egresado')
+PROGRAMS = ('Ingeniería de Sistemas', 'Ingeniería Civil', 'Medicina', 'Arquitectura', 'Derecho', 'Economía')
+
+# Tipo de actividad -> peso en la muestra
+ACTIVITY_TYPES = {'actividad': 30, 'proyecto': 30, 'producto': 25, 'reconocimiento': 15}
+
+def create_benchmark_app(database_uri):
+    """Aplicación con todas las rutas sobre la base indicada (sin scheduler)"""
+    # Imports diferidos: las variables de entorno de la caché y del spool de
+    # exportaciones se leen al importar los módulos de rutas
+    from flask import Flask
+    from db.connection import db
+    from routes.user_routes import user_routes
+    from routes.activities_routes import activities_routes
+    from routes.semesters import semester_routes
+    from routes.export_routes import export_routes
+    from routes.research_hotbed_routes import research_hotbed_routes
+    from routes.user_research_hotbed_routes import users_research_hotbed_routes
+    import models.activity_semester_summary  # noqa: F401
+    import models.listing_version  # noqa: F401
+
+    # El login firma el token con la variable de entorno y el middleware lo
+    # valida con la configuración de la aplicación
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SECRET_KEY'] = os.environ['SECRET_KEY']
+    db.init_app(app)
+
+    for blueprint in (user_routes, activities_routes, semester_routes, research_hotbed_routes,
+                      users_research_hotbed_routes, export_routes):
+        app.register_blueprint(blueprint)
+
+    return app
+
+def semester_dates(semester):
+    """Fecha de inicio y de fin de un semestre 'semestre-N-AAAA'"""
+    _, number, year = semester.split('-')
+    if number == '1':
+        return date(int(year), 1, 15), date(int(year), 6, 15)
+    return date(int(year), 7, 15), date(int(year), 12, 1)
+
+def _bulk_insert(model, rows):
+    """INSERT en bloque y devuelve los ids generados, en orden de inserción"""
+    from db.connection import db
+
+    table = model.__table__
+    primary_key = table.primary_key.columns[0]
+    first_id = (db.session.execute(select(func.max(primary_key))).scalar() or 0) + 1
+
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + INSERT_BATCH_SIZE])
+
+    return list(db.session.execute(
+        select(primary_key).where(primary_key >= first_id).order_by(primary_key)
+    ).scalars())
+
+def seed_database(counts=None, semesters=DEFAULT_SEMESTERS, seed=42):
+    """
+    Inserta el conjunto de datos en la base de la aplicación actual y devuelve
+    el número de filas creadas por tabla. Debe llamarse dentro del contexto de
+    la aplicación.
+    """
+    from db.connection import db
+    from models.users import User
+    from models.research_hotbed import ResearchHotbed
+    from models.users_research_hotbed import UsersResearchHotbed
+    from models.activities_researchHotbed import ActivitiesResearchHotbed
+    from models.activity_authors import ActivityAuthors
+    from models.projects_researchHotbed import ProjectsResearchHotbed
+    from models.products_researchHotbed import ProductsResearchHotbed
+    from models.recognitions_researchHotbed import RecognitionsResearchHotbed
+    from controllers.users.register_controller import hash_password
+    from utils.semester_summary import rebuild_semester_summaries
+
+    counts = {**DEFAULT_COUNTS, **(counts or {})}
+    rng = random.Random(seed)
+    now = datetime.now()
+    # Un solo hash para todos: hashear miles de contraseñas no aporta al benchmark
+    password = hash_password(BENCHMARK_PASSWORD)
+    # Numeración a partir de los usuarios existentes (correo e ID SIGAA únicos
+    # si se siembra varias veces sobre la misma base)
+    offset = db.session.execute(select(func.count()).select_from(User)).scalar()
+
+    user_types = [rng.choice(USER_TYPES) for _ in range(counts['users'])]
+    user_ids = _bulk_insert(User, [{
+        'email_user': f'usuario{offset + index}@benchmark.edu',
+        'password_user': password,
+        'idSigaa_user': f'BM{offset + index:07d}',
+        'name_user': f'Usuario Benchmark {offset + index}',
+        'status_user': 'Activo' if rng.random() < 0.9 else 'Inactivo',
+        'type_user': user_types[index],
+        'academicProgram_user': rng.choice(PROGRAMS),
+        'termsAccepted_user': True,
+        'termsAcceptedAt_user': now,
+        'termsVersion_user': '1.0',
+        'lastDayLogin_user': now - timedelta(days=rng.randint(0, 200))
+    } for index in range(counts['users'])])
+
+    hotbed_ids = _bulk_insert(ResearchHotbed, [{
+        'name_researchHotbed': f'Semillero Benchmark {index}',
+        'universityBranch_researchHotbed': rng.choice(BRANCHES),
+        'acronym_researchHotbed': f'SB{index}',
+        'faculty_researchHotbed': rng.choice(FACULTIES),
+        'status_researchHotbed': 'Activo',
+        'dateCreation_researchHotbed': now.strftime('%Y-%m-%d')
+    } for index in range(counts['hotbeds'])])
+
+    membership_rows = []
+    for index, user_id in enumerate(user_ids):
+        joined = rng.sample(hotbed_ids, min(len(hotbed_ids), rng.randint(1, counts['memberships_per_user'])))
+        for hotbed_id in joined:
+            membership_rows.append({
+                'user_iduser': user_id,
+                'researchHotbed_idresearchHotbed': hotbed_id,
+                'TypeUser_usersResearchHotbed': user_types[index],
+                'status_usersResearchHotbed': 'Activo' if rng.random() < 0.85 else 'Inactivo',
+                'dateEnter_usersResearchHotbed': date(2023, 1, 1) + timedelta(days=rng.randint(0, 700))
+            })
+    membership_ids = _bulk_insert(UsersResearchHotbed, membership_rows)
+
+    members_by_hotbed = {}
+    for membership_id, row in zip(membership_ids, membership_rows):
+        members_by_hotbed.setdefault(row['researchHotbed_idresearchHotbed'], []).append(membership_id)
+
+    # Tipo, creador y semestre de cada actividad
+    types = rng.choices(list(ACTIVITY_TYPES), weights=list(ACTIVITY_TYPES.values()), k=counts['activities'])
+    creators = [rng.choice(membership_ids) for _ in types]
+    activity_semesters = [rng.choice(semesters) for _ in types]
+
+    project_ids = iter(_bulk_insert(ProjectsResearchHotbed, [{
+        'name_projectsResearchHotbed': f'Proyecto {index}',
+        'referenceNumber_projectsResearchHotbed': f'PRY-{index:06d}',
+        'startDate_projectsResearchHotbed': date(2024, 1, 15),
+        'endDate_projectsResearchHotbed': date(2025, 12, 1) if rng.random() < 0.7 else None,
+        'principalResearcher_projectsResearchHotbed': f'Investigador {index}'
+    } for index in range(types.count('proyecto'))]))
+
+    product_ids = iter(_bulk_insert(ProductsResearchHotbed, [{
+        'category_productsResearchHotbed': rng.choice(('Generación de nuevo conocimiento', 'Apropiación social')),
+        'type_productsResearchHotbed': rng.choice(('Artículo', 'Ponencia', 'Software', 'Capítulo de libro')),
+        'description_productsResearchHotbed': f'Producto de investigación {index}',
+        'datePublication_productsResearchHotbed': date(2024, 1, 1) + timedelta(days=rng.randint(0, 700))
+    } for index in range(types.count('producto'))]))
+
+    recognition_ids = iter(_bulk_insert(RecognitionsResearchHotbed, [{
+        'name_recognitionsResearchHotbed': f'Reconocimiento {index}',
+        'projectName_recognitionsResearchHotbed': f'Proyecto reconocido {index}',
+        'participantsNames_recognitionsResearchHotbed': None,
+        'organizationName_recognitionsResearchHotbed': rng.choice(('Minciencias', 'RedCOLSI', 'Universidad'))
+    } for index in range(types.count('reconocimiento'))]))
+
+    activity_rows = []
+    for index, (activity_type, creator, semester) in enumerate(zip(types, creators, activity_semesters)):
+        start, end = semester_dates(semester)
+        activity_rows.append({
+            'title_activitiesResearchHotbed': f'{activity_type.capitalize()} benchmark {index}',
+            'responsible_activitiesResearchHotbed': f'Responsable {index}',
+            'date_activitiesResearchHotbed': start + timedelta(days=rng.randint(0, (end - start).days)),
+            'description_activitiesResearchHotbed': f'Descripción de la actividad sintética {index}',
+            'type_activitiesResearchHotbed': activity_type,
+            'category': 'general',
+            'duration_activitiesResearchHotbed': rng.choice((1, 2, 4, 8, 16, 40)),
+            'approvedFreeHours_activitiesResearchHotbed': 1.0 if rng.random() < 0.6 else None,
+            'semester': semester,
+            'updated_at': now,
+            'usersResearchHotbed_idusersResearchHotbed': creator,
+            'projectsResearchHotbed_idprojectsResearchHotbed': next(project_ids) if activity_type == 'proyecto' else None,
+            'productsResearchHotbed_idproductsResearchHotbed': next(product_ids) if activity_type == 'producto' else None,
+            'recognitionsResearchHotbed_idrecognitionsResearchHotbed': next(recognition_ids) if activity_type == 'reconocimiento' else None
+        })
+    activity_ids = _bulk_insert(ActivitiesResearchHotbed, activity_rows)
+
+    # Autor principal: el creador; co-autores: otros miembros del mismo semillero
+    hotbed_by_membership = {
+        membership_id: row['researchHotbed_idresearchHotbed']
+        for membership_id, row in zip(membership_ids, membership_rows)
+    }
+    author_rows = []
+    for activity_id, creator in zip(activity_ids, creators):
+        author_rows.append({'activity_id': activity_id, 'user_research_hotbed_id': creator, 'is_main_author': True,
+                            'created_at': now, 'updated_at': now})
+        candidates = [m for m in members_by_hotbed[hotbed_by_membership[creator]] if m != creator]
+        for co_author in rng.sample(candidates, min(len(candidates), rng.randint(0, counts['max_co_authors']))):
+            author_rows.append({'activity_id': activity_id, 'user_research_hotbed_id': co_author, 'is_main_author': False,
+                                'created_at': now, 'updated_at': now})
+    _bulk_insert(ActivityAuthors, author_rows)
+
+    db.session.commit()
+    summaries = rebuild_semester_summaries()
+
+    return {
+        'users': len(user_ids),
+        'hotbeds': len(hotbed_ids),
+        'memberships': len(membership_ids),
+        'activities': len(activity_ids),
+        'authors': len(author_rows),
+        'projects': types.count('proyecto'),
+        'products': types.count('producto'),
+        'recognitions': types.count('reconocimiento'),
+        'semester_summaries': summaries
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una base SQLite sintética para los benchmarks")
+    parser.add_argument('--database', required=True, help="Archivo SQLite (se crea si no existe)")
+    parser.add_argument('--users', type=int, default=DEFAULT_COUNTS['users'])
+    parser.add_argument('--hotbeds', type=int, default=DEFAULT_COUNTS['hotbeds'])
+    parser.add_argument('--memberships-per-user', type=int, default=DEFAULT_COUNTS['memberships_per_user'])
+    parser.add_argument('--activities', type=int, default=DEFAULT_COUNTS['activities'])
+    parser.add_argument('--max-co-authors', type=int, default=DEFAULT_COUNTS['max_co_authors'])
+    parser.add_argument('--semesters', default=','.join(DEFAULT_SEMESTERS), help="Semestres separados por coma")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from db.connection import db
+
+    app = create_benchmark_app(f'sqlite:///{os.path.abspath(args.database)}')
+    counts = {
+        'users': args.users,
+        'hotbeds': args.hotbeds,
+        'memberships_per_user': args.memberships_per_user,
+        'activities': args.activities,
+        'max_co_authors': args.max_co_authors
+    }
+
+    started = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        created = seed_database(counts, semesters=tuple(args.semesters.split(',')), seed=args.seed)
+
+    print(f"Base {args.database} generada en {time.perf_counter() - started:.1f} s")
+    for table, count in created.items():
+        print(f"  {table}: {count}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark de arranque de la API sin exportaciones.
+
+Importa app.py en un proceso nuevo con `python -X importtime`, mide el tiempo
+acumulado de importación y la memoria residente máxima, y falla (código de
+salida 1) si se cargan los módulos pesados de exportación o si se superan los
+presupuestos.
+
+Uso (desde src/):
+    python -m benchmarks.startup_imports
+    STARTUP_IMPORT_BUDGET_MS=800 STARTUP_RSS_BUDGET_MB=120 python -m benchmarks.startup_imports
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que solo deben cargarse con la primera exportación
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'reportlab')
+
+IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', 1500))
+RSS_BUDGET_MB = float(os.getenv('STARTUP_RSS_BUDGET_MB', 100))
+RUNS = int(os.getenv('STARTUP_BENCHMARK_RUNS', 5))
+
+_PROBE = """
+import json, resource, sys
+import app
+heavy = [name for name in {heavy!r} if name in sys.modules]
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'heavy_modules': heavy, 'rss_kb': rss_kb}}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_startup():
+    """Importa app en un proceso nuevo y devuelve import_ms, rss_mb y heavy_modules"""
+    env = {**os.environ, 'SECRET_KEY': os.getenv('SECRET_KEY', 'benchmark')}
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    # Tiempo acumulado del módulo app (incluye todo lo que importa)
+    import_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(3) == ' ' and match.group(4) == 'app':
+            import_us = int(match.group(2))
+
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        'import_ms': import_us / 1000,
+        'rss_mb': probe['rss_kb'] / 1024,
+        'heavy_modules': probe['heavy_modules']
+    }
+
+def main():
+    results = [measure_startup() for _ in range(RUNS)]
+    import_ms = statistics.median(result['import_ms'] for result in results)
+    rss_mb = statistics.median(result['rss_mb'] for result in results)
+    heavy_modules = sorted({name for result in results for name in result['heavy_modules']})
+
+    print(f"Importación de app: {import_ms:.0f} ms (presupuesto {IMPORT_BUDGET_MS:.0f} ms)")
+    print(f"Memoria residente: {rss_mb:.1f} MB (presupuesto {RSS_BUDGET_MB:.0f} MB)")
+
+    errors = []
+    if heavy_modules:
+        errors.append(f"Módulos de exportación cargados al iniciar: {', '.join(heavy_modules)}")
+    if import_ms > IMPORT_BUDGET_MS:
+        errors.append("El tiempo de importación supera el presupuesto")
+    if rss_mb > RSS_BUDGET_MB:
+        errors.append("La memoria residente supera el presupuesto")
+
+    for error in errors:
+        print(f"ERROR: {error}")
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,40 +1,49 @@
 from flask import jsonify
 from models.activities_researchHotbed import ActivitiesResearchHotbed
-from models.projects_researchHotbed import ProjectsResearchHotbed
-from models.products_researchHotbed import ProductsResearchHotbed
-from models.recognitions_researchHotbed import RecognitionsResearchHotbed
 from models.activity_authors import ActivityAuthors
 from db.connection import db
+from utils.activity_loaders import activity_loader_options, ACTIVITY_ENTITY_LOADS
+from utils.listing_versions import activity_listing_scopes, bump_listing_versions
+from utils.activity_cache import invalidate_activity_details
+from utils.export_cache import invalidate_hotbed_exports, invalidate_user_exports
+from utils.semester_summary import activity_contributions, apply_summary_changes
 
 def delete_activity(activity_id):
     try:
-        # Buscar la actividad existente
-        activity = ActivitiesResearchHotbed.query.get(activity_id)
+        # Buscar la actividad existente junto con su proyecto, producto y
+        # reconocimiento (mismo SELECT)
+        activity = db.session.get(
+            ActivitiesResearchHotbed, activity_id,
+            options=activity_loader_options('detail', only=ACTIVITY_ENTITY_LOADS)
+        )
         if not activity:
             return jsonify({"message": "Informe no encontrado"}), 404
 
+        # Invalidar los listados donde aparecía la actividad (ETag); la versión
+        # cambia aunque el número de actividades y MAX(updated_at) no lo reflejen
+        hotbed_ids, user_ids = activity_listing_scopes([activity_id])
+        bump_listing_versions(hotbed_ids, user_ids)
+        # Aporte de la actividad a los totales por semestre, que se resta al final
+        previous_summary = activity_contributions([activity_id])
+
         # Eliminar las relaciones de autoría primero
         ActivityAuthors.query.filter_by(activity_id=activity_id).delete()
 
         # Eliminar entidades relacionadas si existen
-        if activity.projectsResearchHotbed_idprojectsResearchHotbed:
-            project = ProjectsResearchHotbed.query.get(activity.projectsResearchHotbed_idprojectsResearchHotbed)
-            if project:
-                db.session.delete(project)
-
-        if activity.productsResearchHotbed_idproductsResearchHotbed:
-            product = ProductsResearchHotbed.query.get(activity.productsResearchHotbed_idproductsResearchHotbed)
-            if product:
-                db.session.delete(product)
-
-        if activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed:
-            recognition = RecognitionsResearchHotbed.query.get(activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed)
-            if recognition:
-                db.session.delete(recognition)
+        for related in (activity.project, activity.product, activity.recognition):
+            if related:
+                db.session.delete(related)
 
         # Finalmente eliminar la actividad
         db.session.delete(activity)
+
+        # Totales por semestre sin la actividad eliminada (misma transacción)
+        apply_summary_changes(previous_summary, {})
+
         db.session.commit()
+        invalidate_activity_details([activity_id])
+        invalidate_hotbed_exports(hotbed_ids)
+        invalidate_user_exports(user_ids)
 
         return jsonify({"message": "Informe eliminado correctamente"}), 200
 
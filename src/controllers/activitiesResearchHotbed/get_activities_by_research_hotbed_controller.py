@@ -1,141 +1,64 @@
+import logging
 from flask import jsonify
 from models.activities_researchHotbed import ActivitiesResearchHotbed
-from models.projects_researchHotbed import ProjectsResearchHotbed
-from models.products_researchHotbed import ProductsResearchHotbed
-from models.recognitions_researchHotbed import RecognitionsResearchHotbed
 from models.users_research_hotbed import UsersResearchHotbed
-from models.users import User
-from models.activity_authors import ActivityAuthors
 from db.connection import db
+from utils.activity_filters import parse_activity_filters, apply_activity_filters
+from utils.activity_serializer import get_plan, parse_fields, profile_fields, select_activities, serialize_rows
+from utils.listing_versions import hotbed_listing_etag, listing_params_key, etag_matches, not_modified, with_etag
+from utils.pagination import parse_page_params, paginate_activities
 
-def get_activities_by_research_hotbed(research_hotbed_id):
-    try:
-        print(f"DEBUG: Obteniendo actividades para semillero ID: {research_hotbed_id}")
-        
-        # Obtener todas las actividades del semillero
-        activities = db.session.query(ActivitiesResearchHotbed).join(
-            UsersResearchHotbed,
-            ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
-        ).filter(
-            UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id
-        ).all()
-
-        activities_list = []
-
-        for activity in activities:
-            print(f"DEBUG: Procesando actividad ID: {activity.idactivitiesResearchHotbed}")
-            
-            # CRÍTICO: Obtener autores y co-autores SOLO de la tabla activity_authors
-            authors_query = db.session.query(
-                ActivityAuthors, UsersResearchHotbed, User
-            ).join(
-                UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
-            ).join(
-                User, UsersResearchHotbed.user_iduser == User.iduser
-            ).filter(
-                ActivityAuthors.activity_id == activity.idactivitiesResearchHotbed,
-                ActivityAuthors.is_main_author == True
-            ).all()
+logger = logging.getLogger(__name__)
 
-            co_authors_query = db.session.query(
-                ActivityAuthors, UsersResearchHotbed, User
-            ).join(
-                UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
-            ).join(
-                User, UsersResearchHotbed.user_iduser == User.iduser
-            ).filter(
-                ActivityAuthors.activity_id == activity.idactivitiesResearchHotbed,
-                ActivityAuthors.is_main_author == False
-            ).all()
-
-            # Extraer nombres de autores principales
-            main_authors = [user.name_user for _, _, user in authors_query]
-            print(f"DEBUG: Autores principales encontrados: {main_authors}")
+def get_activities_by_research_hotbed(research_hotbed_id, limit=None, cursor=None, fields=None, filters=None, if_none_match=None):
+    try:
+        try:
+            limit, position = parse_page_params(limit, cursor)
+            fields = parse_fields(fields, profile_fields('hotbed_listing'))
+            filters = parse_activity_filters(filters or {})
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-            # Extraer nombres de co-autores
-            co_authors = [user.name_user for _, _, user in co_authors_query]
-            print(f"DEBUG: Co-autores encontrados: {co_authors}")
+        # GET condicional: si el listado no cambió se responde 304 sin consultarlo
+        etag = hotbed_listing_etag(research_hotbed_id, listing_params_key(limit, position, fields, filters))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
-            # Obtener información del semillero
-            creator_user = db.session.query(UsersResearchHotbed).filter_by(
-                idusersResearchHotbed=activity.usersResearchHotbed_idusersResearchHotbed
-            ).first()
-            
-            research_hotbed_name = ''
-            if creator_user:
-                from models.research_hotbed import ResearchHotbed
-                hotbed = db.session.query(ResearchHotbed).filter_by(
-                    idresearchHotbed=creator_user.researchHotbed_idresearchHotbed
-                ).first()
-                research_hotbed_name = hotbed.name_researchHotbed if hotbed else ''
+        logger.debug("Obteniendo actividades para semillero ID: %s", research_hotbed_id)
 
-            # Crear objeto de actividad
-            activity_data = {
-                'activity_id': activity.idactivitiesResearchHotbed,
-                'title': activity.title_activitiesResearchHotbed,
-                'responsible': activity.responsible_activitiesResearchHotbed,  # Ya es el primer autor seleccionado
-                'date': activity.date_activitiesResearchHotbed.strftime('%Y-%m-%d'),
-                'description': activity.description_activitiesResearchHotbed,
-                'type': activity.type_activitiesResearchHotbed,
-                'start_time': activity.startTime_activitiesResearchHotbed.strftime('%H:%M') if activity.startTime_activitiesResearchHotbed else None,
-                'end_time': activity.endTime_activitiesResearchHotbed.strftime('%H:%M') if activity.endTime_activitiesResearchHotbed else None,
-                'duration': activity.duration_activitiesResearchHotbed,
-                'approved_free_hours': bool(activity.approvedFreeHours_activitiesResearchHotbed),
-                'semester': activity.semester,
-                'research_hotbed_name': research_hotbed_name,
-                'main_authors': main_authors,  # Solo los de activity_authors
-                'co_authors': co_authors       # Solo los de activity_authors
-            }
+        # Obtener las actividades del semillero proyectando solo las columnas de los
+        # campos pedidos; los autores se cargan aparte en una sola consulta
+        plan = get_plan('hotbed_listing', fields)
+        activities_query = select_activities(plan).join(
+            UsersResearchHotbed,
+            ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+        ).where(
+            UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id
+        )
 
-            # Agregar información adicional según el tipo
-            if activity.projectsResearchHotbed_idprojectsResearchHotbed:
-                project = db.session.query(ProjectsResearchHotbed).filter_by(
-                    idprojectsResearchHotbed=activity.projectsResearchHotbed_idprojectsResearchHotbed
-                ).first()
-                if project:
-                    activity_data['project'] = {
-                        'name': project.name_projectsResearchHotbed,
-                        'reference_number': project.referenceNumber_projectsResearchHotbed,
-                        'start_date': project.startDate_projectsResearchHotbed.strftime('%Y-%m-%d'),
-                        'end_date': project.endDate_projectsResearchHotbed.strftime('%Y-%m-%d') if project.endDate_projectsResearchHotbed else None,
-                        'principal_researcher': project.principalResearcher_projectsResearchHotbed
-                    }
+        # Filtros opcionales (semestre, tipo, rango de fechas, aprobación) en SQL
+        activities_query = apply_activity_filters(activities_query, filters)
 
-            if activity.productsResearchHotbed_idproductsResearchHotbed:
-                product = db.session.query(ProductsResearchHotbed).filter_by(
-                    idproductsResearchHotbed=activity.productsResearchHotbed_idproductsResearchHotbed
-                ).first()
-                if product:
-                    activity_data['product'] = {
-                        'category': product.category_productsResearchHotbed,
-                        'type': product.type_productsResearchHotbed,
-                        'description': product.description_productsResearchHotbed,
-                        'date_publication': product.datePublication_productsResearchHotbed.strftime('%Y-%m-%d') if product.datePublication_productsResearchHotbed else None
-                    }
+        # Paginación opcional por cursor; sin parámetros se devuelve el listado completo
+        next_cursor = None
+        if limit:
+            rows, next_cursor = paginate_activities(activities_query, limit, position)
+        else:
+            rows = db.session.execute(activities_query).all()
 
-            if activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed:
-                recognition = db.session.query(RecognitionsResearchHotbed).filter_by(
-                    idrecognitionsResearchHotbed=activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed
-                ).first()
-                if recognition:
-                    activity_data['recognition'] = {
-                        'name': recognition.name_recognitionsResearchHotbed,
-                        'project_name': recognition.projectName_recognitionsResearchHotbed,
-                        'participants_names': recognition.participantsNames_recognitionsResearchHotbed,
-                        'organization_name': recognition.organizationName_recognitionsResearchHotbed
-                    }
+        activities_list = serialize_rows(plan, rows)
 
-            activities_list.append(activity_data)
+        logger.debug("Total actividades procesadas: %d", len(activities_list))
 
-        print(f"DEBUG: Total actividades procesadas: {len(activities_list)}")
-        
-        return jsonify({
+        response = {
             'activities': activities_list,
             'total_count': len(activities_list)
-        }), 200
+        }
+        if limit:
+            response['next_cursor'] = next_cursor
+
+        return with_etag(jsonify(response), etag), 200
 
     except Exception as e:
-        print(f"ERROR en get_activities_by_research_hotbed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        logger.exception("Error en get_activities_by_research_hotbed")
+        return jsonify({'error': str(e)}), 500
@@ -1,3 +1,4 @@
+import logging
 from flask import jsonify
 from datetime import datetime
 from models.activities_researchHotbed import ActivitiesResearchHotbed
@@ -8,11 +9,17 @@ from models.activity_authors import ActivityAuthors
 from models.users_research_hotbed import UsersResearchHotbed
 from models.users import User
 from db.connection import db
+from utils.listing_versions import activity_listing_scopes, bump_listing_versions
+from utils.activity_cache import invalidate_activity_details
+from utils.export_cache import invalidate_hotbed_exports, invalidate_user_exports
+from utils.semester_summary import activity_contributions, apply_summary_changes
+
+logger = logging.getLogger(__name__)
 
 def register_activity(data):
     try:
-        print(f"=== DEBUG REGISTER ACTIVITY ===")
-        print(f"Datos completos recibidos: {data}")
+        # Solo los nombres de los campos: el contenido puede incluir datos personales
+        logger.debug("Registrando actividad con campos: %s", sorted(data or {}))
         
         # Validaciones básicas
         if not data.get('title') or not data.get('date') or not data.get('description'):
@@ -142,18 +149,17 @@ def register_activity(data):
         db.session.add(activity)
         db.session.flush()
 
-        print(f"DEBUG: Actividad creada con ID: {activity.idactivitiesResearchHotbed}")
-        print(f"DEBUG: Responsable asignado: {responsible_name}")
-        print(f"DEBUG: Usuario creador (tracking): {data['userResearchHotbedId']}")
-        print(f"DEBUG: Autores a registrar: {data.get('authors_ids', [])}")
-        print(f"DEBUG: Co-autores a registrar: {data.get('co_authors_ids', [])}")
+        logger.debug(
+            "Actividad %s creada por usuario-semillero %s; autores %s, co-autores %s",
+            activity.idactivitiesResearchHotbed, data['userResearchHotbedId'],
+            data.get('authors_ids', []), data.get('co_authors_ids', [])
+        )
 
         # CRÍTICO: Solo crear relaciones de autoría para los usuarios seleccionados
         # NO agregar automáticamente al usuario creador
 
         # Crear relaciones de autoría para autores principales
         for author_id in data.get('authors_ids', []):
-            print(f"DEBUG: Agregando autor principal ID: {author_id}")
             author_relation = ActivityAuthors(
                 activity_id=activity.idactivitiesResearchHotbed,
                 user_research_hotbed_id=author_id,
@@ -163,7 +169,6 @@ def register_activity(data):
 
         # Crear relaciones de autoría para co-autores
         for co_author_id in data.get('co_authors_ids', []):
-            print(f"DEBUG: Agregando co-autor ID: {co_author_id}")
             co_author_relation = ActivityAuthors(
                 activity_id=activity.idactivitiesResearchHotbed,
                 user_research_hotbed_id=co_author_id,
@@ -171,9 +176,20 @@ def register_activity(data):
             )
             db.session.add(co_author_relation)
 
+        # Invalidar los listados del semillero y de los usuarios involucrados (ETag)
+        hotbed_ids, user_ids = activity_listing_scopes([activity.idactivitiesResearchHotbed])
+        bump_listing_versions(hotbed_ids, user_ids)
+
+        # Totales por semestre del semillero y de los usuarios: se suma el aporte
+        # de la nueva actividad (misma transacción)
+        apply_summary_changes({}, activity_contributions([activity.idactivitiesResearchHotbed]))
+
         db.session.commit()
+        invalidate_activity_details([activity.idactivitiesResearchHotbed])
+        invalidate_hotbed_exports(hotbed_ids)
+        invalidate_user_exports(user_ids)
 
-        print(f"DEBUG: Actividad registrada exitosamente")
+        logger.info("Actividad %s registrada", activity.idactivitiesResearchHotbed)
 
         return jsonify({
             "message": "Actividad registrada exitosamente",
@@ -182,11 +198,9 @@ def register_activity(data):
 
     except ValueError as ve:
         db.session.rollback()
-        print(f"ERROR ValueError: {str(ve)}")
+        logger.warning("Formato de fecha inválido al registrar actividad: %s", ve)
         return jsonify({"error": f"Error en formato de fecha: {str(ve)}"}), 400
     except Exception as e:
         db.session.rollback()
-        print(f"ERROR Exception: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error en register_activity")
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from flask import jsonify
 from models.activities_researchHotbed import ActivitiesResearchHotbed
 from models.projects_researchHotbed import ProjectsResearchHotbed
@@ -8,14 +9,30 @@ from models.users_research_hotbed import UsersResearchHotbed
 from models.activity_authors import ActivityAuthors  # MOVIDO AQUÍ
 from db.connection import db
 from datetime import datetime
+from utils.activity_loaders import activity_loader_options, ACTIVITY_ENTITY_LOADS
+from utils.listing_versions import activity_listing_scopes, bump_listing_versions
+from utils.activity_cache import invalidate_activity_details
+from utils.export_cache import invalidate_hotbed_exports, invalidate_user_exports
+from utils.semester_summary import activity_contributions, apply_summary_changes
+
+logger = logging.getLogger(__name__)
 
 def update_activity(activity_id, data):
     try:
-        # Buscar la actividad existente
-        activity = ActivitiesResearchHotbed.query.get(activity_id)
+        # Buscar la actividad existente junto con su proyecto, producto y
+        # reconocimiento (mismo SELECT)
+        activity = db.session.get(
+            ActivitiesResearchHotbed, activity_id,
+            options=activity_loader_options('detail', only=ACTIVITY_ENTITY_LOADS)
+        )
         if not activity:
             return jsonify({"message": "Actividad no encontrada"}), 404
 
+        # Listados donde aparece la actividad antes del cambio (autores anteriores)
+        previous_hotbeds, previous_users = activity_listing_scopes([activity_id])
+        # Aporte de la actividad a los totales por semestre antes del cambio
+        previous_summary = activity_contributions([activity_id])
+
         # Actualizar campos de la actividad
         activity.title_activitiesResearchHotbed = data.get('title', activity.title_activitiesResearchHotbed)
         activity.responsible_activitiesResearchHotbed = data.get('responsible', activity.responsible_activitiesResearchHotbed)
@@ -71,8 +88,8 @@ def update_activity(activity_id, data):
 
         # Si hay un proyecto asociado para actualizar o crear
         if 'project' in data:
-            if activity.projectsResearchHotbed_idprojectsResearchHotbed:
-                project = ProjectsResearchHotbed.query.get(activity.projectsResearchHotbed_idprojectsResearchHotbed)
+            if activity.project:
+                project = activity.project
             else:
                 project = ProjectsResearchHotbed()
                 db.session.add(project)
@@ -90,8 +107,8 @@ def update_activity(activity_id, data):
 
         # Si hay un producto asociado
         if 'product' in data:
-            if activity.productsResearchHotbed_idproductsResearchHotbed:
-                product = ProductsResearchHotbed.query.get(activity.productsResearchHotbed_idproductsResearchHotbed)
+            if activity.product:
+                product = activity.product
             else:
                 product = ProductsResearchHotbed()
                 db.session.add(product)
@@ -107,8 +124,8 @@ def update_activity(activity_id, data):
 
         # Si hay un reconocimiento asociado
         if 'recognition' in data:
-            if activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed:
-                recognition = RecognitionsResearchHotbed.query.get(activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed)
+            if activity.recognition:
+                recognition = activity.recognition
             else:
                 recognition = RecognitionsResearchHotbed()
                 db.session.add(recognition)
@@ -142,11 +159,23 @@ def update_activity(activity_id, data):
             else:
                 recognition.participantsNames_recognitionsResearchHotbed = data['recognition']['participants_names']
 
+        # Invalidar los listados afectados antes y después del cambio (ETag)
+        hotbed_ids, user_ids = activity_listing_scopes([activity_id])
+        hotbed_ids, user_ids = previous_hotbeds | hotbed_ids, previous_users | user_ids
+        bump_listing_versions(hotbed_ids, user_ids)
+
+        # Totales por semestre: se aplica la diferencia entre el aporte anterior
+        # y el nuevo (semestre, horas, tipo y autores; misma transacción)
+        apply_summary_changes(previous_summary, activity_contributions([activity_id]))
+
         db.session.commit()
+        invalidate_activity_details([activity_id])
+        invalidate_hotbed_exports(hotbed_ids)
+        invalidate_user_exports(user_ids)
 
         return jsonify({"message": "Actividad actualizada correctamente"}), 200
 
     except Exception as e:
         db.session.rollback()
-        print(f"Error en update_activity: {str(e)}")
+        logger.exception("Error en update_activity")
         return jsonify({"error": str(e)}), 500
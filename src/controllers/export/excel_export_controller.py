@@ -1,4 +1,4 @@
-from flask import jsonify, make_response
+from flask import jsonify, make_response, Response
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -7,25 +7,35 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
 import logging
+import os
+import tempfile
+from sqlalchemy import select
 
 # Importar librerías para Excel
-import pandas as pd
-from openpyxl import load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 
 from models.research_hotbed import ResearchHotbed
 from models.users_research_hotbed import UsersResearchHotbed
 from models.users import User
 from models.activities_researchHotbed import ActivitiesResearchHotbed
-from models.activity_authors import ActivityAuthors
 from db.connection import db
+from utils.activity_serializer import get_plan, select_activities, serialize_rows
+from utils.activity_stats import get_hotbeds_activity_stats, summarize_activities, EMPTY_ACTIVITY_STATS
+from utils.excel_writer import StreamingWorkbook, CellStyle, XLSX_MIMETYPE
+from utils.export_jobs import ExportError
+from utils.export_cache import export_file_cache, data_fingerprint, send_cached_export, HOTBED_REPORT
 from utils.semester_utils import format_semester_label_detailed, is_valid_semester
 
 logger = logging.getLogger(__name__)
 
 # ESTILOS GLOBALES ESTANDARIZADOS CON COLORES DE LA APP
+# Se crean una sola vez por proceso (lru_cache) y se comparten entre reportes:
+# no deben modificarse. Para ajustar una tabla se crea un TableStyle hijo con
+# TableStyle(comandos, parent=get_..._table_style()).
+
+@lru_cache(maxsize=None)
 def get_standard_styles():
     """Estilos estandarizados para todos los PDFs con colores de la aplicación"""
     styles = getSampleStyleSheet()
@@ -72,6 +82,7 @@ def get_standard_styles():
         )
     }
 
+@lru_cache(maxsize=None)
 def get_standard_table_style():
     """Estilo estandarizado para tablas con colores de la app"""
     return TableStyle([
@@ -96,6 +107,7 @@ def get_standard_table_style():
         ('BOTTOMPADDING', (0, 1), (-1, -1), 8)
     ])
 
+@lru_cache(maxsize=None)
 def get_info_table_style():
     """Estilo para tablas de información con colores de la app"""
     return TableStyle([
@@ -114,6 +126,7 @@ def get_info_table_style():
         ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
     ])
 
+@lru_cache(maxsize=None)
 def get_stats_table_style():
     """Estilo para tablas de estadísticas con colores de la app"""
     return TableStyle([
@@ -132,42 +145,183 @@ def get_stats_table_style():
         ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
     ])
 
+# Colores de filas especiales en las tablas del PDF
+INACTIVE_ROW_BACKGROUND = colors.HexColor('#fee2e2')
+INACTIVE_ROW_TEXT = colors.HexColor('#7f1d1d')
+SEPARATOR_ROW_BACKGROUND = colors.HexColor('#e879f9')
+
+# ESTILOS EXCEL (formales y corporativos), creados una sola vez
+PRIMARY_BLUE = '1F4E79'      # Azul marino corporativo
+DARK_GRAY = '2F2F2F'         # Gris oscuro
+MEDIUM_GRAY = '5A5A5A'       # Gris medio
+LIGHT_GRAY = 'F8F9FA'        # Gris muy claro
+WHITE = 'FFFFFF'             # Blanco
+
+HEADER_FONT = Font(bold=True, color=WHITE, size=11, name='Calibri')
+SUBHEADER_FONT = Font(bold=True, color=DARK_GRAY, size=10, name='Calibri')
+BODY_FONT = Font(color=DARK_GRAY, size=10, name='Calibri')
+SECTION_FONT = Font(bold=True, color='FFFFFF', size=11, name='Calibri')
+
+HEADER_FILL = PatternFill(start_color=PRIMARY_BLUE, end_color=PRIMARY_BLUE, fill_type='solid')
+BODY_FILL = PatternFill(start_color=LIGHT_GRAY, end_color=LIGHT_GRAY, fill_type='solid')
+ALTERNATE_FILL = PatternFill(start_color=WHITE, end_color=WHITE, fill_type='solid')
+SECTION_FILL = PatternFill(start_color='4A90E2', end_color='4A90E2', fill_type='solid')
+ACTIVE_FILL = PatternFill(start_color='E8F5E8', end_color='E8F5E8', fill_type='solid')     # Verde claro
+INACTIVE_FILL = PatternFill(start_color='FFE8E8', end_color='FFE8E8', fill_type='solid')   # Rojo claro
+APPROVED_FILL = PatternFill(start_color='E8F5E8', end_color='E8F5E8', fill_type='solid')   # Verde claro
+PENDING_FILL = PatternFill(start_color='FFF4E6', end_color='FFF4E6', fill_type='solid')    # Naranja claro
+
+CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+LEFT_ALIGNMENT = Alignment(horizontal='left', vertical='center', wrap_text=True)
+
+THIN_SIDE = Side(border_style='thin', color=MEDIUM_GRAY)
+BODY_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+
+INFO_SECTION_TITLES = ('INFORMACIÓN DEL SEMILLERO', 'ESTADÍSTICAS GENERALES')
+
+def is_info_section_row(row_num, values):
+    """Las filas de título de sección se combinan en todo el ancho"""
+    return isinstance(values[0], str) and values[0].startswith(INFO_SECTION_TITLES)
+
+def info_sheet_styler(header):
+    """Estilos de la hoja de información general"""
+    def style_cell(row_num, col_num, value, values):
+        if value and isinstance(value, str):
+            if value.startswith(INFO_SECTION_TITLES):
+                return CellStyle(SECTION_FONT, SECTION_FILL, CENTER_ALIGNMENT, BODY_BORDER)
+            if col_num == 1 and value != ' ':  # Primera columna con contenido
+                return CellStyle(SUBHEADER_FONT, BODY_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+            return CellStyle(BODY_FONT, ALTERNATE_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+        return CellStyle(BODY_FONT, ALTERNATE_FILL, None, BODY_BORDER)
+    return style_cell
+
+def members_sheet_styler(header):
+    """Estilos de la hoja de miembros: filas coloreadas según el estado"""
+    def style_cell(row_num, col_num, value, values):
+        if row_num == 1:  # Header row
+            return CellStyle(HEADER_FONT, HEADER_FILL, CENTER_ALIGNMENT, BODY_BORDER)
+
+        # Nombre, email y observación a la izquierda
+        alignment = LEFT_ALIGNMENT if col_num in [1, 2, 8] else CENTER_ALIGNMENT
+
+        # Colorear filas según el estado del miembro (columna "Estado Actual")
+        status = values[4] if len(values) > 4 else None
+        if status == 'Activo':
+            fill = ACTIVE_FILL
+        elif status:
+            fill = INACTIVE_FILL
+        else:
+            fill = ALTERNATE_FILL if row_num % 2 == 0 else BODY_FILL
+
+        return CellStyle(BODY_FONT, fill, alignment, BODY_BORDER)
+    return style_cell
+
+def activities_sheet_styler(header):
+    """Estilos de las hojas de actividades: filas coloreadas según la aprobación de horas"""
+    status_index = header.index('Estado de Horas Libres') if 'Estado de Horas Libres' in header else None
+
+    def style_cell(row_num, col_num, value, values):
+        if row_num == 1:  # Header row
+            return CellStyle(HEADER_FONT, HEADER_FILL, CENTER_ALIGNMENT, BODY_BORDER)
+
+        # Fecha y horario centrados; el resto (título, descripción...) a la izquierda
+        alignment = CENTER_ALIGNMENT if col_num in [2, 4] else LEFT_ALIGNMENT
+
+        status = values[status_index] if status_index is not None else None
+        if status == 'Aprobadas':
+            fill = APPROVED_FILL
+        elif status == 'Pendientes':
+            fill = PENDING_FILL
+        else:
+            fill = ALTERNATE_FILL if row_num % 2 == 0 else BODY_FILL
+
+        return CellStyle(BODY_FONT, fill, alignment, BODY_BORDER)
+    return style_cell
+
+def build_research_hotbed_excel(research_hotbed_id, semester, progress=None):
+    """
+    Genera el Excel del semillero y devuelve (buffer, nombre de archivo).
+    Lanza ExportError si el semestre es inválido o el semillero no existe.
+    """
+    # Validar semestre
+    if not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
+    
+    # Buscar el semillero - ARREGLAR deprecated .get()
+    research_hotbed = db.session.get(ResearchHotbed, research_hotbed_id)
+    
+    if not research_hotbed:
+        raise ExportError("Semillero no encontrado", 404)
+    
+    # Obtener miembros activos y actividades
+    members = get_active_members(research_hotbed_id)
+    activities = get_activities_by_semester(research_hotbed_id, semester)
+    stats = get_hotbed_activity_stats(research_hotbed_id, semester)
+    if progress:
+        progress(0.5, "Datos del semillero cargados")
+    
+    filename = f'{research_hotbed.acronym_researchHotbed}_{semester}_reporte.xlsx'
+    
+    # Reutilizar el archivo si ya se generó con exactamente los mismos datos
+    fingerprint = data_fingerprint(
+        HOTBED_REPORT, research_hotbed_id, semester,
+        [research_hotbed.name_researchHotbed, research_hotbed.acronym_researchHotbed,
+         research_hotbed.faculty_researchHotbed, research_hotbed.universityBranch_researchHotbed],
+        members, activities
+    )
+    excel_buffer = export_file_cache.load_blob(fingerprint)
+    
+    if excel_buffer is None:
+        # Generar Excel
+        try:
+            excel_buffer = write_excel_report(research_hotbed, members, activities, semester, stats)
+        except Exception as e:
+            logger.exception("Error en generate_excel_report")
+            return error_excel_report(research_hotbed, semester, e), filename
+    
+    export_file_cache.store(HOTBED_REPORT, research_hotbed_id, semester, fingerprint, excel_buffer, filename)
+    
+    return excel_buffer, filename
+
 def export_research_hotbed_excel(research_hotbed_id, semester):
     """
     Genera un archivo Excel completo del semillero para el semestre especificado
     con hojas separadas para cada tipo de información
     """
     try:
-        # Validar semestre
-        if not is_valid_semester(semester):
-            return jsonify({"error": "Semestre inválido"}), 400
-        
-        # Buscar el semillero - ARREGLAR deprecated .get()
-        research_hotbed = db.session.get(ResearchHotbed, research_hotbed_id)
+        # Descarga repetida: se transmite el archivo desde el disco sin consultar la base de datos
+        if is_valid_semester(semester):
+            cached = export_file_cache.lookup(HOTBED_REPORT, research_hotbed_id, semester)
+            if cached:
+                return send_cached_export(cached), 200
         
-        if not research_hotbed:
-            return jsonify({"error": "Semillero no encontrado"}), 404
-        
-        # Obtener miembros activos y actividades
-        members = get_active_members(research_hotbed_id)
-        activities = get_activities_by_semester(research_hotbed_id, semester)
-        
-        # Generar Excel
-        excel_buffer = generate_excel_report(research_hotbed, members, activities, semester)
+        excel_buffer, filename = build_research_hotbed_excel(research_hotbed_id, semester)
         
         # Preparar respuesta
         response = make_response(excel_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = f'attachment; filename={research_hotbed.acronym_researchHotbed}_{semester}_reporte.xlsx'
+        response.headers['Content-Type'] = XLSX_MIMETYPE
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
         
         return response, 200
         
-    except Exception as e:
-        logger.error(f"Error generando Excel: {str(e)}")
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
+    except Exception:
+        logger.exception("Error generando Excel")
         return jsonify({"error": "Error interno del servidor"}), 500
 
-def create_general_info_sheet(writer, research_hotbed, members, activities, semester):
-    """Crea la hoja de información general del semillero con formato mejorado"""
+def get_hotbed_activity_stats(research_hotbed_id, semester):
+    """Totales de actividades del semillero en el semestre, desde la tabla de resumen"""
+    return get_hotbeds_activity_stats([research_hotbed_id], semester).get(research_hotbed_id, EMPTY_ACTIVITY_STATS)
+
+def create_general_info_sheet(workbook, research_hotbed, members, activities, semester, stats=None):
+    """
+    Crea la hoja de información general del semillero con formato mejorado.
+    'stats' son los totales de la tabla de resumen; sin ellos se calculan
+    sobre las actividades.
+    """
+    if stats is None:
+        stats = summarize_activities(activities)
     
     # Información básica del semillero con mejor organización
     info_data = [
@@ -183,23 +337,28 @@ def create_general_info_sheet(writer, research_hotbed, members, activities, seme
         ['Total de Miembros Registrados', f'{len(members)} personas'],
         ['Miembros con Estado Activo', f'{len([m for m in members if m["status"] == "Activo"])} personas'],
         ['Miembros con Estado Inactivo', f'{len([m for m in members if m["status"] != "Activo"])} personas'],
-        ['Total de Actividades Registradas', f'{len(activities)} actividades'],
-        ['Horas Académicas Totales', f'{sum(a["duration"] for a in activities)} horas'],
-        ['Actividades con Horas Aprobadas', f'{len([a for a in activities if a["approved_free_hours"]])} actividades'],
-        ['Actividades Pendientes de Aprobación', f'{len([a for a in activities if not a["approved_free_hours"]])} actividades'],
-        ['Proyectos de Investigación', f'{len([a for a in activities if "proyecto" in a["type"].lower()])} proyectos'],
-        ['Productos Académicos', f'{len([a for a in activities if "producto" in a["type"].lower()])} productos'],
-        ['Reconocimientos Obtenidos', f'{len([a for a in activities if "reconocimiento" in a["type"].lower()])} reconocimientos']
+        ['Total de Actividades Registradas', f'{stats["total_activities"]} actividades'],
+        ['Horas Académicas Totales', f'{stats["total_hours"]} horas'],
+        ['Actividades con Horas Aprobadas', f'{stats["approved_activities"]} actividades'],
+        ['Actividades Pendientes de Aprobación', f'{stats["total_activities"] - stats["approved_activities"]} actividades'],
+        ['Proyectos de Investigación', f'{stats["projects"]} proyectos'],
+        ['Productos Académicos', f'{stats["products"]} productos'],
+        ['Reconocimientos Obtenidos', f'{stats["recognitions"]} reconocimientos']
     ]
     
-    df_info = pd.DataFrame(info_data, columns=['Concepto', 'Detalle'])
-    df_info.to_excel(writer, sheet_name='Información General', index=False)
+    workbook.write_sheet(
+        'Información General', [['Concepto', 'Detalle']] + info_data,
+        styler=info_sheet_styler, merge_row=is_info_section_row
+    )
 
-def create_members_sheet(writer, members):
+def create_members_sheet(workbook, members):
     """Crea la hoja detallada de miembros con formato mejorado"""
     if not members:
-        df_empty = pd.DataFrame({'Información': ['No se encontraron miembros registrados en este semillero.']})
-        df_empty.to_excel(writer, sheet_name='Miembros', index=False)
+        workbook.write_sheet(
+            'Miembros',
+            [['Información'], ['No se encontraron miembros registrados en este semillero.']],
+            styler=members_sheet_styler
+        )
         return
     
     # Separar y ordenar miembros
@@ -220,14 +379,16 @@ def create_members_sheet(writer, members):
             'Observaciones': member['observation'] if member['observation'] else ('Sin observaciones' if member['status'] == 'Activo' else 'Sin detalles registrados')
         })
     
-    df_members = pd.DataFrame(members_data)
-    df_members.to_excel(writer, sheet_name='Miembros', index=False)
+    workbook.write_records('Miembros', members_data, styler=members_sheet_styler)
 
-def create_activities_sheets(writer, activities):
+def create_activities_sheets(workbook, activities):
     """Crea hojas separadas para cada tipo de actividad"""
     if not activities:
-        df_empty = pd.DataFrame({'Mensaje': ['No hay actividades registradas para este semestre.']})
-        df_empty.to_excel(writer, sheet_name='Actividades', index=False)
+        workbook.write_sheet(
+            'Actividades',
+            [['Mensaje'], ['No hay actividades registradas para este semestre.']],
+            styler=activities_sheet_styler
+        )
         return
     
     # Agrupar actividades por tipo
@@ -243,13 +404,13 @@ def create_activities_sheets(writer, activities):
         sheet_name = get_sheet_name_for_type(activity_type)
         
         if 'proyecto' in activity_type.lower():
-            create_projects_sheet(writer, type_activities, sheet_name)
+            create_projects_sheet(workbook, type_activities, sheet_name)
         elif 'producto' in activity_type.lower():
-            create_products_sheet(writer, type_activities, sheet_name)
+            create_products_sheet(workbook, type_activities, sheet_name)
         elif 'reconocimiento' in activity_type.lower():
-            create_recognitions_sheet(writer, type_activities, sheet_name)
+            create_recognitions_sheet(workbook, type_activities, sheet_name)
         else:
-            create_generic_activities_sheet(writer, type_activities, sheet_name)
+            create_generic_activities_sheet(workbook, type_activities, sheet_name)
 
 def get_sheet_name_for_type(activity_type):
     """Obtiene el nombre de la hoja según el tipo de actividad"""
@@ -265,354 +426,220 @@ def get_sheet_name_for_type(activity_type):
         return clean_name.capitalize()[:31]
 
 def generate_excel_report(research_hotbed, members, activities, semester):
-    """Genera el reporte Excel con múltiples hojas"""
-    buffer = BytesIO()
-    
+    """Genera el reporte Excel con múltiples hojas (o un Excel básico con el error)"""
     try:
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # 1. Hoja de información del semillero y miembros
-            create_general_info_sheet(writer, research_hotbed, members, activities, semester)
-            
-            # 2. Hoja de miembros detallada
-            create_members_sheet(writer, members)
-            
-            # 3. Hojas de actividades por tipo
-            create_activities_sheets(writer, activities)
-        
-        # Recargar el workbook para aplicar estilos
-        buffer.seek(0)
-        workbook = load_workbook(buffer)
-        
-        # Verificar que tengamos al menos una hoja
-        if len(workbook.sheetnames) == 0:
-            # Crear una hoja vacía si no hay ninguna
-            ws = workbook.create_sheet("Información General")
-            ws['A1'] = "No hay datos disponibles"
-        
-        # Aplicar estilos
-        apply_excel_styles(workbook)
-        
-        # Asegurar que al menos una hoja esté visible
-        for sheet in workbook.worksheets:
-            if sheet.sheet_state == 'hidden':
-                sheet.sheet_state = 'visible'
-        
-        # Si todas están ocultas, hacer visible la primera
-        if all(sheet.sheet_state == 'hidden' for sheet in workbook.worksheets):
-            workbook.worksheets[0].sheet_state = 'visible'
-        
-        # Guardar cambios
-        buffer = BytesIO()
-        workbook.save(buffer)
-        buffer.seek(0)
-        
-        return buffer
-        
+        return write_excel_report(research_hotbed, members, activities, semester)
     except Exception as e:
-        logger.error(f"Error en generate_excel_report: {str(e)}")
-        # Crear un Excel básico en caso de error
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            error_data = pd.DataFrame({
-                'Error': [f'No se pudieron generar los datos: {str(e)}'],
-                'Semillero': [research_hotbed.name_researchHotbed if research_hotbed else 'Desconocido'],
-                'Semestre': [semester]
-            })
-            error_data.to_excel(writer, sheet_name='Error', index=False)
-        
-        buffer.seek(0)
-        return buffer
+        logger.exception("Error en generate_excel_report")
+        return error_excel_report(research_hotbed, semester, e)
 
-# Modificar la función apply_excel_styles para ser más robusta
-def apply_excel_styles(workbook):
-    """Aplica estilos profesionales y formales al workbook"""
+def write_excel_report(research_hotbed, members, activities, semester, stats=None):
+    """
+    Escribe el reporte Excel con múltiples hojas.
+    Cada hoja se escribe una sola vez, con estilos y anchos aplicados al emitir las filas.
+    """
+    workbook = StreamingWorkbook()
     
-    try:
-        # Colores formales y corporativos
-        primary_blue = '1F4E79'      # Azul marino corporativo
-        secondary_blue = '2E75B6'    # Azul medio
-        light_blue = 'E7F3FF'       # Azul muy claro
-        dark_gray = '2F2F2F'        # Gris oscuro
-        medium_gray = '5A5A5A'      # Gris medio
-        light_gray = 'F8F9FA'       # Gris muy claro
-        white = 'FFFFFF'             # Blanco
-        accent_green = '4A7C59'      # Verde corporativo
-        
-        # Estilos profesionales
-        header_font = Font(bold=True, color=white, size=11, name='Calibri')
-        subheader_font = Font(bold=True, color=dark_gray, size=10, name='Calibri')
-        body_font = Font(color=dark_gray, size=10, name='Calibri')
-        
-        # Fills (fondos)
-        header_fill = PatternFill(start_color=primary_blue, end_color=primary_blue, fill_type='solid')
-        subheader_fill = PatternFill(start_color=secondary_blue, end_color=secondary_blue, fill_type='solid')
-        body_fill = PatternFill(start_color=light_gray, end_color=light_gray, fill_type='solid')
-        alternate_fill = PatternFill(start_color=white, end_color=white, fill_type='solid')
-        
-        # Alineaciones
-        center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        left_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-        
-        # Bordes profesionales
-        thin_border = Side(border_style='thin', color=medium_gray)
-        medium_border = Side(border_style='medium', color=primary_blue)
+    # 1. Hoja de información del semillero y miembros
+    create_general_info_sheet(workbook, research_hotbed, members, activities, semester, stats)
+    
+    # 2. Hoja de miembros detallada
+    create_members_sheet(workbook, members)
+    
+    # 3. Hojas de actividades por tipo
+    create_activities_sheets(workbook, activities)
+    
+    return workbook.save()
+
+def error_excel_report(research_hotbed, semester, error):
+    """Crea un Excel básico en caso de error (no se guarda en caché)"""
+    workbook = StreamingWorkbook()
+    workbook.write_records('Error', [{
+        'Error': f'No se pudieron generar los datos: {str(error)}',
+        'Semillero': research_hotbed.name_researchHotbed if research_hotbed else 'Desconocido',
+        'Semestre': semester
+    }])
+    return workbook.save()
+
+PDF_MIMETYPE = 'application/pdf'
+# Tamaño a partir del cual el PDF en construcción pasa de memoria a un archivo temporal
+PDF_SPOOL_MAX_BYTES = int(os.getenv('PDF_SPOOL_MAX_BYTES', 5 * 1024 * 1024))
+PDF_CHUNK_SIZE = 64 * 1024
+
+def build_research_hotbed_pdf(research_hotbed_id, semester):
+    """
+    Genera el PDF del semillero en un archivo temporal (en memoria hasta
+    PDF_SPOOL_MAX_BYTES y luego en disco) y devuelve (archivo, tamaño, nombre).
+    Lanza ExportError si el semestre es inválido o el semillero no existe.
+    """
+    if not semester or not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
         
-        header_border = Border(
-            left=thin_border, right=thin_border, 
-            top=medium_border, bottom=medium_border
-        )
+    research_hotbed = db.session.get(ResearchHotbed, research_hotbed_id)
+    if not research_hotbed:
+        raise ExportError("Semillero no encontrado", 404)
         
-        body_border = Border(
-            left=thin_border, right=thin_border, 
-            top=thin_border, bottom=thin_border
-        )
-        
-        # Aplicar estilos a todas las hojas
-        for sheet_name in workbook.sheetnames:
-            try:
-                sheet = workbook[sheet_name]
-                
-                # Asegurar que la hoja esté visible
-                sheet.sheet_state = 'visible'
-                
-                # Configurar ancho de columnas de manera más inteligente
-                for column in sheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if cell.value:
-                                # Calcular longitud considerando saltos de línea
-                                cell_length = max(len(str(line)) for line in str(cell.value).split('\n'))
-                                if cell_length > max_length:
-                                    max_length = cell_length
-                        except:
-                            pass
-                    
-                    # Ajustar ancho con límites más profesionales
-                    if max_length == 0:
-                        adjusted_width = 12
-                    elif max_length < 8:
-                        adjusted_width = 12
-                    elif max_length < 20:
-                        adjusted_width = max_length + 3
-                    elif max_length < 40:
-                        adjusted_width = max_length + 2
-                    else:
-                        adjusted_width = 45
-                        
-                    sheet.column_dimensions[column_letter].width = adjusted_width
-                
-                # Aplicar estilos específicos según el tipo de hoja
-                if sheet_name == 'Información General':
-                    apply_info_sheet_styles(sheet, header_font, subheader_font, body_font, 
-                                          header_fill, body_fill, alternate_fill, 
-                                          center_alignment, left_alignment, header_border, body_border)
-                
-                elif sheet_name == 'Miembros':
-                    apply_members_sheet_styles(sheet, header_font, body_font, 
-                                             header_fill, body_fill, alternate_fill,
-                                             center_alignment, left_alignment, header_border, body_border)
-                
-                else:  # Hojas de actividades
-                    apply_activities_sheet_styles(sheet, header_font, body_font,
-                                                header_fill, body_fill, alternate_fill,
-                                                center_alignment, left_alignment, header_border, body_border)
-            except Exception as e:
-                logger.error(f"Error aplicando estilos a la hoja {sheet_name}: {str(e)}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Error general aplicando estilos: {str(e)}")
+    members = get_active_members(research_hotbed_id)
+    activities = get_activities_by_semester(research_hotbed_id, semester)
+    stats = get_hotbed_activity_stats(research_hotbed_id, semester)
+    
+    pdf_file = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    try:
+        generate_pdf_report(research_hotbed, members, activities, semester, pdf_file, stats)
+        size = pdf_file.seek(0, os.SEEK_END)
+        pdf_file.seek(0)
+    except Exception:
+        pdf_file.close()
+        raise
+    
+    return pdf_file, size, f'{research_hotbed.acronym_researchHotbed}_{semester}_reporte.pdf'
 
 def export_research_hotbed_pdf(research_hotbed_id, semester):
     """
-    Genera un PDF completo del semillero para el semestre especificado
+    Genera un PDF completo del semillero para el semestre especificado.
+    El archivo se transmite por bloques desde el archivo temporal.
     """
     try:
-        # Validaciones
-        if not semester or not is_valid_semester(semester):
-            return jsonify({"error": "Semestre inválido"}), 400
-            
-        # Obtener datos del semillero
-        research_hotbed = ResearchHotbed.query.get(research_hotbed_id)
-        if not research_hotbed:
-            return jsonify({"error": "Semillero no encontrado"}), 404
-            
-        # Obtener miembros activos
-        members = get_active_members(research_hotbed_id)
-        
-        # Obtener actividades del semestre
-        activities = get_activities_by_semester(research_hotbed_id, semester)
-        
-        # Generar PDF
-        pdf_buffer = generate_pdf_report(research_hotbed, members, activities, semester)
+        pdf_file, size, filename = build_research_hotbed_pdf(research_hotbed_id, semester)
         
-        # Crear respuesta
-        response = make_response(pdf_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename="{research_hotbed.acronym_researchHotbed}_{semester}_reporte.pdf"'
-        
-        logger.info(f"PDF generado exitosamente para semillero {research_hotbed_id}, semestre {semester}")
-        return response
-        
-    except Exception as e:
-        logger.error(f"Error generando PDF: {str(e)}")
-        return jsonify({"error": f"Error generando PDF: {str(e)}"}), 500
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
+    except Exception:
+        logger.exception("Error generando PDF")
+        return jsonify({"error": "Error interno del servidor"}), 500
+    
+    logger.info("PDF generado exitosamente para semillero %s, semestre %s", research_hotbed_id, semester)
+    return Response(
+        stream_file_chunks(pdf_file),
+        mimetype=PDF_MIMETYPE,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Content-Length': str(size)
+        }
+    )
 
-def get_active_members(research_hotbed_id):
-    """Obtiene TODOS los miembros del semillero (activos e inactivos)"""
+def stream_file_chunks(file):
+    """Transmite un archivo por bloques y lo cierra al terminar"""
     try:
-        # CAMBIO: Eliminar filtro de status para mostrar todos los miembros
-        members_query = db.session.query(User, UsersResearchHotbed).join(
-            UsersResearchHotbed, User.iduser == UsersResearchHotbed.user_iduser
-        ).filter(
-            UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id
-            # Removido: UsersResearchHotbed.status_usersResearchHotbed == 'Activo'
-        ).order_by(
-            # Activos primero (Activo = 1, otros = 0), luego alfabético
-            (UsersResearchHotbed.status_usersResearchHotbed == 'Activo').desc(),
-            User.name_user.asc()
-        ).all()
-        
-        return [{
-            'name': user.name_user,
-            'email': user.email_user,
-            'idSigaa': user.idSigaa_user,
-            'type': user_research.TypeUser_usersResearchHotbed,
-            'dateEnter': user_research.dateEnter_usersResearchHotbed,
-            'dateExit': user_research.dateExit_usersResearchHotbed, # Campo que SÍ existe
-            'observation': user_research.observation_usersResearchHotbed, # Usar observation en lugar de exitReason
-            'status': user_research.status_usersResearchHotbed
-        } for user, user_research in members_query]
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo miembros: {str(e)}")
-        return []
+        while True:
+            chunk = file.read(PDF_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+def get_active_members(research_hotbed_id):
+    """
+    Obtiene TODOS los miembros del semillero (activos e inactivos).
+    Los errores de la consulta se propagan: un reporte vacío no debe
+    guardarse en la caché de archivos como si fuera válido.
+    """
+    # CAMBIO: Eliminar filtro de status para mostrar todos los miembros
+    members_query = db.session.query(User, UsersResearchHotbed).join(
+        UsersResearchHotbed, User.iduser == UsersResearchHotbed.user_iduser
+    ).filter(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id
+        # Removido: UsersResearchHotbed.status_usersResearchHotbed == 'Activo'
+    ).order_by(
+        # Activos primero (Activo = 1, otros = 0), luego alfabético
+        (UsersResearchHotbed.status_usersResearchHotbed == 'Activo').desc(),
+        User.name_user.asc()
+    ).all()
+    
+    return [serialize_member(user, user_research) for user, user_research in members_query]
+
+def get_members_by_hotbed(research_hotbed_ids):
+    """Miembros de varios semilleros en una sola consulta: {semillero: [miembros]}"""
+    members_query = db.session.query(User, UsersResearchHotbed).join(
+        UsersResearchHotbed, User.iduser == UsersResearchHotbed.user_iduser
+    ).filter(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed.in_(research_hotbed_ids)
+    ).order_by(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed,
+        (UsersResearchHotbed.status_usersResearchHotbed == 'Activo').desc(),
+        User.name_user.asc()
+    ).all()
+
+    members_by_hotbed = {}
+    for user, user_research in members_query:
+        members_by_hotbed.setdefault(user_research.researchHotbed_idresearchHotbed, []).append(
+            serialize_member(user, user_research)
+        )
+    return members_by_hotbed
+
+def serialize_member(user, user_research):
+    return {
+        'name': user.name_user,
+        'email': user.email_user,
+        'idSigaa': user.idSigaa_user,
+        'type': user_research.TypeUser_usersResearchHotbed,
+        'dateEnter': user_research.dateEnter_usersResearchHotbed,
+        'dateExit': user_research.dateExit_usersResearchHotbed, # Campo que SÍ existe
+        'observation': user_research.observation_usersResearchHotbed, # Usar observation en lugar de exitReason
+        'status': user_research.status_usersResearchHotbed
+    }
 
 def get_activities_by_semester(research_hotbed_id, semester):
-    """Obtiene actividades filtradas por semestre usando el campo 'semester' de la actividad"""
-    try:
-        # Consulta base de actividades filtradas por el campo semester
-        activities_query = db.session.query(ActivitiesResearchHotbed).filter(
+    """
+    Obtiene actividades filtradas por semestre usando el campo 'semester' de
+    la actividad. Los errores se propagan, igual que en get_active_members.
+    """
+    # Un solo SELECT con las columnas del perfil de exportación (actividad,
+    # proyecto, producto y reconocimiento); los autores se cargan en bloque
+    plan = get_plan('export')
+    rows = db.session.execute(
+        select_activities(plan).where(
             ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed.in_(
-                db.session.query(UsersResearchHotbed.idusersResearchHotbed).filter(
+                select(UsersResearchHotbed.idusersResearchHotbed).where(
                     UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id
                 )
             ),
             ActivitiesResearchHotbed.semester == semester  # Filtrar por el campo semester
-        ).all()
-        
-        # Procesar actividades
-        filtered_activities = []
-        for activity in activities_query:
-            # Obtener autores
-            authors_data = get_activity_authors(activity.idactivitiesResearchHotbed)
-            
-            activity_data = {
-                'id': activity.idactivitiesResearchHotbed,
-                'title': activity.title_activitiesResearchHotbed,
-                'responsible': activity.responsible_activitiesResearchHotbed,
-                'date': activity.date_activitiesResearchHotbed,
-                'description': activity.description_activitiesResearchHotbed,
-                'type': activity.type_activitiesResearchHotbed,
-                'duration': activity.duration_activitiesResearchHotbed or 0,
-                'start_time': activity.startTime_activitiesResearchHotbed,
-                'end_time': activity.endTime_activitiesResearchHotbed,
-                'approved_free_hours': bool(activity.approvedFreeHours_activitiesResearchHotbed),
-                'reference_number': getattr(activity, 'reference_number', None),
-                'publication_date': getattr(activity, 'publication_date', None),
-                'organization_name': getattr(activity, 'organization_name', None),
-                'authors': authors_data
-            }
-            
-            # Obtener datos específicos según el tipo
-            if (activity.type_activitiesResearchHotbed and 
-                activity.type_activitiesResearchHotbed.lower() == 'proyecto' and 
-                activity.projectsResearchHotbed_idprojectsResearchHotbed):
-                
-                from models.projects_researchHotbed import ProjectsResearchHotbed
-                project = db.session.query(ProjectsResearchHotbed).filter_by(
-                    idprojectsResearchHotbed=activity.projectsResearchHotbed_idprojectsResearchHotbed
-                ).first()
-                if project:
-                    activity_data['project_data'] = {
-                        'name': project.name_projectsResearchHotbed or 'Sin especificar',
-                        'reference_number': project.referenceNumber_projectsResearchHotbed,
-                        'start_date': project.startDate_projectsResearchHotbed,
-                        'end_date': project.endDate_projectsResearchHotbed
-                    }
-            
-            elif (activity.type_activitiesResearchHotbed and 
-                  activity.type_activitiesResearchHotbed.lower() == 'producto' and 
-                  activity.productsResearchHotbed_idproductsResearchHotbed):
-                
-                from models.products_researchHotbed import ProductsResearchHotbed
-                product = db.session.query(ProductsResearchHotbed).filter_by(
-                    idproductsResearchHotbed=activity.productsResearchHotbed_idproductsResearchHotbed
-                ).first()
-                if product:
-                    activity_data['product_data'] = {
-                        'category': product.category_productsResearchHotbed,
-                        'type': product.type_productsResearchHotbed,
-                        'description': product.description_productsResearchHotbed
-                    }
-            
-            elif (activity.type_activitiesResearchHotbed and 
-                  activity.type_activitiesResearchHotbed.lower() == 'reconocimiento' and 
-                  activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed):
-                
-                from models.recognitions_researchHotbed import RecognitionsResearchHotbed
-                recognition = db.session.query(RecognitionsResearchHotbed).filter_by(
-                    idrecognitionsResearchHotbed=activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed
-                ).first()
-                if recognition:
-                    activity_data['recognition_data'] = {
-                        'project_name': recognition.projectName_recognitionsResearchHotbed,
-                        'organization_name': recognition.organizationName_recognitionsResearchHotbed
-                    }
-            
-            filtered_activities.append(activity_data)
-                
-        return filtered_activities
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo actividades: {str(e)}")
-        return []
+        ).order_by(
+            ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+            ActivitiesResearchHotbed.idactivitiesResearchHotbed
+        )
+    ).all()
 
-def get_activity_authors(activity_id):
-    """Obtiene los autores de una actividad"""
-    try:
-        authors_query = db.session.query(User, ActivityAuthors).join(
-            UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    return serialize_rows(plan, rows)
+
+def get_activities_by_hotbed(research_hotbed_ids, semester):
+    """
+    Actividades del semestre de varios semilleros en un solo SELECT (autores en
+    bloque): {semillero: [actividades]}
+    """
+    plan = get_plan('export')
+    rows = db.session.execute(
+        select_activities(plan).add_columns(
+            UsersResearchHotbed.researchHotbed_idresearchHotbed.label('hotbed_id')
         ).join(
-            User, UsersResearchHotbed.user_iduser == User.iduser
-        ).filter(
-            ActivityAuthors.activity_id == activity_id
-        ).all()
-        
-        main_authors = []
-        co_authors = []
-        
-        for user, author_relation in authors_query:
-            if author_relation.is_main_author:
-                main_authors.append(user.name_user)
-            else:
-                co_authors.append(user.name_user)
-                
-        return {
-            'main_authors': main_authors,
-            'co_authors': co_authors
-        }
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo autores: {str(e)}")
-        return {'main_authors': [], 'co_authors': []}
+            UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+        ).where(
+            UsersResearchHotbed.researchHotbed_idresearchHotbed.in_(research_hotbed_ids),
+            ActivitiesResearchHotbed.semester == semester
+        ).order_by(
+            UsersResearchHotbed.researchHotbed_idresearchHotbed,
+            ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+            ActivitiesResearchHotbed.idactivitiesResearchHotbed
+        )
+    ).all()
+
+    activities_by_hotbed = {}
+    for row, activity in zip(rows, serialize_rows(plan, rows)):
+        activities_by_hotbed.setdefault(row.hotbed_id, []).append(activity)
+    return activities_by_hotbed
 
-def generate_pdf_report(research_hotbed, members, activities, semester):
-    """Genera el PDF usando estilos con colores de la app"""
-    buffer = BytesIO()
+def generate_pdf_report(research_hotbed, members, activities, semester, output=None, stats=None):
+    """
+    Genera el PDF usando estilos con colores de la app.
+    Se escribe en 'output' (archivo binario) o en un BytesIO nuevo. La
+    maquetación consume el story a medida que arma cada página. 'stats' son
+    los totales de la tabla de resumen; sin ellos se calculan sobre las actividades.
+    """
+    if stats is None:
+        stats = summarize_activities(activities)
+    buffer = output if output is not None else BytesIO()
     doc = SimpleDocTemplate(
         buffer, 
         pagesize=A4, 
@@ -662,15 +689,13 @@ def generate_pdf_report(research_hotbed, members, activities, semester):
     # Usar el mismo criterio de filtrado que en la tabla
     active_members = [m for m in members if m['status'] == 'Activo']
     inactive_members = [m for m in members if m['status'] != 'Activo']
-    total_hours = sum(a['duration'] for a in activities)
-    approved_activities = len([a for a in activities if a['approved_free_hours']])
     
     stats_data = [
         ['Total miembros', str(len(members)), 'Miembros activos', str(len(active_members))],
-        ['Miembros inactivos', str(len(inactive_members)), 'Horas totales', f'{total_hours}h'],
-        ['Total actividades', str(len(activities)), 'Actividades aprobadas', str(approved_activities)],
-        ['Proyectos', str(len([a for a in activities if 'proyecto' in a['type'].lower()])), 'Productos', str(len([a for a in activities if 'producto' in a['type'].lower()]))],
-        ['Reconocimientos', str(len([a for a in activities if 'reconocimiento' in a['type'].lower()])), 'Pendientes', str(len(activities) - approved_activities)]
+        ['Miembros inactivos', str(len(inactive_members)), 'Horas totales', f'{stats["total_hours"]}h'],
+        ['Total actividades', str(stats['total_activities']), 'Actividades aprobadas', str(stats['approved_activities'])],
+        ['Proyectos', str(stats['projects']), 'Productos', str(stats['products'])],
+        ['Reconocimientos', str(stats['recognitions']), 'Pendientes', str(stats['total_activities'] - stats['approved_activities'])]
     ]
     
     stats_table = Table(stats_data, colWidths=[1.5*inch, 1*inch, 1.5*inch, 1*inch])
@@ -719,14 +744,14 @@ def generate_pdf_report(research_hotbed, members, activities, semester):
         # Reducir algunos anchos para hacer espacio para fecha de salida y observación
         members_table = Table(members_data, colWidths=[1.4*inch, 0.8*inch, 0.8*inch, 0.6*inch, 0.6*inch, 0.6*inch, 1.0*inch])
         
-        # Estilo con colores diferentes para activos/inactivos
-        table_style = get_standard_table_style()
+        # Estilo con colores diferentes para activos/inactivos (hijo del estilo estándar)
+        table_style = TableStyle(parent=get_standard_table_style())
         
         # Agregar colores especiales para miembros inactivos
         for row_idx, member in enumerate(sorted_members, 1):  # Saltar header, empezar desde 1
             if member['status'] != 'Activo':  # Si no es activo
-                table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#fee2e2'))  # Fondo rojo claro
-                table_style.add('TEXTCOLOR', (0, row_idx), (-1, row_idx), colors.HexColor('#7f1d1d'))  # Texto rojo oscuro
+                table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), INACTIVE_ROW_BACKGROUND)  # Fondo rojo claro
+                table_style.add('TEXTCOLOR', (0, row_idx), (-1, row_idx), INACTIVE_ROW_TEXT)  # Texto rojo oscuro
         
         # Ajustar alineación para las columnas de fecha
         table_style.add('ALIGN', (4, 0), (5, -1), 'CENTER')  # Centrar fechas
@@ -816,16 +841,18 @@ def generate_pdf_report(research_hotbed, members, activities, semester):
                 # Crear tabla de información con estilo especial para separadores
                 info_table = Table(basic_info, colWidths=[1.8*inch, 4.7*inch])
                 
-                # Estilo base
+                # Estilo base compartido; solo las tablas con separadores crean un estilo hijo
                 table_style = get_info_table_style()
+                separator_rows = [row_idx for row_idx, row in enumerate(basic_info) if row[0].startswith('DATOS DEL')]
+                if separator_rows:
+                    table_style = TableStyle(parent=table_style)
                 
                 # Agregar estilo especial para separadores
-                for row_idx, row in enumerate(basic_info):
-                    if row[0].startswith('DATOS DEL'):
-                        table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#e879f9'))  # Rosa medio
-                        table_style.add('TEXTCOLOR', (0, row_idx), (-1, row_idx), colors.white)
-                        table_style.add('FONTNAME', (0, row_idx), (-1, row_idx), 'Helvetica-Bold')
-                        table_style.add('ALIGN', (0, row_idx), (-1, row_idx), 'CENTER')
+                for row_idx in separator_rows:
+                    table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), SEPARATOR_ROW_BACKGROUND)  # Rosa medio
+                    table_style.add('TEXTCOLOR', (0, row_idx), (-1, row_idx), colors.white)
+                    table_style.add('FONTNAME', (0, row_idx), (-1, row_idx), 'Helvetica-Bold')
+                    table_style.add('ALIGN', (0, row_idx), (-1, row_idx), 'CENTER')
                 
                 info_table.setStyle(table_style)
                 story.append(info_table)
@@ -847,7 +874,7 @@ def generate_pdf_report(research_hotbed, members, activities, semester):
     buffer.seek(0)
     return buffer
 
-def create_projects_sheet(writer, projects, sheet_name):
+def create_projects_sheet(workbook, projects, sheet_name):
     """Crea hoja específica para proyectos con formato profesional"""
     projects_data = []
     
@@ -879,10 +906,9 @@ def create_projects_sheet(writer, projects, sheet_name):
         
         projects_data.append(project_info)
     
-    df_projects = pd.DataFrame(projects_data)
-    df_projects.to_excel(writer, sheet_name=sheet_name, index=False)
+    workbook.write_records(sheet_name, projects_data, styler=activities_sheet_styler)
 
-def create_products_sheet(writer, products, sheet_name):
+def create_products_sheet(workbook, products, sheet_name):
     """Crea hoja específica para productos con formato profesional"""
     products_data = []
     
@@ -921,10 +947,9 @@ def create_products_sheet(writer, products, sheet_name):
         
         products_data.append(product_info)
     
-    df_products = pd.DataFrame(products_data)
-    df_products.to_excel(writer, sheet_name=sheet_name, index=False)
+    workbook.write_records(sheet_name, products_data, styler=activities_sheet_styler)
 
-def create_recognitions_sheet(writer, recognitions, sheet_name):
+def create_recognitions_sheet(workbook, recognitions, sheet_name):
     """Crea hoja específica para reconocimientos con formato profesional"""
     recognitions_data = []
     
@@ -962,10 +987,9 @@ def create_recognitions_sheet(writer, recognitions, sheet_name):
         
         recognitions_data.append(recognition_info)
     
-    df_recognitions = pd.DataFrame(recognitions_data)
-    df_recognitions.to_excel(writer, sheet_name=sheet_name, index=False)
+    workbook.write_records(sheet_name, recognitions_data, styler=activities_sheet_styler)
 
-def create_generic_activities_sheet(writer, activities, sheet_name):
+def create_generic_activities_sheet(workbook, activities, sheet_name):
     """Crea hoja para actividades genéricas con formato profesional"""
     activities_data = []
     
@@ -995,120 +1019,4 @@ def create_generic_activities_sheet(writer, activities, sheet_name):
         
         activities_data.append(activity_info)
     
-    df_activities = pd.DataFrame(activities_data)
-    df_activities.to_excel(writer, sheet_name=sheet_name, index=False)
-
-def apply_info_sheet_styles(sheet, header_font, subheader_font, body_font, 
-                           header_fill, body_fill, alternate_fill, 
-                           center_alignment, left_alignment, header_border, body_border):
-    """Aplica estilos específicos a la hoja de información general"""
-    
-    # Colores especiales para secciones
-    section_blue = '4A90E2'
-    section_fill = PatternFill(start_color=section_blue, end_color=section_blue, fill_type='solid')
-    section_font = Font(bold=True, color='FFFFFF', size=11, name='Calibri')
-    
-    for row_num, row in enumerate(sheet.iter_rows(), 1):
-        for col_num, cell in enumerate(row, 1):
-            cell.border = body_border
-            
-            # Headers y títulos de sección
-            if cell.value and isinstance(cell.value, str):
-                if cell.value.startswith('INFORMACIÓN DEL SEMILLERO') or cell.value.startswith('ESTADÍSTICAS GENERALES'):
-                    cell.font = section_font
-                    cell.fill = section_fill
-                    cell.alignment = center_alignment
-                    # Merge cells para títulos de sección
-                    if col_num == 1:
-                        try:
-                            sheet.merge_cells(f'A{row_num}:B{row_num}')
-                        except:
-                            pass
-                elif col_num == 1 and cell.value not in ['', ' ']:  # Primera columna con contenido
-                    cell.font = subheader_font
-                    cell.fill = body_fill
-                    cell.alignment = left_alignment
-                else:  # Segunda columna (valores)
-                    cell.font = body_font
-                    cell.fill = alternate_fill
-                    cell.alignment = left_alignment
-            else:
-                cell.font = body_font
-                cell.fill = alternate_fill
-
-def apply_members_sheet_styles(sheet, header_font, body_font, 
-                              header_fill, body_fill, alternate_fill,
-                              center_alignment, left_alignment, header_border, body_border):
-    """Aplica estilos específicos a la hoja de miembros"""
-    
-    # Colores para estados
-    active_fill = PatternFill(start_color='E8F5E8', end_color='E8F5E8', fill_type='solid')  # Verde claro
-    inactive_fill = PatternFill(start_color='FFE8E8', end_color='FFE8E8', fill_type='solid')  # Rojo claro
-    
-    for row_num, row in enumerate(sheet.iter_rows(), 1):
-        for col_num, cell in enumerate(row, 1):
-            cell.border = body_border
-            
-            if row_num == 1:  # Header row
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_alignment
-            else:
-                cell.font = body_font
-                cell.alignment = left_alignment if col_num in [1, 2, 8] else center_alignment  # Nombre, email y observación a la izquierda
-                
-                # Colorear filas según el estado del miembro
-                estado_cell = sheet.cell(row=row_num, column=5)  # Columna "Estado Actual"
-                if estado_cell.value == 'Activo':
-                    cell.fill = active_fill
-                elif estado_cell.value and estado_cell.value != 'Activo':
-                    cell.fill = inactive_fill
-                else:
-                    cell.fill = alternate_fill if row_num % 2 == 0 else body_fill
-
-def apply_activities_sheet_styles(sheet, header_font, body_font,
-                                 header_fill, body_fill, alternate_fill,
-                                 center_alignment, left_alignment, header_border, body_border):
-    """Aplica estilos específicos a las hojas de actividades"""
-    
-    # Color para actividades aprobadas/pendientes
-    approved_fill = PatternFill(start_color='E8F5E8', end_color='E8F5E8', fill_type='solid')  # Verde claro
-    pending_fill = PatternFill(start_color='FFF4E6', end_color='FFF4E6', fill_type='solid')   # Naranja claro
-    
-    for row_num, row in enumerate(sheet.iter_rows(), 1):
-        for col_num, cell in enumerate(row, 1):
-            cell.border = body_border
-            
-            if row_num == 1:  # Header row
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_alignment
-            else:
-                cell.font = body_font
-                
-                # Alineación específica por tipo de columna (actualizada para nuevas columnas)
-                if col_num in [1, 6]:  # Título del informe y descripción del informe a la izquierda
-                    cell.alignment = left_alignment
-                elif col_num in [2, 4]:  # Fecha y horario centrados
-                    cell.alignment = center_alignment
-                else:
-                    cell.alignment = left_alignment
-                
-                # Colorear filas según estado de aprobación
-                # Buscar columna "Estado de Horas Libres"
-                horas_libres_col = None
-                for col_idx, header_cell in enumerate(sheet[1], 1):
-                    if header_cell.value == 'Estado de Horas Libres':
-                        horas_libres_col = col_idx
-                        break
-                
-                if horas_libres_col:
-                    status_cell = sheet.cell(row=row_num, column=horas_libres_col)
-                    if status_cell.value == 'Aprobadas':
-                        cell.fill = approved_fill
-                    elif status_cell.value == 'Pendientes':
-                        cell.fill = pending_fill
-                    else:
-                        cell.fill = alternate_fill if row_num % 2 == 0 else body_fill
-                else:
-                    cell.fill = alternate_fill if row_num % 2 == 0 else body_fill
\ No newline at end of file
+    workbook.write_records(sheet_name, activities_data, styler=activities_sheet_styler)
@@ -0,0 +1,148 @@
+import logging
+from datetime import datetime, timezone
+from flask import jsonify, send_file
+from utils.export_jobs import export_jobs, ExportQueueFullError, FINISHED
+from utils.semester_utils import is_valid_semester
+
+logger = logging.getLogger(__name__)
+
+def _research_hotbed_job(data):
+    research_hotbed_id = data.get('research_hotbed_id')
+    if not isinstance(research_hotbed_id, int):
+        return None, "Parámetro 'research_hotbed_id' requerido"
+    return {'research_hotbed_id': research_hotbed_id}, None
+
+def _user_job(data):
+    user_id = data.get('user_id')
+    if not isinstance(user_id, int):
+        return None, "Parámetro 'user_id' requerido"
+    return {'user_id': user_id}, None
+
+def _users_job(data):
+    user_ids = data.get('user_ids')
+    if not user_ids or not isinstance(user_ids, list) or not all(isinstance(user_id, int) for user_id in user_ids):
+        return None, "Lista de usuarios requerida"
+    return {'user_ids': user_ids}, None
+
+def _research_hotbeds_job(data):
+    scope = data.get('scope', 'all')
+    if scope not in ('faculty', 'branch', 'all'):
+        return None, "Parámetro 'scope' inválido"
+    value = data.get('value')
+    if scope != 'all' and (not value or not isinstance(value, str)):
+        return None, "Parámetro 'value' requerido"
+    return {'scope': scope, 'value': value if scope != 'all' else None}, None
+
+# Los generadores importan los controladores de Excel al ejecutarse (en el
+# hilo del trabajo), no al cargar este módulo
+
+def _build_research_hotbed(params, semester, progress):
+    from controllers.export.excel_export_controller import build_research_hotbed_excel
+    return build_research_hotbed_excel(params['research_hotbed_id'], semester, progress)
+
+def _build_user(params, semester, progress):
+    from controllers.export.users_pdf_export_controller import build_user_excel
+    return build_user_excel(params['user_id'], semester, progress)
+
+def _build_users(params, semester, progress):
+    from controllers.export.users_pdf_export_controller import build_multiple_users_excel
+    return build_multiple_users_excel(params['user_ids'], semester, progress)
+
+def _build_research_hotbeds(params, semester, progress):
+    from controllers.export.scope_export_controller import build_scope_excel
+    return build_scope_excel(params['scope'], params['value'], semester, progress)
+
+# Tipo de exportación -> (validación de parámetros, generador del archivo)
+JOB_TYPES = {
+    'research_hotbed': (_research_hotbed_job, _build_research_hotbed),
+    'user': (_user_job, _build_user),
+    'users': (_users_job, _build_users),
+    'research_hotbeds': (_research_hotbeds_job, _build_research_hotbeds)
+}
+
+def create_export_job(data, owner_id):
+    """
+    Encola una exportación y responde de inmediato con el id del trabajo.
+    Body JSON: {"type": "research_hotbed" | "user" | "users" | "research_hotbeds", "semester": "...",
+                "research_hotbed_id" | "user_id" | "user_ids" | "scope" y "value": ...}
+    """
+    if not data:
+        return jsonify({"error": "No se enviaron datos"}), 400
+
+    job_type = JOB_TYPES.get(data.get('type'))
+    if not job_type:
+        return jsonify({"error": f"Tipo de exportación inválido. Opciones: {', '.join(JOB_TYPES)}"}), 400
+
+    semester = data.get('semester')
+    if not semester:
+        return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+    if not is_valid_semester(semester):
+        return jsonify({"error": "Semestre inválido"}), 400
+
+    validate_params, build_file = job_type
+    params, error = validate_params(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    def run(progress):
+        from utils.excel_writer import XLSX_MIMETYPE
+        buffer, filename = build_file(params, semester, progress)
+        return buffer, filename, XLSX_MIMETYPE
+
+    try:
+        job = export_jobs.submit(data['type'], {**params, 'semester': semester}, run, owner_id=owner_id)
+    except ExportQueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+
+    logger.info("Exportación %s encolada (%s)", job['id'], job['type'])
+    return jsonify(serialize_job(job)), 202
+
+def get_export_job(job_id, owner_id):
+    """Estado y progreso de un trabajo de exportación"""
+    job = _get_owned_job(job_id, owner_id)
+    if not job:
+        return jsonify({"error": "Trabajo de exportación no encontrado"}), 404
+
+    return jsonify(serialize_job(job)), 200
+
+def download_export_job_file(job_id, owner_id):
+    """Descarga el archivo generado por un trabajo terminado"""
+    job = _get_owned_job(job_id, owner_id)
+    if not job:
+        return jsonify({"error": "Trabajo de exportación no encontrado"}), 404
+
+    if job['status'] != FINISHED:
+        return jsonify({"error": "El archivo aún no está disponible", "status": job['status']}), 409
+
+    return send_file(
+        export_jobs.file_path(job_id),
+        mimetype=job['mimetype'],
+        as_attachment=True,
+        download_name=job['filename'],
+        max_age=0
+    )
+
+def _get_owned_job(job_id, owner_id):
+    job = export_jobs.get(job_id)
+    if not job or job['owner_id'] != owner_id:
+        return None
+    return job
+
+def serialize_job(job):
+    expires_at = job['finished_at'] + export_jobs.ttl if job['finished_at'] else None
+    return {
+        "job_id": job['id'],
+        "type": job['type'],
+        "status": job['status'],
+        "progress": job['progress'],
+        "message": job['message'],
+        "error": job['error'],
+        "filename": job['filename'],
+        "created_at": _isoformat(job['created_at']),
+        "expires_at": _isoformat(expires_at),
+        "status_url": f"/export/jobs/{job['id']}",
+        "file_url": f"/export/jobs/{job['id']}/file" if job['status'] == FINISHED else None
+    }
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
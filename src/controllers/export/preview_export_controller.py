@@ -0,0 +1,37 @@
+from flask import jsonify
+from models.users import User
+from db.connection import db
+from utils.activity_stats import get_users_activity_stats, get_users_hotbed_counts, EMPTY_ACTIVITY_STATS
+from utils.semester_utils import format_semester_label_detailed
+
+def preview_user_export(user_id, semester):
+    """
+    Previsualiza los totales que se incluirán en el Excel del usuario.
+    Solo se necesitan conteos y sumas: la fila del usuario en la tabla de
+    resumen por semestre y un COUNT de semilleros, sin cargar las actividades
+    ni sus autores.
+    """
+    user = db.session.get(User, user_id)
+    if not user:
+        return jsonify({"error": "Usuario no encontrado"}), 404
+
+    stats = get_users_activity_stats([user_id], semester).get(user_id, EMPTY_ACTIVITY_STATS)
+    research_hotbeds_count = get_users_hotbed_counts([user_id]).get(user_id, 0)
+
+    return jsonify({
+        "user": {
+            "name": user.name_user,
+            "email": user.email_user,
+            "idSigaa": user.idSigaa_user,
+            "type": user.type_user
+        },
+        "semester_label": format_semester_label_detailed(semester),
+        "stats": {
+            "total_research_hotbeds": research_hotbeds_count,
+            "total_activities": stats['total_activities'],
+            "total_hours": stats['total_hours'],
+            "approved_activities": stats['approved_activities']
+        },
+        "research_hotbeds_count": research_hotbeds_count,
+        "activities_count": stats['total_activities']
+    }), 200
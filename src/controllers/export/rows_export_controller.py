@@ -0,0 +1,115 @@
+import logging
+from flask import jsonify, Response, stream_with_context
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.research_hotbed import ResearchHotbed
+from models.users import User
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+from utils.activity_loaders import user_activity_ids_query, users_activity_ids_query
+from utils.activity_serializer import aggregated_author_names, get_plan, profile_fields, select_activities, serialize_rows
+from utils.row_stream import STREAM_FORMATS, stream_query_records, encode_records
+from utils.semester_utils import is_valid_semester
+
+logger = logging.getLogger(__name__)
+
+# Campos planos de la exportación por filas: los del Excel del usuario sin los
+# bloques por tipo; los autores se leen como columnas agregadas del mismo SELECT
+ROW_FIELDS = frozenset(profile_fields('user_export')) - {'authors', 'project_data', 'product_data', 'recognition_data'}
+AUTHOR_COLUMNS = ('main_authors', 'co_authors')
+
+def export_research_hotbed_rows(research_hotbed_id, semester, fmt):
+    """Actividades del semillero en el semestre, en CSV o NDJSON"""
+    if not is_valid_semester(semester):
+        return jsonify({"error": "Semestre inválido"}), 400
+
+    if not db.session.get(ResearchHotbed, research_hotbed_id):
+        return jsonify({"error": "Semillero no encontrado"}), 404
+
+    stmt = _select_rows().join(
+        UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    ).where(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id,
+        ActivitiesResearchHotbed.semester == semester
+    ).order_by(
+        ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed
+    )
+
+    return _stream_response(stmt, fmt, f'semillero_{research_hotbed_id}_{semester}')
+
+def export_user_rows(user_id, semester, fmt):
+    """Actividades del usuario (creador o autor/co-autor) en el semestre, en CSV o NDJSON"""
+    if not is_valid_semester(semester):
+        return jsonify({"error": "Semestre inválido"}), 400
+
+    if not db.session.get(User, user_id):
+        return jsonify({"error": "Usuario no encontrado"}), 404
+
+    activity_ids = user_activity_ids_query(user_id)
+    stmt = _select_rows().join(
+        activity_ids, ActivitiesResearchHotbed.idactivitiesResearchHotbed == activity_ids.c.activity_id
+    ).where(
+        ActivitiesResearchHotbed.semester == semester
+    ).order_by(
+        ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed
+    )
+
+    return _stream_response(stmt, fmt, f'usuario_{user_id}_{semester}')
+
+def export_users_rows(user_ids, semester, fmt):
+    """
+    Actividades de varios usuarios en el semestre, en CSV o NDJSON.
+    Cada fila indica el usuario (user_id); una actividad compartida aparece una vez por usuario.
+    """
+    if not is_valid_semester(semester):
+        return jsonify({"error": "Semestre inválido"}), 400
+
+    if not user_ids:
+        return jsonify({"error": "No se especificaron usuarios"}), 400
+
+    activity_ids = users_activity_ids_query(user_ids)
+    stmt = _select_rows().add_columns(
+        activity_ids.c.user_id.label('user_id')
+    ).join(
+        activity_ids, ActivitiesResearchHotbed.idactivitiesResearchHotbed == activity_ids.c.activity_id
+    ).where(
+        ActivitiesResearchHotbed.semester == semester
+    ).order_by(
+        activity_ids.c.user_id,
+        ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed
+    )
+
+    return _stream_response(stmt, fmt, f'usuarios_{semester}', leading_columns=('user_id',))
+
+def _select_rows():
+    return select_activities(get_plan('user_export', ROW_FIELDS)).add_columns(
+        aggregated_author_names(main_author=True).label('main_authors'),
+        aggregated_author_names(main_author=False).label('co_authors')
+    )
+
+def _split_names(names):
+    return names.split('; ') if names else []
+
+def _stream_response(stmt, fmt, basename, leading_columns=()):
+    plan = get_plan('user_export', ROW_FIELDS)
+    columns = list(leading_columns) + [name for name, _, _ in plan.fields] + list(AUTHOR_COLUMNS)
+
+    def to_records(rows):
+        # El plan no pide autores, así que serialize_rows no hace consultas
+        records = []
+        for row, data in zip(rows, serialize_rows(plan, rows)):
+            record = {label: row._mapping[label] for label in leading_columns}
+            record.update(data)
+            for label in AUTHOR_COLUMNS:
+                record[label] = _split_names(row._mapping[label])
+            records.append(record)
+        return records
+
+    logger.info("Exportación %s en streaming (%s)", basename, fmt)
+    return Response(
+        stream_with_context(encode_records(stream_query_records(stmt, to_records), fmt, columns)),
+        mimetype=STREAM_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{basename}.{fmt}"'}
+    )
@@ -0,0 +1,252 @@
+import logging
+import re
+from datetime import datetime
+from flask import jsonify, make_response
+from models.research_hotbed import ResearchHotbed
+from controllers.export.excel_export_controller import (
+    get_members_by_hotbed,
+    get_activities_by_hotbed,
+    BODY_BORDER, BODY_FILL, ALTERNATE_FILL, BODY_FONT, HEADER_FONT, HEADER_FILL, SUBHEADER_FONT,
+    SECTION_FONT, SECTION_FILL, ACTIVE_FILL, INACTIVE_FILL, APPROVED_FILL, PENDING_FILL,
+    CENTER_ALIGNMENT, LEFT_ALIGNMENT
+)
+from utils.excel_writer import StreamingWorkbook, CellStyle, XLSX_MIMETYPE
+from utils.export_jobs import ExportError
+from utils.semester_utils import format_semester_label_detailed, is_valid_semester
+
+# Exportación del semestre para varios semilleros en un solo libro: todos los
+# semilleros de una facultad, de una sede o de la institución. Miembros y
+# actividades se consultan en bloque para todos los semilleros incluidos (una
+# consulta para miembros, una para actividades y una para sus autores) y el
+# libro se escribe en streaming: una hoja de resumen y una hoja por semillero.
+
+logger = logging.getLogger(__name__)
+
+# Alcance -> (columna del semillero que se filtra, etiqueta para el nombre del archivo)
+EXPORT_SCOPES = {
+    'faculty': (ResearchHotbed.faculty_researchHotbed, 'facultad'),
+    'branch': (ResearchHotbed.universityBranch_researchHotbed, 'sede'),
+    'all': (None, 'institucion')
+}
+
+SUMMARY_HEADER = [
+    'Semillero', 'Acrónimo', 'Facultad', 'Sede', 'Miembros', 'Miembros Activos',
+    'Actividades', 'Horas Totales', 'Actividades Aprobadas', 'Actividades Pendientes',
+    'Proyectos', 'Productos', 'Reconocimientos'
+]
+
+MEMBERS_HEADER = ['Nombre Completo', 'Correo Electrónico', 'ID SIGAA', 'Tipo de Usuario', 'Estado Actual', 'Fecha de Ingreso']
+
+ACTIVITIES_HEADER = [
+    'Tipo', 'Título', 'Fecha', 'Duración (horas)', 'Autores Principales', 'Co-autores', 'Estado de Horas Libres'
+]
+
+# Tipos de fila de las hojas por semillero (para sus estilos)
+SECTION_ROW = 'section'
+INFO_ROW = 'info'
+HEADER_ROW = 'header'
+MEMBER_ROW = 'member'
+ACTIVITY_ROW = 'activity'
+BLANK_ROW = 'blank'
+
+_INVALID_SHEET_CHARS = re.compile(r'[\\/?*\[\]:]')
+
+def build_scope_excel(scope, value, semester, progress=None):
+    """
+    Genera el libro de los semilleros del alcance ('faculty', 'branch' o 'all')
+    y devuelve (buffer, nombre de archivo).
+    Lanza ExportError si los parámetros son inválidos o no hay semilleros.
+    """
+    if not semester or not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
+
+    if scope not in EXPORT_SCOPES:
+        raise ExportError(f"Alcance inválido. Opciones: {', '.join(EXPORT_SCOPES)}", 400)
+
+    column, scope_label = EXPORT_SCOPES[scope]
+    if column is not None and not value:
+        raise ExportError("Debe indicar la facultad o la sede", 400)
+
+    query = ResearchHotbed.query
+    if column is not None:
+        query = query.filter(column == value)
+    research_hotbeds = query.order_by(ResearchHotbed.name_researchHotbed).all()
+
+    if not research_hotbeds:
+        raise ExportError("No se encontraron semilleros para el alcance indicado", 404)
+
+    hotbed_ids = [hotbed.idresearchHotbed for hotbed in research_hotbeds]
+    members_by_hotbed = get_members_by_hotbed(hotbed_ids)
+    activities_by_hotbed = get_activities_by_hotbed(hotbed_ids, semester)
+    if progress:
+        progress(0.4, f"Datos de {len(research_hotbeds)} semilleros cargados")
+
+    workbook = StreamingWorkbook()
+    create_summary_sheet(workbook, research_hotbeds, members_by_hotbed, activities_by_hotbed, scope, value, semester)
+
+    sheet_names = {'resumen'}
+    for index, research_hotbed in enumerate(research_hotbeds, 1):
+        hotbed_id = research_hotbed.idresearchHotbed
+        create_hotbed_sheet(
+            workbook, unique_sheet_name(research_hotbed, sheet_names), research_hotbed,
+            # Los datos de cada semillero se liberan al escribir su hoja
+            members_by_hotbed.pop(hotbed_id, []), activities_by_hotbed.pop(hotbed_id, [])
+        )
+        if progress:
+            progress(0.4 + 0.5 * index / len(research_hotbeds))
+
+    scope_name = scope_label if column is None else scope_label + '_' + re.sub(r'\W+', '_', value).strip('_')
+    return workbook.save(), f'semilleros_{scope_name}_{semester}.xlsx'
+
+def export_scope_excel(scope, value, semester):
+    """Exporta en un solo Excel los semilleros de una facultad, una sede o toda la institución"""
+    try:
+        excel_buffer, filename = build_scope_excel(scope, value, semester)
+
+        response = make_response(excel_buffer.getvalue())
+        response.headers['Content-Type'] = XLSX_MIMETYPE
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        logger.info("Excel de semilleros generado (%s=%s), semestre %s", scope, value, semester)
+        return response, 200
+
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
+    except Exception as e:
+        logger.exception("Error generando Excel de semilleros: %s", e)
+        return jsonify({"error": "Error interno del servidor"}), 500
+
+def hotbed_totals(members, activities):
+    """Totales de un semillero para el resumen"""
+    approved = len([a for a in activities if a['approved_free_hours']])
+    return {
+        'members': len(members),
+        'active_members': len([m for m in members if m['status'] == 'Activo']),
+        'activities': len(activities),
+        'hours': sum(a['duration'] for a in activities),
+        'approved': approved,
+        'pending': len(activities) - approved,
+        'projects': len([a for a in activities if 'proyecto' in a['type'].lower()]),
+        'products': len([a for a in activities if 'producto' in a['type'].lower()]),
+        'recognitions': len([a for a in activities if 'reconocimiento' in a['type'].lower()])
+    }
+
+def create_summary_sheet(workbook, research_hotbeds, members_by_hotbed, activities_by_hotbed, scope, value, semester):
+    """Hoja de resumen: una fila por semillero y una fila de totales"""
+    rows = [SUMMARY_HEADER]
+    keys = ('members', 'active_members', 'activities', 'hours', 'approved', 'pending', 'projects', 'products', 'recognitions')
+    grand_totals = dict.fromkeys(keys, 0)
+
+    for research_hotbed in research_hotbeds:
+        totals = hotbed_totals(
+            members_by_hotbed.get(research_hotbed.idresearchHotbed, []),
+            activities_by_hotbed.get(research_hotbed.idresearchHotbed, [])
+        )
+        for key in keys:
+            grand_totals[key] += totals[key]
+        rows.append([
+            research_hotbed.name_researchHotbed,
+            research_hotbed.acronym_researchHotbed,
+            research_hotbed.faculty_researchHotbed,
+            research_hotbed.universityBranch_researchHotbed
+        ] + [totals[key] for key in keys])
+
+    scope_text = 'Todos los semilleros' if scope == 'all' else value
+    rows.append([f'TOTAL ({len(research_hotbeds)} semilleros)', '', scope_text, format_semester_label_detailed(semester)]
+                + [grand_totals[key] for key in keys])
+
+    total_row = len(rows)
+
+    def summary_styler(header):
+        def style_cell(row_num, col_num, cell_value, values):
+            if row_num == 1:
+                return CellStyle(HEADER_FONT, HEADER_FILL, CENTER_ALIGNMENT, BODY_BORDER)
+            if row_num == total_row:
+                return CellStyle(SUBHEADER_FONT, BODY_FILL, LEFT_ALIGNMENT if col_num <= 4 else CENTER_ALIGNMENT, BODY_BORDER)
+            fill = ALTERNATE_FILL if row_num % 2 == 0 else BODY_FILL
+            return CellStyle(BODY_FONT, fill, LEFT_ALIGNMENT if col_num <= 4 else CENTER_ALIGNMENT, BODY_BORDER)
+        return style_cell
+
+    workbook.write_sheet('Resumen', rows, styler=summary_styler)
+
+def create_hotbed_sheet(workbook, sheet_name, research_hotbed, members, activities):
+    """Hoja de un semillero: información, miembros y actividades del semestre"""
+    rows = []
+    kinds = []
+
+    def add(kind, values):
+        kinds.append(kind)
+        rows.append(values)
+
+    add(SECTION_ROW, ['INFORMACIÓN DEL SEMILLERO'])
+    add(INFO_ROW, ['Nombre del Semillero', research_hotbed.name_researchHotbed])
+    add(INFO_ROW, ['Acrónimo/Siglas', research_hotbed.acronym_researchHotbed])
+    add(INFO_ROW, ['Facultad', research_hotbed.faculty_researchHotbed])
+    add(INFO_ROW, ['Sede Universitaria', research_hotbed.universityBranch_researchHotbed])
+    add(INFO_ROW, ['Fecha de Generación', datetime.now().strftime('%d/%m/%Y %H:%M')])
+    add(BLANK_ROW, [''])
+
+    add(SECTION_ROW, [f'MIEMBROS ({len(members)})'])
+    if members:
+        add(HEADER_ROW, MEMBERS_HEADER)
+        for member in members:
+            add(MEMBER_ROW, [
+                member['name'],
+                member['email'],
+                member['idSigaa'] or 'No registrado',
+                member['type'],
+                member['status'],
+                member['dateEnter'].strftime('%d/%m/%Y') if member['dateEnter'] else 'No registrada'
+            ])
+    else:
+        add(INFO_ROW, ['No se encontraron miembros registrados en este semillero.'])
+    add(BLANK_ROW, [''])
+
+    add(SECTION_ROW, [f'ACTIVIDADES DEL SEMESTRE ({len(activities)})'])
+    if activities:
+        add(HEADER_ROW, ACTIVITIES_HEADER)
+        for activity in activities:
+            add(ACTIVITY_ROW, [
+                activity['type'],
+                activity['title'],
+                activity['date'].strftime('%d/%m/%Y') if activity['date'] else '',
+                activity['duration'],
+                ', '.join(activity['authors']['main_authors']),
+                ', '.join(activity['authors']['co_authors']),
+                'Aprobadas' if activity['approved_free_hours'] else 'Pendientes'
+            ])
+    else:
+        add(INFO_ROW, ['No hay actividades registradas para este semestre.'])
+
+    def hotbed_styler(header):
+        def style_cell(row_num, col_num, value, values):
+            kind = kinds[row_num - 1]
+            if kind == SECTION_ROW:
+                return CellStyle(SECTION_FONT, SECTION_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+            if kind == HEADER_ROW:
+                return CellStyle(HEADER_FONT, HEADER_FILL, CENTER_ALIGNMENT, BODY_BORDER)
+            if kind == INFO_ROW:
+                font = SUBHEADER_FONT if col_num == 1 and len(values) > 1 else BODY_FONT
+                return CellStyle(font, BODY_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+            if kind == MEMBER_ROW:
+                return CellStyle(BODY_FONT, ACTIVE_FILL if values[4] == 'Activo' else INACTIVE_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+            if kind == ACTIVITY_ROW:
+                return CellStyle(BODY_FONT, APPROVED_FILL if values[-1] == 'Aprobadas' else PENDING_FILL, LEFT_ALIGNMENT, BODY_BORDER)
+            return None
+        return style_cell
+
+    workbook.write_sheet(sheet_name, rows, styler=hotbed_styler)
+
+def unique_sheet_name(research_hotbed, used_names):
+    """Nombre de hoja válido para Excel (31 caracteres, sin símbolos reservados) y no repetido"""
+    base = _INVALID_SHEET_CHARS.sub('', research_hotbed.acronym_researchHotbed or research_hotbed.name_researchHotbed).strip()
+    base = (base or f'Semillero {research_hotbed.idresearchHotbed}')[:31]
+
+    name, counter = base, 1
+    while name.lower() in used_names:
+        counter += 1
+        suffix = f' ({counter})'
+        name = base[:31 - len(suffix)] + suffix
+
+    used_names.add(name.lower())
+    return name
@@ -0,0 +1,154 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from flask import jsonify, Response
+from models.users import User
+from controllers.export.users_pdf_export_controller import (
+    generate_user_excel_report,
+    get_users_activities_by_semester,
+    get_users_research_hotbeds
+)
+from utils.semester_utils import is_valid_semester
+from utils.export_jobs import ExportError
+from utils.zip_stream import stream_zip
+
+# Exportación de un libro Excel detallado por usuario, entregados en un ZIP.
+# Los datos de todos los usuarios se consultan en bloque y cada libro se
+# genera en un pool de procesos (el armado del Excel usa CPU y no toca la base
+# de datos). Los libros se agregan al ZIP a medida que terminan y hay un
+# número acotado en curso, así nunca se tienen todos en memoria a la vez.
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_WORKERS = int(os.getenv('EXPORT_BUNDLE_WORKERS', min(4, os.cpu_count() or 1)))
+# Libros en curso por proceso antes de esperar a que se consuman los terminados
+BUNDLE_IN_FLIGHT_PER_WORKER = 2
+
+# Atributos del usuario que usa el reporte individual
+USER_REPORT_ATTRIBUTES = (
+    'iduser', 'name_user', 'idSigaa_user', 'email_user',
+    'academicProgram_user', 'type_user', 'status_user'
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_bundle_pool():
+    """Pool de procesos compartido (se crea con la primera exportación)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 'spawn' evita heredar hilos (logs, scheduler) y conexiones del proceso web
+            _pool = ProcessPoolExecutor(
+                max_workers=BUNDLE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+def reset_bundle_pool():
+    """Descarta el pool (por ejemplo si un proceso murió) para crear uno nuevo"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def render_user_workbook(user, research_hotbeds, activities, semester):
+    """Genera el libro de un usuario en un proceso del pool y devuelve sus bytes"""
+    return generate_user_excel_report(user, research_hotbeds, activities, semester).getvalue()
+
+def user_workbook_filename(user, semester):
+    return f'{user.idSigaa_user}_{user.name_user.replace(" ", "_")}_{semester}.xlsx'
+
+def build_users_bundle_jobs(user_ids, semester):
+    """
+    Consulta en bloque los datos de los usuarios y devuelve la lista de
+    (nombre de archivo, argumentos de render_user_workbook).
+    Lanza ExportError si los parámetros son inválidos o no hay usuarios.
+    """
+    if not semester or not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
+
+    if not user_ids:
+        raise ExportError("No se especificaron usuarios", 400)
+
+    users = User.query.filter(User.iduser.in_(user_ids)).order_by(User.name_user).all()
+    if not users:
+        raise ExportError("No se encontraron usuarios", 404)
+
+    hotbeds_by_user = get_users_research_hotbeds(user_ids)
+    activities_by_user = get_users_activities_by_semester(user_ids, semester)
+
+    jobs = []
+    for user in users:
+        # Copia simple (serializable) del usuario para enviarla a otro proceso
+        snapshot = SimpleNamespace(**{name: getattr(user, name) for name in USER_REPORT_ATTRIBUTES})
+        jobs.append((
+            user_workbook_filename(user, semester),
+            (snapshot, hotbeds_by_user.get(user.iduser, []), activities_by_user.get(user.iduser, []), semester)
+        ))
+    return jobs
+
+def render_workbooks(pool, jobs, max_in_flight):
+    """
+    Genera (nombre de archivo, bytes) en el orden en que terminan los libros.
+    Si el consumo se interrumpe (el cliente se desconecta o un libro falla),
+    se cancelan los libros que aún no empezaron.
+    """
+    jobs = iter(jobs)
+    pending = {}
+
+    def submit_next():
+        job = next(jobs, None)
+        if job is not None:
+            filename, args = job
+            pending[pool.submit(render_user_workbook, *args)] = filename
+
+    try:
+        for _ in range(max_in_flight):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                filename = pending.pop(future)
+                yield filename, future.result()
+                submit_next()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def export_users_excel_bundle(user_ids, semester):
+    """
+    Exporta un ZIP con el libro Excel individual de cada usuario.
+    El ZIP se transmite a medida que se generan los libros.
+    """
+    try:
+        jobs = build_users_bundle_jobs(user_ids, semester)
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
+    except Exception as e:
+        logger.error("Error consultando los datos del paquete de usuarios: %s", e)
+        return jsonify({"error": "Error interno del servidor"}), 500
+
+    pool = get_bundle_pool()
+    total = len(jobs)
+
+    def generate():
+        try:
+            yield from stream_zip(render_workbooks(pool, jobs, BUNDLE_WORKERS * BUNDLE_IN_FLIGHT_PER_WORKER))
+            logger.info("Paquete de %s libros generado, semestre %s", total, semester)
+        except BrokenProcessPool:
+            logger.exception("El pool de exportación se detuvo generando el paquete")
+            reset_bundle_pool()
+            raise
+
+    return Response(
+        generate(),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="usuarios_{semester}.zip"'}
+    )
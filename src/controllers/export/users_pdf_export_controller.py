@@ -10,134 +10,195 @@ from models.users import User
 from models.users_research_hotbed import UsersResearchHotbed
 from models.research_hotbed import ResearchHotbed
 from models.activities_researchHotbed import ActivitiesResearchHotbed
-from models.activity_authors import ActivityAuthors
 from db.connection import db
+from utils.activity_loaders import user_activity_ids_query, users_activity_ids_query
+from utils.activity_stats import get_users_activity_stats, get_users_hotbed_counts, EMPTY_ACTIVITY_STATS
+from utils.activity_serializer import get_plan, profile_fields, select_activities, serialize_rows
 from utils.semester_utils import format_semester_label_detailed, is_valid_semester
+from utils.excel_writer import XLSX_MIMETYPE
+from utils.export_jobs import ExportError
+from utils.export_cache import export_file_cache, data_fingerprint, send_cached_export, USER_REPORT
 
 logger = logging.getLogger(__name__)
 
+def build_user_excel(user_id, semester, progress=None):
+    """
+    Genera el Excel de un usuario y devuelve (buffer, nombre de archivo).
+    Lanza ExportError si el semestre es inválido o el usuario no existe.
+    """
+    # Validar semestre
+    if not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
+    
+    # Buscar el usuario - ARREGLAR deprecated .get()
+    user = db.session.get(User, user_id)
+    
+    if not user:
+        raise ExportError("Usuario no encontrado", 404)
+        
+    # Obtener datos del usuario
+    research_hotbeds = get_user_research_hotbeds(user_id)
+    activities = get_user_activities_by_semester(user_id, semester)
+    if progress:
+        progress(0.5, "Datos del usuario cargados")
+    
+    filename = f'{user.idSigaa_user}_{user.name_user.replace(" ", "_")}_{semester}.xlsx'
+    
+    # Reutilizar el archivo si ya se generó con exactamente los mismos datos
+    fingerprint = data_fingerprint(
+        USER_REPORT, user_id, semester,
+        [user.name_user, user.idSigaa_user, user.email_user, user.academicProgram_user,
+         user.type_user, user.status_user],
+        research_hotbeds, activities
+    )
+    excel_buffer = export_file_cache.load_blob(fingerprint)
+    
+    if excel_buffer is None:
+        # Generar Excel
+        try:
+            excel_buffer = write_user_excel_report(user, research_hotbeds, activities, semester)
+        except Exception as e:
+            logger.exception("Error en generate_user_excel_report")
+            return error_user_excel_report(user, semester, e), filename
+    
+    export_file_cache.store(USER_REPORT, user_id, semester, fingerprint, excel_buffer, filename)
+    
+    return excel_buffer, filename
+
 def export_user_excel(user_id, semester):
     """
     Exporta los datos de un usuario específico a Excel
     """
     try:
-        # Validar semestre
-        if not is_valid_semester(semester):
-            return jsonify({"error": "Semestre inválido"}), 400
-        
-        # Buscar el usuario - ARREGLAR deprecated .get()
-        user = db.session.get(User, user_id)
-        
-        if not user:
-            return jsonify({"error": "Usuario no encontrado"}), 404
-            
-        # Obtener datos del usuario
-        research_hotbeds = get_user_research_hotbeds(user_id)
-        activities = get_user_activities_by_semester(user_id, semester)
+        # Descarga repetida: se transmite el archivo desde el disco sin consultar la base de datos
+        if is_valid_semester(semester):
+            cached = export_file_cache.lookup(USER_REPORT, user_id, semester)
+            if cached:
+                return send_cached_export(cached)
         
-        # Generar Excel
-        excel_buffer = generate_user_excel_report(user, research_hotbeds, activities, semester)
+        excel_buffer, filename = build_user_excel(user_id, semester)
         
         # Crear respuesta
         response = make_response(excel_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = f'attachment; filename="{user.idSigaa_user}_{user.name_user.replace(" ", "_")}_{semester}.xlsx"'
+        response.headers['Content-Type'] = XLSX_MIMETYPE
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        logger.info(f"Excel generado exitosamente para usuario {user_id}, semestre {semester}")
+        logger.info("Excel generado exitosamente para usuario %s, semestre %s", user_id, semester)
         return response
         
-    except Exception as e:
-        logger.error(f"Error exportando usuario a Excel: {str(e)}")
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
+    except Exception:
+        logger.exception("Error exportando usuario a Excel")
         return jsonify({"error": "Error interno del servidor"}), 500
 
+def build_multiple_users_excel(user_ids, semester, progress=None):
+    """
+    Genera el Excel consolidado de varios usuarios y devuelve (buffer, nombre de archivo).
+    Lanza ExportError si los parámetros son inválidos o no hay usuarios.
+    """
+    # Validaciones
+    if not semester or not is_valid_semester(semester):
+        raise ExportError("Semestre inválido", 400)
+        
+    if not user_ids or len(user_ids) == 0:
+        raise ExportError("No se especificaron usuarios", 400)
+        
+    # Obtener usuarios
+    users = User.query.filter(User.iduser.in_(user_ids)).all()
+    if not users:
+        raise ExportError("No se encontraron usuarios", 404)
+    if progress:
+        progress(0.2, f"{len(users)} usuarios encontrados")
+        
+    # Generar Excel consolidado
+    excel_buffer = generate_consolidated_users_excel(users, semester)
+    
+    return excel_buffer, f'usuarios_consolidado_{semester}.xlsx'
+
 def export_multiple_users_excel(user_ids, semester):
     """
     Genera archivos Excel individuales para múltiples usuarios
     """
     try:
-        # Validaciones
-        if not semester or not is_valid_semester(semester):
-            return jsonify({"error": "Semestre inválido"}), 400
-            
-        if not user_ids or len(user_ids) == 0:
-            return jsonify({"error": "No se especificaron usuarios"}), 400
-            
-        # Obtener usuarios
-        users = User.query.filter(User.iduser.in_(user_ids)).all()
-        if not users:
-            return jsonify({"error": "No se encontraron usuarios"}), 404
-            
-        # Generar Excel consolidado
-        excel_buffer = generate_consolidated_users_excel(users, semester)
+        excel_buffer, filename = build_multiple_users_excel(user_ids, semester)
         
         # Crear respuesta
         response = make_response(excel_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = f'attachment; filename="usuarios_consolidado_{semester}.xlsx"'
+        response.headers['Content-Type'] = XLSX_MIMETYPE
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        logger.info(f"Excel consolidado generado exitosamente para {len(users)} usuarios, semestre {semester}")
+        logger.info("Excel consolidado generado exitosamente para %s usuarios, semestre %s", len(user_ids), semester)
         return response
         
+    except ExportError as e:
+        return jsonify({"error": e.message}), e.status_code
     except Exception as e:
-        logger.error(f"Error generando Excel consolidado: {str(e)}")
+        logger.exception("Error generando Excel consolidado")
         return jsonify({"error": f"Error generando Excel: {str(e)}"}), 500
 
 def generate_user_excel_report(user, research_hotbeds, activities, semester):
-    """Genera el reporte Excel individual del usuario con múltiples hojas"""
+    """Genera el reporte Excel individual del usuario (o un Excel básico con el error)"""
+    try:
+        return write_user_excel_report(user, research_hotbeds, activities, semester)
+    except Exception as e:
+        logger.exception("Error en generate_user_excel_report")
+        return error_user_excel_report(user, semester, e)
+
+def write_user_excel_report(user, research_hotbeds, activities, semester):
+    """Escribe el reporte Excel individual del usuario con múltiples hojas"""
     buffer = BytesIO()
     
-    try:
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # 1. Hoja de información personal
-            create_user_info_sheet(writer, user, research_hotbeds, activities, semester)
-            
-            # 2. Hoja de semilleros asociados
-            create_user_hotbeds_sheet(writer, research_hotbeds)
-            
-            # 3. Hojas de actividades por tipo
-            create_user_activities_sheets(writer, activities)
-        
-        # Recargar el workbook para aplicar estilos
-        buffer.seek(0)
-        workbook = load_workbook(buffer)
-        
-        # Verificar que tengamos al menos una hoja
-        if len(workbook.sheetnames) == 0:
-            ws = workbook.create_sheet("Información Personal")
-            ws['A1'] = "No hay datos disponibles"
-        
-        # Aplicar estilos
-        apply_user_excel_styles(workbook)
-        
-        # Asegurar que al menos una hoja esté visible
-        for sheet in workbook.worksheets:
-            if sheet.sheet_state == 'hidden':
-                sheet.sheet_state = 'visible'
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        # 1. Hoja de información personal
+        create_user_info_sheet(writer, user, research_hotbeds, activities, semester)
         
-        if all(sheet.sheet_state == 'hidden' for sheet in workbook.worksheets):
-            workbook.worksheets[0].sheet_state = 'visible'
-        
-        # Guardar cambios
-        buffer = BytesIO()
-        workbook.save(buffer)
-        buffer.seek(0)
-        
-        return buffer
+        # 2. Hoja de semilleros asociados
+        create_user_hotbeds_sheet(writer, research_hotbeds)
         
-    except Exception as e:
-        logger.error(f"Error en generate_user_excel_report: {str(e)}")
-        # Crear un Excel básico en caso de error
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            error_data = pd.DataFrame({
-                'Error': [f'No se pudieron generar los datos: {str(e)}'],
-                'Usuario': [user.name_user if user else 'Desconocido'],
-                'Semestre': [semester]
-            })
-            error_data.to_excel(writer, sheet_name='Error', index=False)
-        
-        buffer.seek(0)
-        return buffer
+        # 3. Hojas de actividades por tipo
+        create_user_activities_sheets(writer, activities)
+    
+    # Recargar el workbook para aplicar estilos
+    buffer.seek(0)
+    workbook = load_workbook(buffer)
+    
+    # Verificar que tengamos al menos una hoja
+    if len(workbook.sheetnames) == 0:
+        ws = workbook.create_sheet("Información Personal")
+        ws['A1'] = "No hay datos disponibles"
+    
+    # Aplicar estilos
+    apply_user_excel_styles(workbook)
+    
+    # Asegurar que al menos una hoja esté visible
+    for sheet in workbook.worksheets:
+        if sheet.sheet_state == 'hidden':
+            sheet.sheet_state = 'visible'
+    
+    if all(sheet.sheet_state == 'hidden' for sheet in workbook.worksheets):
+        workbook.worksheets[0].sheet_state = 'visible'
+    
+    # Guardar cambios
+    buffer = BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    
+    return buffer
+
+def error_user_excel_report(user, semester, error):
+    """Crea un Excel básico en caso de error (no se guarda en caché)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        error_data = pd.DataFrame({
+            'Error': [f'No se pudieron generar los datos: {str(error)}'],
+            'Usuario': [user.name_user if user else 'Desconocido'],
+            'Semestre': [semester]
+        })
+        error_data.to_excel(writer, sheet_name='Error', index=False)
+    
+    buffer.seek(0)
+    return buffer
 
 def generate_consolidated_users_excel(users, semester):
     """Genera un Excel consolidado con múltiples usuarios"""
@@ -176,7 +237,7 @@ def generate_consolidated_users_excel(users, semester):
         return buffer
         
     except Exception as e:
-        logger.error(f"Error en generate_consolidated_users_excel: {str(e)}")
+        logger.exception("Error en generate_consolidated_users_excel")
         # Crear un Excel básico en caso de error
         buffer = BytesIO()
         with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
@@ -293,12 +354,15 @@ def create_consolidated_users_sheet(writer, users, semester):
     ]
     
     # Datos consolidados de usuarios
+    # Totales de todos los usuarios desde la tabla de resumen por semestre y un
+    # conteo de semilleros, sin consultar las actividades de cada usuario
+    user_ids = [user.iduser for user in users]
+    activity_stats = get_users_activity_stats(user_ids, semester)
+    hotbed_counts = get_users_hotbed_counts(user_ids)
+
     users_data = []
     for i, user in enumerate(users, 1):
-        activities = get_user_activities_by_semester(user.iduser, semester)
-        research_hotbeds = get_user_research_hotbeds(user.iduser)
-        total_hours = sum(a['duration'] for a in activities)
-        approved_activities = len([a for a in activities if a['approved_free_hours']])
+        stats = activity_stats.get(user.iduser, EMPTY_ACTIVITY_STATS)
         
         users_data.append({
             'No.': i,
@@ -307,14 +371,14 @@ def create_consolidated_users_sheet(writer, users, semester):
             'Correo Electrónico': user.email_user,
             'Tipo de Usuario': user.type_user,
             'Estado': user.status_user,
-            'Semilleros Asociados': len(research_hotbeds),
-            'Total Actividades': len(activities),
-            'Horas Totales': total_hours,
-            'Actividades Aprobadas': approved_activities,
-            'Actividades Pendientes': len(activities) - approved_activities,
-            'Proyectos': len([a for a in activities if 'proyecto' in a['type'].lower()]),
-            'Productos': len([a for a in activities if 'producto' in a['type'].lower()]),
-            'Reconocimientos': len([a for a in activities if 'reconocimiento' in a['type'].lower()])
+            'Semilleros Asociados': hotbed_counts.get(user.iduser, 0),
+            'Total Actividades': stats['total_activities'],
+            'Horas Totales': stats['total_hours'],
+            'Actividades Aprobadas': stats['approved_activities'],
+            'Actividades Pendientes': stats['total_activities'] - stats['approved_activities'],
+            'Proyectos': stats['projects'],
+            'Productos': stats['products'],
+            'Reconocimientos': stats['recognitions']
         })
     
     # Crear DataFrame combinado
@@ -612,11 +676,11 @@ def apply_user_excel_styles(workbook):
                                                       header_fill, body_fill, alternate_fill,
                                                       center_alignment, left_alignment, header_border, body_border)
             except Exception as e:
-                logger.error(f"Error aplicando estilos a la hoja {sheet_name}: {str(e)}")
+                logger.error("Error aplicando estilos a la hoja %s: %s", sheet_name, e)
                 continue
                 
     except Exception as e:
-        logger.error(f"Error general aplicando estilos: {str(e)}")
+        logger.error("Error general aplicando estilos: %s", e)
 
 def apply_user_info_sheet_styles(sheet, header_font, subheader_font, body_font, 
                                 header_fill, body_fill, alternate_fill, 
@@ -771,233 +835,115 @@ def apply_consolidated_sheet_styles(sheet, header_font, subheader_font, body_fon
 # Funciones auxiliares que ya existían
 def get_user_research_hotbeds(user_id):
     """Obtiene los semilleros asociados al usuario"""
-    try:
-        hotbeds_query = db.session.query(ResearchHotbed, UsersResearchHotbed).join(
-            UsersResearchHotbed, ResearchHotbed.idresearchHotbed == UsersResearchHotbed.researchHotbed_idresearchHotbed
-        ).filter(
-            UsersResearchHotbed.user_iduser == user_id
-        ).all()
-        
-        return [{
-            'name': hotbed.name_researchHotbed,
-            'acronym': hotbed.acronym_researchHotbed,
-            'faculty': hotbed.faculty_researchHotbed,
-            'universityBranch': hotbed.universityBranch_researchHotbed,
-            'type': user_research.TypeUser_usersResearchHotbed,
-            'status': user_research.status_usersResearchHotbed,
-            'dateEnter': user_research.dateEnter_usersResearchHotbed
-        } for hotbed, user_research in hotbeds_query]
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo semilleros del usuario: {str(e)}")
-        return []
+    hotbeds_query = db.session.query(ResearchHotbed, UsersResearchHotbed).join(
+        UsersResearchHotbed, ResearchHotbed.idresearchHotbed == UsersResearchHotbed.researchHotbed_idresearchHotbed
+    ).filter(
+        UsersResearchHotbed.user_iduser == user_id
+    ).all()
+
+    return [serialize_user_hotbed(hotbed, user_research) for hotbed, user_research in hotbeds_query]
+
+def get_users_research_hotbeds(user_ids):
+    """Semilleros de varios usuarios en una sola consulta: {user_id: [semilleros]}"""
+    hotbeds_query = db.session.query(ResearchHotbed, UsersResearchHotbed).join(
+        UsersResearchHotbed, ResearchHotbed.idresearchHotbed == UsersResearchHotbed.researchHotbed_idresearchHotbed
+    ).filter(
+        UsersResearchHotbed.user_iduser.in_(user_ids)
+    ).all()
+
+    hotbeds_by_user = {}
+    for hotbed, user_research in hotbeds_query:
+        hotbeds_by_user.setdefault(user_research.user_iduser, []).append(serialize_user_hotbed(hotbed, user_research))
+    return hotbeds_by_user
+
+def serialize_user_hotbed(hotbed, user_research):
+    return {
+        'name': hotbed.name_researchHotbed,
+        'acronym': hotbed.acronym_researchHotbed,
+        'faculty': hotbed.faculty_researchHotbed,
+        'universityBranch': hotbed.universityBranch_researchHotbed,
+        'type': user_research.TypeUser_usersResearchHotbed,
+        'status': user_research.status_usersResearchHotbed,
+        'dateEnter': user_research.dateEnter_usersResearchHotbed
+    }
 
 def get_user_activities_by_semester(user_id, semester):
     """Obtiene actividades del usuario filtradas por semestre - INCLUYE ACTIVIDADES COMO CO-AUTOR"""
-    try:
-        # Obtener IDs de semilleros del usuario
-        user_research_ids = db.session.query(UsersResearchHotbed.idusersResearchHotbed).filter(
-            UsersResearchHotbed.user_iduser == user_id
-        ).subquery()
-        
-        # OPCIÓN 1: Actividades donde el usuario está directamente asociado al semillero
-        direct_activities = db.session.query(ActivitiesResearchHotbed).filter(
-            ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed.in_(user_research_ids),
-            ActivitiesResearchHotbed.semester == semester
-        )
-        
-        # OPCIÓN 2: Actividades donde el usuario es autor/co-autor (a través de ActivityAuthors)
-        authored_activities = db.session.query(ActivitiesResearchHotbed).join(
-            ActivityAuthors, ActivitiesResearchHotbed.idactivitiesResearchHotbed == ActivityAuthors.activity_id
-        ).filter(
-            ActivityAuthors.user_research_hotbed_id.in_(user_research_ids),
+    # Actividades donde el usuario es creador o autor/co-autor, combinadas con
+    # UNION (sin duplicados), en un solo SELECT con las columnas del perfil de
+    # exportación; los autores se cargan en bloque
+    activity_ids = user_activity_ids_query(user_id)
+    plan = get_plan('user_export')
+
+    rows = db.session.execute(
+        select_activities(plan).join(
+            activity_ids, ActivitiesResearchHotbed.idactivitiesResearchHotbed == activity_ids.c.activity_id
+        ).where(
             ActivitiesResearchHotbed.semester == semester
+        ).order_by(
+            ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+            ActivitiesResearchHotbed.idactivitiesResearchHotbed
         )
-        
-        # Combinar ambas consultas y eliminar duplicados
-        all_activities_query = direct_activities.union(authored_activities).all()
-        
-        # Procesar actividades
-        filtered_activities = []
-        processed_ids = set()  # Para evitar duplicados
-        
-        for activity in all_activities_query:
-            # Evitar duplicados
-            if activity.idactivitiesResearchHotbed in processed_ids:
-                continue
-            processed_ids.add(activity.idactivitiesResearchHotbed)
-            
-            # Obtener autores
-            authors_data = get_activity_authors(activity.idactivitiesResearchHotbed)
-            
-            # Obtener nombre del semillero
-            research_hotbed_name = get_research_hotbed_name(activity.usersResearchHotbed_idusersResearchHotbed)
-            
-            activity_data = {
-                'id': activity.idactivitiesResearchHotbed,
-                'title': activity.title_activitiesResearchHotbed,
-                'responsible': activity.responsible_activitiesResearchHotbed,
-                'date': activity.date_activitiesResearchHotbed,
-                'description': activity.description_activitiesResearchHotbed,
-                'type': activity.type_activitiesResearchHotbed,
-                'duration': activity.duration_activitiesResearchHotbed or 0,
-                'start_time': activity.startTime_activitiesResearchHotbed,
-                'end_time': activity.endTime_activitiesResearchHotbed,
-                'approved_free_hours': bool(activity.approvedFreeHours_activitiesResearchHotbed),
-                'reference_number': getattr(activity, 'reference_number', None),
-                'publication_date': getattr(activity, 'publication_date', None),
-                'organization_name': getattr(activity, 'organization_name', None),
-                'authors': authors_data,
-                'research_hotbed_name': research_hotbed_name
-            }
-            
-            # Obtener datos específicos según el tipo
-            if (activity.type_activitiesResearchHotbed and 
-                activity.type_activitiesResearchHotbed.lower() == 'proyecto' and 
-                activity.projectsResearchHotbed_idprojectsResearchHotbed):
-                
-                from models.projects_researchHotbed import ProjectsResearchHotbed
-                project = db.session.query(ProjectsResearchHotbed).filter_by(
-                    idprojectsResearchHotbed=activity.projectsResearchHotbed_idprojectsResearchHotbed
-                ).first()
-                if project:
-                    activity_data['project_data'] = {
-                        'name': project.name_projectsResearchHotbed or 'Sin especificar',
-                        'reference_number': project.referenceNumber_projectsResearchHotbed,
-                        'start_date': project.startDate_projectsResearchHotbed,
-                        'end_date': project.endDate_projectsResearchHotbed
-                    }
-            
-            elif (activity.type_activitiesResearchHotbed and 
-                  activity.type_activitiesResearchHotbed.lower() == 'producto' and 
-                  activity.productsResearchHotbed_idproductsResearchHotbed):
-                
-                from models.products_researchHotbed import ProductsResearchHotbed
-                product = db.session.query(ProductsResearchHotbed).filter_by(
-                    idproductsResearchHotbed=activity.productsResearchHotbed_idproductsResearchHotbed
-                ).first()
-                if product:
-                    activity_data['product_data'] = {
-                        'category': product.category_productsResearchHotbed,
-                        'type': product.type_productsResearchHotbed,
-                        'description': product.description_productsResearchHotbed
-                    }
-            
-            elif (activity.type_activitiesResearchHotbed and 
-                  activity.type_activitiesResearchHotbed.lower() == 'reconocimiento' and 
-                  activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed):
-                
-                from models.recognitions_researchHotbed import RecognitionsResearchHotbed
-                recognition = db.session.query(RecognitionsResearchHotbed).filter_by(
-                    idrecognitionsResearchHotbed=activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed
-                ).first()
-                if recognition:
-                    activity_data['recognition_data'] = {
-                        'project_name': recognition.projectName_recognitionsResearchHotbed,
-                        'organization_name': recognition.organizationName_recognitionsResearchHotbed
-                    }
-            
-            filtered_activities.append(activity_data)
-                
-        return filtered_activities
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo actividades del usuario: {str(e)}")
-        return []
+    ).all()
 
-def get_activity_authors(activity_id):
-    """Obtiene los autores de una actividad"""
-    try:
-        authors_query = db.session.query(User, ActivityAuthors).join(
-            UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    return serialize_rows(plan, rows)
+
+def get_users_activities_by_semester(user_ids, semester):
+    """
+    Actividades del semestre de varios usuarios (como creador o autor/co-autor)
+    en un solo SELECT: {user_id: [actividades]}. Los autores se cargan una vez
+    para todas las actividades.
+    """
+    activity_ids = users_activity_ids_query(user_ids)
+    plan = get_plan('user_export')
+
+    rows = db.session.execute(
+        select_activities(plan).add_columns(
+            activity_ids.c.user_id.label('bundle_user_id')
         ).join(
-            User, UsersResearchHotbed.user_iduser == User.iduser
-        ).filter(
-            ActivityAuthors.activity_id == activity_id
-        ).all()
-        
-        main_authors = []
-        co_authors = []
-        
-        for user, author_relation in authors_query:
-            if author_relation.is_main_author:
-                main_authors.append(user.name_user)
-            else:
-                co_authors.append(user.name_user)
-                
-        return {
-            'main_authors': main_authors,
-            'co_authors': co_authors
-        }
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo autores: {str(e)}")
-        return {'main_authors': [], 'co_authors': []}
+            activity_ids, ActivitiesResearchHotbed.idactivitiesResearchHotbed == activity_ids.c.activity_id
+        ).where(
+            ActivitiesResearchHotbed.semester == semester
+        ).order_by(
+            activity_ids.c.user_id,
+            ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+            ActivitiesResearchHotbed.idactivitiesResearchHotbed
+        )
+    ).all()
 
-def get_research_hotbed_name(user_research_hotbed_id):
-    """Obtiene el nombre del semillero por ID de user_research_hotbed"""
-    try:
-        result = db.session.query(ResearchHotbed.name_researchHotbed).join(
-            UsersResearchHotbed, ResearchHotbed.idresearchHotbed == UsersResearchHotbed.researchHotbed_idresearchHotbed
-        ).filter(
-            UsersResearchHotbed.idusersResearchHotbed == user_research_hotbed_id
-        ).first()
-        
-        return result[0] if result else 'Semillero no especificado'
-        
-    except Exception as e:
-        logger.error(f"Error obteniendo nombre del semillero: {str(e)}")
-        return 'Semillero no especificado'
+    activities_by_user = {}
+    for row, activity in zip(rows, serialize_rows(plan, rows)):
+        activities_by_user.setdefault(row.bundle_user_id, []).append(activity)
+    return activities_by_user
 
 def get_user_role_in_activity_simple(activity):
     """Determina el rol del usuario en una actividad de forma simplificada"""
     # Esta función ya no se usa, pero se mantiene por compatibilidad
     return "Participante"
 
+# Campos del listado por semillero (sin los bloques por tipo)
+HOTBED_SEMESTER_FIELDS = frozenset(profile_fields('user_export')) - {'project_data', 'product_data', 'recognition_data'}
+
 def get_activities_by_semester(research_hotbed_id, semester):
     """Obtiene actividades filtradas por semestre usando el campo 'semester' de la actividad"""
     try:
-        activities_query = db.session.query(ActivitiesResearchHotbed).join(
-            UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
-        ).filter(
-            UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id,
-            ActivitiesResearchHotbed.semester == semester
+        plan = get_plan('user_export', HOTBED_SEMESTER_FIELDS)
+        rows = db.session.execute(
+            select_activities(plan).join(
+                UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+            ).where(
+                UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id,
+                ActivitiesResearchHotbed.semester == semester
+            ).order_by(
+                ActivitiesResearchHotbed.date_activitiesResearchHotbed,
+                ActivitiesResearchHotbed.idactivitiesResearchHotbed
+            )
         ).all()
-        
-        # Procesar actividades similar a get_user_activities_by_semester
-        filtered_activities = []
-        
-        for activity in activities_query:
-            # Obtener autores
-            authors_data = get_activity_authors(activity.idactivitiesResearchHotbed)
-            
-            # Obtener nombre del semillero
-            research_hotbed_name = get_research_hotbed_name(activity.usersResearchHotbed_idusersResearchHotbed)
-            
-            activity_data = {
-                'id': activity.idactivitiesResearchHotbed,
-                'title': activity.title_activitiesResearchHotbed,
-                'responsible': activity.responsible_activitiesResearchHotbed,
-                'date': activity.date_activitiesResearchHotbed,
-                'description': activity.description_activitiesResearchHotbed,
-                'type': activity.type_activitiesResearchHotbed,
-                'duration': activity.duration_activitiesResearchHotbed or 0,
-                'start_time': activity.startTime_activitiesResearchHotbed,
-                'end_time': activity.endTime_activitiesResearchHotbed,
-                'approved_free_hours': bool(activity.approvedFreeHours_activitiesResearchHotbed),
-                'reference_number': getattr(activity, 'reference_number', None),
-                'publication_date': getattr(activity, 'publication_date', None),
-                'organization_name': getattr(activity, 'organization_name', None),
-                'authors': authors_data,
-                'research_hotbed_name': research_hotbed_name
-            }
-            
-            filtered_activities.append(activity_data)
-                
-        return filtered_activities
+
+        return serialize_rows(plan, rows)
         
     except Exception as e:
-        logger.error(f"Error obteniendo actividades: {str(e)}")
+        logger.error("Error obteniendo actividades: %s", e)
         return []
 
 # Funciones exportadas para mantener compatibilidad
@@ -1,6 +1,8 @@
 from flask import jsonify
 from models.research_hotbed import ResearchHotbed
 from db.connection import db
+from utils.export_cache import invalidate_hotbed_profile_exports
+from utils.listing_versions import bump_hotbed_listings
 
 def update_research_hotbed(research_hotbed_id, data):
     """
@@ -30,7 +32,12 @@ def update_research_hotbed(research_hotbed_id, data):
 
     # Guardar los cambios en la base de datos
     try:
+        # El nombre del semillero aparece en los listados de actividades (ETag)
+        if "name_researchHotbed" in data:
+            bump_hotbed_listings(research_hotbed_id)
         db.session.commit()
+        # Los datos del semillero aparecen en su reporte y en los de sus miembros
+        invalidate_hotbed_profile_exports(research_hotbed_id)
         return {"message": "Semillero actualizado con éxito"}, 200
     except Exception as e:
         db.session.rollback()
@@ -2,6 +2,7 @@ from models.users import User
 from models.research_hotbed import ResearchHotbed
 from models.users_research_hotbed import UsersResearchHotbed
 from db.connection import db
+from utils.export_cache import invalidate_hotbed_exports, invalidate_user_exports
 from datetime import datetime, UTC
 
 def add_user_to_research_hotbed(user_id, research_hotbed_id, data):
@@ -40,6 +41,9 @@ def add_user_to_research_hotbed(user_id, research_hotbed_id, data):
     try:
         db.session.add(new_entry)
         db.session.commit()
+        # La membresía aparece en el reporte del semillero y en el del usuario
+        invalidate_hotbed_exports([research_hotbed_id])
+        invalidate_user_exports([user_id])
         return {"message": "Usuario agregado al semillero con éxito"}, 201
     except Exception as e:
         db.session.rollback()
@@ -1,9 +1,12 @@
+import logging
 from flask import jsonify
 from models.users import User
 from models.users_research_hotbed import UsersResearchHotbed
 from models.research_hotbed import ResearchHotbed
 from db.connection import db
 
+logger = logging.getLogger(__name__)
+
 def get_users_by_research_hotbed(research_hotbed_id):
     """
     Obtiene TODOS los usuarios asociados a un semillero específico (activos e inactivos).
@@ -54,5 +57,5 @@ def get_users_by_research_hotbed(research_hotbed_id):
         return {"users": users_list}, 200
 
     except Exception as e:
-        print(f"Error en get_users_by_research_hotbed: {str(e)}")
+        logger.exception("Error en get_users_by_research_hotbed")
         return {"message": f"Error interno del servidor: {str(e)}"}, 500
@@ -1,5 +1,10 @@
+import logging
 from models.users_research_hotbed import UsersResearchHotbed
 from db.connection import db
+from utils.activity_cache import invalidate_member_activities
+from utils.export_cache import invalidate_hotbed_exports, invalidate_user_exports
+
+logger = logging.getLogger(__name__)
 
 def update_user_in_research_hotbed(user_research_hotbed_id, data):
     """
@@ -27,7 +32,18 @@ def update_user_in_research_hotbed(user_research_hotbed_id, data):
     # Guardar los cambios en la base de datos
     try:
         db.session.commit()
-        return {"message": "Usuario en semillero actualizado con éxito"}, 200
     except Exception as e:
         db.session.rollback()
         return {"message": f"Error al actualizar el usuario en semillero: {str(e)}"}, 500
+
+    # El cambio ya está guardado: un fallo al invalidar las cachés solo se registra
+    try:
+        # El tipo de miembro se muestra en el detalle de sus actividades
+        invalidate_member_activities([user_research_hotbed_id])
+        # La membresía aparece en el reporte del semillero y en el del usuario
+        invalidate_hotbed_exports([user_research_hotbed.researchHotbed_idresearchHotbed])
+        invalidate_user_exports([user_research_hotbed.user_iduser])
+    except Exception:
+        logger.exception("Error invalidando las cachés de la membresía %s", user_research_hotbed_id)
+
+    return {"message": "Usuario en semillero actualizado con éxito"}, 200
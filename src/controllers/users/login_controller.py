@@ -4,8 +4,11 @@ from datetime import datetime, timedelta
 import pytz 
 import hashlib
 import jwt
+import logging
 import os
-from db.connection import db 
+from utils.last_login import record_login
+
+logger = logging.getLogger(__name__)
 
 def verify_password(stored_password, provided_password):
     # Verifica si la contraseña proporcionada coincide con el hash almacenado
@@ -38,12 +41,13 @@ def login_user(data):
     # Obtener la hora actual en la zona horaria GMT-5
     now_gmt_minus_5 = datetime.now(gmt_minus_5)
 
-    # Actualizar la última fecha de inicio de sesión
+    # Registrar la última fecha de inicio de sesión (se escribe en bloque en segundo plano).
+    # Si la escritura en bloque falla, las fechas quedan pendientes para el
+    # próximo intento y el inicio de sesión continúa.
     try:
-        user.lastDayLogin_user = now_gmt_minus_5
-        db.session.commit()  # Guardar los cambios en la base de datos
+        record_login(user.iduser, now_gmt_minus_5)
     except Exception as e:
-        return {"message": "Error al actualizar la última fecha de inicio de sesión", "error": str(e)}, 500
+        logger.error("Error al actualizar la última fecha de inicio de sesión: %s", e)
 
     # Generar un token JWT
     secret_key = os.getenv('SECRET_KEY')  # Asegúrate de definir esta variable de entorno
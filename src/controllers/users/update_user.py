@@ -1,7 +1,13 @@
 import hashlib
+import logging
 import os
 from models.users import User
 from db.connection import db
+from utils.activity_cache import invalidate_user_activities
+from utils.export_cache import invalidate_user_profile_exports
+from utils.listing_versions import bump_user_listings
+
+logger = logging.getLogger(__name__)
 
 def hash_password(password):
     """
@@ -43,8 +49,20 @@ def update_user(user_id, data):
 
     # Guardar los cambios en la base de datos
     try:
+        # El nombre del usuario aparece en los listados de actividades (ETag)
+        if "name_user" in data:
+            bump_user_listings(user_id)
         db.session.commit()
-        return {"message": "Usuario actualizado con éxito"}, 200
     except Exception as e:
         db.session.rollback()
         return {"message": f"Error al actualizar el usuario: {str(e)}"}, 500
+
+    # El nombre y correo del usuario se muestran en el detalle de sus actividades.
+    # El cambio ya está guardado: un fallo aquí solo se registra.
+    try:
+        invalidate_user_activities(user_id)
+        invalidate_user_profile_exports(user_id)
+    except Exception:
+        logger.exception("Error invalidando las cachés del usuario %s", user_id)
+
+    return {"message": "Usuario actualizado con éxito"}, 200
@@ -0,0 +1,18 @@
+-- Índices de los listados de actividades (ver __table_args__ de
+-- models/activities_researchHotbed.py). Ejecutar una vez sobre la base
+-- existente (MySQL) antes de desplegar esta versión:
+--   mysql -u $DB_USER -p $DB_NAME < src/db/migrations/activity_listing_indexes.sql
+
+-- Clave de paginación por cursor de los listados (fecha desc, id desc)
+CREATE INDEX ix_activities_date_id
+    ON activitiesResearchHotbed (date_activitiesResearchHotbed, idactivitiesResearchHotbed);
+
+CREATE INDEX ix_activities_creator_date_id
+    ON activitiesResearchHotbed (usersResearchHotbed_idusersResearchHotbed, date_activitiesResearchHotbed, idactivitiesResearchHotbed);
+
+-- Filtros de los listados (semestre y tipo)
+CREATE INDEX ix_activities_creator_semester
+    ON activitiesResearchHotbed (usersResearchHotbed_idusersResearchHotbed, semester);
+
+CREATE INDEX ix_activities_semester_type
+    ON activitiesResearchHotbed (semester, type_activitiesResearchHotbed);
@@ -0,0 +1,21 @@
+-- Versiones de los listados de actividades para GET condicional (ETag).
+-- Ver utils/listing_versions.py. Ejecutar una vez sobre la base existente
+-- (MySQL) antes de desplegar esta versión:
+--   mysql -u $DB_USER -p $DB_NAME < src/db/migrations/activity_listing_versions.sql
+
+-- Última modificación de cada actividad y de sus autores. Las filas
+-- existentes quedan con la fecha de la migración.
+ALTER TABLE activitiesResearchHotbed
+    ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+
+ALTER TABLE activity_authors
+    ADD COLUMN updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+
+-- Versión por listado: scope 'hotbed' (semillero) o 'user' (usuario)
+CREATE TABLE IF NOT EXISTS listing_versions (
+    scope VARCHAR(20) NOT NULL,
+    scope_id INT NOT NULL,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, scope_id)
+);
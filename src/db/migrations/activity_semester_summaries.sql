@@ -0,0 +1,25 @@
+-- Resumen de actividades por semestre (ver utils/semester_summary.py).
+-- Ejecutar una vez sobre la base existente (MySQL) y luego hacer la carga
+-- inicial con:
+--   mysql -u $DB_USER -p $DB_NAME < src/db/migrations/activity_semester_summaries.sql
+--   flask --app app rebuild-semester-summaries
+
+-- Las versiones anteriores de la tabla (columnas de semillero y usuario) se
+-- reemplazan; el comando de arriba la vuelve a llenar
+DROP TABLE IF EXISTS activity_semester_summaries;
+
+-- Cada fila resume un semillero (scope 'hotbed') o un usuario (scope 'user')
+CREATE TABLE activity_semester_summaries (
+    id INT NOT NULL AUTO_INCREMENT,
+    scope VARCHAR(20) NOT NULL,
+    scope_id INT NOT NULL,
+    semester VARCHAR(20) NOT NULL,
+    total_activities INT NOT NULL DEFAULT 0,
+    total_hours FLOAT NOT NULL DEFAULT 0,
+    approved_activities INT NOT NULL DEFAULT 0,
+    projects INT NOT NULL DEFAULT 0,
+    products INT NOT NULL DEFAULT 0,
+    recognitions INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id),
+    UNIQUE KEY uq_activity_semester_summary (scope, semester, scope_id)
+);
@@ -1,6 +1,30 @@
 from functools import wraps
 from flask import request, jsonify, current_app
+import hashlib
+import time
 import jwt
+from utils.cache import get_cache, AUTH_TOKEN_CACHE
+
+def decode_token(token, secret_key):
+    """
+    Devuelve los datos del token. Los tokens ya verificados se guardan en una
+    caché LRU (por hash del token y la clave) hasta su 'exp', así las peticiones
+    repetidas del frontend no repiten la verificación HMAC ni el parseo.
+    Lanza las excepciones de jwt si el token es inválido o expiró.
+    """
+    cache = get_cache(AUTH_TOKEN_CACHE)
+    key = hashlib.sha256(f"{secret_key}:{token}".encode('utf-8')).hexdigest()
+
+    claims = cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, secret_key, algorithms=['HS256'])
+        remaining = claims['exp'] - time.time() if 'exp' in claims else None
+        cache.set(key, claims, ttl=remaining)
+    elif 'exp' in claims and claims['exp'] <= time.time():
+        raise jwt.ExpiredSignatureError('Signature has expired')
+
+    # Copia: las rutas pueden modificar request.user
+    return dict(claims)
 
 def token_required(f):
     @wraps(f)
@@ -20,7 +44,7 @@ def token_required(f):
         
         try:
             # Decodificar el token
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+            data = decode_token(token, current_app.config['SECRET_KEY'])
             
             # Guardar la información del usuario en request.user
             request.user = data
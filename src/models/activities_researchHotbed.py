@@ -1,7 +1,22 @@
 from db.connection import db
+# Tablas referenciadas por las claves foráneas y relaciones de la actividad
+from models.projects_researchHotbed import ProjectsResearchHotbed  # noqa: F401
+from models.products_researchHotbed import ProductsResearchHotbed  # noqa: F401
+from models.recognitions_researchHotbed import RecognitionsResearchHotbed  # noqa: F401
 
 class ActivitiesResearchHotbed(db.Model):
     __tablename__ = 'activitiesResearchHotbed'
+    __table_args__ = (
+        # Clave de paginación por cursor de los listados (fecha desc, id desc)
+        db.Index('ix_activities_date_id', 'date_activitiesResearchHotbed', 'idactivitiesResearchHotbed'),
+        db.Index(
+            'ix_activities_creator_date_id',
+            'usersResearchHotbed_idusersResearchHotbed', 'date_activitiesResearchHotbed', 'idactivitiesResearchHotbed'
+        ),
+        # Filtros de los listados (semestre y tipo)
+        db.Index('ix_activities_creator_semester', 'usersResearchHotbed_idusersResearchHotbed', 'semester'),
+        db.Index('ix_activities_semester_type', 'semester', 'type_activitiesResearchHotbed'),
+    )
 
     idactivitiesResearchHotbed = db.Column(db.Integer, primary_key=True)
     title_activitiesResearchHotbed = db.Column(db.String(125), nullable=False)
@@ -18,6 +33,12 @@ class ActivitiesResearchHotbed(db.Model):
     duration_activitiesResearchHotbed = db.Column(db.Float, nullable=True)
     approvedFreeHours_activitiesResearchHotbed = db.Column(db.Float, nullable=True)
     semester = db.Column(db.String(20), nullable=False, default='semestre-1-2025')
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp()
+    )
 
     usersResearchHotbed_idusersResearchHotbed = db.Column(
         db.Integer, 
@@ -43,5 +64,17 @@ class ActivitiesResearchHotbed(db.Model):
         nullable=True
     )
 
+    # Relaciones para cargar la información asociada sin consultas manuales
+    creator = db.relationship("UsersResearchHotbed", foreign_keys=[usersResearchHotbed_idusersResearchHotbed])
+    project = db.relationship("ProjectsResearchHotbed")
+    product = db.relationship("ProductsResearchHotbed")
+    recognition = db.relationship("RecognitionsResearchHotbed")
+    authors = db.relationship(
+        "ActivityAuthors",
+        back_populates="activity",
+        order_by="ActivityAuthors.id",
+        cascade="all, delete-orphan"
+    )
+
     def __repr__(self):
         return f'<ActivitiesResearchHotbed {self.idactivitiesResearchHotbed}>'
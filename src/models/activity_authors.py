@@ -8,6 +8,11 @@ class ActivityAuthors(db.Model):
     user_research_hotbed_id = db.Column(db.Integer, db.ForeignKey('usersResearchHotbed.idusersResearchHotbed'), nullable=False)
     is_main_author = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    # Relaciones: actividad -> autores -> usuario en semillero -> usuario
+    activity = db.relationship("ActivitiesResearchHotbed", back_populates="authors")
+    user_research_hotbed = db.relationship("UsersResearchHotbed")
 
     def __repr__(self):
         return f'<ActivityAuthor {self.id}: Activity {self.activity_id}, User {self.user_research_hotbed_id}>'
\ No newline at end of file
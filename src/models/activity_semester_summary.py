@@ -0,0 +1,27 @@
+from db.connection import db
+
+class ActivitySemesterSummary(db.Model):
+    __tablename__ = 'activity_semester_summaries'
+
+    # Cada fila resume un semillero (scope 'hotbed': actividades creadas por sus
+    # miembros) o un usuario (scope 'user': actividades que creó o de las que es
+    # autor en todos sus semilleros); cada actividad se cuenta una sola vez
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False)
+    semester = db.Column(db.String(20), nullable=False)
+
+    total_activities = db.Column(db.Integer, nullable=False, default=0)
+    total_hours = db.Column(db.Float, nullable=False, default=0)
+    approved_activities = db.Column(db.Integer, nullable=False, default=0)
+    projects = db.Column(db.Integer, nullable=False, default=0)
+    products = db.Column(db.Integer, nullable=False, default=0)
+    recognitions = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Clave de los upserts con los cambios de cada escritura
+        db.UniqueConstraint('scope', 'semester', 'scope_id', name='uq_activity_semester_summary'),
+    )
+
+    def __repr__(self):
+        return f'<ActivitySemesterSummary {self.scope}:{self.scope_id} {self.semester}>'
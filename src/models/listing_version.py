@@ -0,0 +1,14 @@
+from db.connection import db
+
+class ListingVersion(db.Model):
+    __tablename__ = 'listing_versions'
+
+    # Alcance del listado ('hotbed' o 'user') y el ID del semillero o usuario
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_id = db.Column(db.Integer, primary_key=True)
+    # Se incrementa en cada registro, edición o eliminación que afecta el listado
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<ListingVersion {self.scope}:{self.scope_id} v{self.version}>'
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from controllers.activitiesResearchHotbed.register_activities_controller import register_activity
-from controllers.activitiesResearchHotbed.get_activities_controller import get_activity_details
+from controllers.activitiesResearchHotbed.get_activities_controller import get_activity_details, get_activity_cache_stats
 from controllers.activitiesResearchHotbed.get_activities_by_research_hotbed_controller import get_activities_by_research_hotbed
 from controllers.activitiesResearchHotbed.update_activities_controller import update_activity
 from controllers.activitiesResearchHotbed.delete_activities_controller import delete_activity
@@ -17,18 +17,37 @@ def register_activity_route():
 @activities_routes.route('/get/activities/<int:activity_id>', methods=['GET'])
 @token_required
 def get_activity_details_route(activity_id):
-    return get_activity_details(activity_id)
+    return get_activity_details(activity_id, fields=request.args.get('fields'))
+
+@activities_routes.route('/get/activities/cache/stats', methods=['GET'])
+@token_required
+def get_activity_cache_stats_route():
+    return get_activity_cache_stats()
 
 @activities_routes.route('/get/research-hotbeds/<int:research_hotbed_id>/activities', methods=['GET'])
 @token_required
 def get_activities_by_research_hotbed_route(research_hotbed_id):
-    return get_activities_by_research_hotbed(research_hotbed_id)
+    return get_activities_by_research_hotbed(
+        research_hotbed_id,
+        limit=request.args.get('limit'),
+        cursor=request.args.get('cursor'),
+        fields=request.args.get('fields'),
+        filters=request.args,
+        if_none_match=request.headers.get('If-None-Match')
+    )
 
 # Ruta adicional para compatibilidad con el frontend existente
 @activities_routes.route('/getActivitiesByResearchHotbed/<int:research_hotbed_id>', methods=['GET'])
 @token_required
 def get_activities_by_research_hotbed_simple_route(research_hotbed_id):
-    return get_activities_by_research_hotbed(research_hotbed_id)
+    return get_activities_by_research_hotbed(
+        research_hotbed_id,
+        limit=request.args.get('limit'),
+        cursor=request.args.get('cursor'),
+        fields=request.args.get('fields'),
+        filters=request.args,
+        if_none_match=request.headers.get('If-None-Match')
+    )
 
 @activities_routes.route('/updateActivity/<int:activity_id>', methods=['PUT'])
 @token_required
@@ -1,27 +1,107 @@
 from flask import Blueprint, request, jsonify
 from middlewares.auth import token_required
-from controllers.export.excel_export_controller import export_research_hotbed_excel
-from controllers.export.users_pdf_export_controller import export_user_excel, export_multiple_users_excel
+from controllers.export.rows_export_controller import export_research_hotbed_rows, export_user_rows, export_users_rows
+from controllers.export.preview_export_controller import preview_user_export
+from utils.row_stream import STREAM_FORMATS
+from controllers.export.export_jobs_controller import create_export_job, get_export_job, download_export_job_file
 
 export_routes = Blueprint('export_routes', __name__)
 
+# Los controladores de Excel (pandas, openpyxl, reportlab) se importan dentro de
+# cada ruta: la primera exportación del worker paga la importación y el resto
+# de la API arranca sin cargarlos. Un worker dedicado a exportaciones puede
+# cargarlos al iniciar con EXPORT_PRELOAD=1 (ver preload_export_controllers).
+
+def preload_export_controllers():
+    """Importa de antemano los controladores de exportación a Excel"""
+    import controllers.export.excel_export_controller  # noqa: F401
+    import controllers.export.users_pdf_export_controller  # noqa: F401
+    import controllers.export.users_bundle_export_controller  # noqa: F401
+
+# Formatos de las rutas de exportación: 'excel' (por defecto) o filas en streaming
+EXPORT_FORMATS = ('excel',) + tuple(STREAM_FORMATS)
+
+def invalid_format_response():
+    return jsonify({"error": f"Formato inválido. Opciones: {', '.join(EXPORT_FORMATS)}"}), 400
+
 @export_routes.route('/export/research-hotbed/<int:research_hotbed_id>/excel', methods=['GET'])
 @token_required
 def export_research_hotbed_excel_route(research_hotbed_id):
     """
     Exporta un archivo Excel completo del semillero para el semestre especificado
+    Query parameters:
+    - semester: formato 'semestre-1-2025'
+    - format: 'excel' (por defecto), 'csv' o 'ndjson'
     """
     try:
         semester = request.args.get('semester')
+        fmt = request.args.get('format', 'excel')
         
         if not semester:
             return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+        if fmt not in EXPORT_FORMATS:
+            return invalid_format_response()
+            
+        if fmt in STREAM_FORMATS:
+            return export_research_hotbed_rows(research_hotbed_id, semester, fmt)
             
+        from controllers.export.excel_export_controller import export_research_hotbed_excel
         return export_research_hotbed_excel(research_hotbed_id, semester)
         
     except Exception as e:
         return jsonify({"error": f"Error interno: {str(e)}"}), 500
 
+@export_routes.route('/export/research-hotbed/<int:research_hotbed_id>/pdf', methods=['GET'])
+@token_required
+def export_research_hotbed_pdf_route(research_hotbed_id):
+    """
+    Exporta el reporte PDF del semillero para el semestre especificado
+    Query parameters:
+    - semester: formato 'semestre-1-2025'
+    """
+    try:
+        semester = request.args.get('semester')
+        
+        if not semester:
+            return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+            
+        from controllers.export.excel_export_controller import export_research_hotbed_pdf
+        return export_research_hotbed_pdf(research_hotbed_id, semester)
+        
+    except Exception as e:
+        return jsonify({"error": f"Error interno: {str(e)}"}), 500
+
+@export_routes.route('/export/research-hotbeds/excel', methods=['GET'])
+@token_required
+def export_scope_excel_route():
+    """
+    Exporta en un solo Excel los semilleros de una facultad, de una sede o de toda la institución
+    Query parameters:
+    - semester: formato 'semestre-1-2025'
+    - faculty: facultad (opcional)
+    - branch: sede universitaria (opcional)
+    Sin faculty ni branch se incluyen todos los semilleros.
+    """
+    try:
+        semester = request.args.get('semester')
+        faculty = request.args.get('faculty')
+        branch = request.args.get('branch')
+        
+        if not semester:
+            return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+        if faculty and branch:
+            return jsonify({"error": "Indique solo 'faculty' o 'branch'"}), 400
+            
+        from controllers.export.scope_export_controller import export_scope_excel
+        if faculty:
+            return export_scope_excel('faculty', faculty, semester)
+        if branch:
+            return export_scope_excel('branch', branch, semester)
+        return export_scope_excel('all', None, semester)
+        
+    except Exception as e:
+        return jsonify({"error": f"Error interno: {str(e)}"}), 500
+
 @export_routes.route('/export/user/<int:user_id>/excel', methods=['GET'])
 @token_required
 def export_user_excel_route(user_id):
@@ -29,13 +109,21 @@ def export_user_excel_route(user_id):
     Exporta un archivo Excel individual del usuario para el semestre especificado
     Query parameters:
     - semester: formato 'semestre-1-2025'
+    - format: 'excel' (por defecto), 'csv' o 'ndjson'
     """
     try:
         semester = request.args.get('semester')
+        fmt = request.args.get('format', 'excel')
         
         if not semester:
             return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+        if fmt not in EXPORT_FORMATS:
+            return invalid_format_response()
             
+        if fmt in STREAM_FORMATS:
+            return export_user_rows(user_id, semester, fmt)
+            
+        from controllers.export.users_pdf_export_controller import export_user_excel
         return export_user_excel(user_id, semester)
         
     except Exception as e:
@@ -49,8 +137,12 @@ def export_multiple_users_excel_route():
     Body JSON:
     {
         "user_ids": [1, 2, 3],
-        "semester": "semestre-1-2025"
+        "semester": "semestre-1-2025",
+        "mode": "consolidated" | "bundle"  (opcional),
+        "format": "excel" | "csv" | "ndjson"  (opcional, también como query parameter)
     }
+    Con "mode": "bundle" se descarga un ZIP con el Excel individual de cada usuario.
+    Con "format" csv o ndjson se transmiten las actividades de los usuarios por filas.
     """
     try:
         data = request.get_json()
@@ -64,9 +156,21 @@ def export_multiple_users_excel_route():
         if not user_ids:
             return jsonify({"error": "Lista de usuarios requerida"}), 400
             
+        fmt = data.get('format') or request.args.get('format', 'excel')
+        
         if not semester:
             return jsonify({"error": "Parámetro 'semester' requerido"}), 400
+        if fmt not in EXPORT_FORMATS:
+            return invalid_format_response()
             
+        if fmt in STREAM_FORMATS:
+            return export_users_rows(user_ids, semester, fmt)
+            
+        if data.get('mode') == 'bundle':
+            from controllers.export.users_bundle_export_controller import export_users_excel_bundle
+            return export_users_excel_bundle(user_ids, semester)
+            
+        from controllers.export.users_pdf_export_controller import export_multiple_users_excel
         return export_multiple_users_excel(user_ids, semester)
         
     except Exception as e:
@@ -84,38 +188,39 @@ def preview_user_export_data_route(user_id):
         if not semester:
             return jsonify({"error": "Parámetro 'semester' requerido"}), 400
             
-        from controllers.export.users_pdf_export_controller import get_user_research_hotbeds, get_user_activities_by_semester
-        from models.users import User
-        from utils.semester_utils import format_semester_label_detailed
-        
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({"error": "Usuario no encontrado"}), 404
-            
-        research_hotbeds = get_user_research_hotbeds(user_id)
-        activities = get_user_activities_by_semester(user_id, semester)
-        
-        return jsonify({
-            "user": {
-                "name": user.name_user,
-                "email": user.email_user,
-                "idSigaa": user.idSigaa_user,
-                "type": user.type_user
-            },
-            "semester_label": format_semester_label_detailed(semester),
-            "stats": {
-                "total_research_hotbeds": len(research_hotbeds),
-                "total_activities": len(activities),
-                "total_hours": sum(a['duration'] for a in activities),
-                "approved_activities": len([a for a in activities if a['approved_free_hours']])
-            },
-            "research_hotbeds_count": len(research_hotbeds),
-            "activities_count": len(activities)
-        }), 200
+        return preview_user_export(user_id, semester)
         
     except Exception as e:
         return jsonify({"error": f"Error interno: {str(e)}"}), 500
 
+# Exportaciones asíncronas: se encolan y luego se consulta el estado y se descarga
+@export_routes.route('/export/jobs', methods=['POST'])
+@token_required
+def create_export_job_route():
+    """
+    Encola una exportación de semillero, usuario o varios usuarios
+    Body JSON:
+    {
+        "type": "research_hotbed" | "user" | "users" | "research_hotbeds",
+        "semester": "semestre-1-2025",
+        "research_hotbed_id": 1 | "user_id": 1 | "user_ids": [1, 2, 3]
+            | "scope": "faculty" | "branch" | "all", "value": "Ingeniería"
+    }
+    """
+    return create_export_job(request.get_json(silent=True), request.user['iduser'])
+
+@export_routes.route('/export/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_export_job_route(job_id):
+    """Estado y progreso de una exportación encolada"""
+    return get_export_job(job_id, request.user['iduser'])
+
+@export_routes.route('/export/jobs/<job_id>/file', methods=['GET'])
+@token_required
+def download_export_job_file_route(job_id):
+    """Descarga el archivo de una exportación terminada"""
+    return download_export_job_file(job_id, request.user['iduser'])
+
 # Rutas de compatibilidad (alias)
 @export_routes.route('/export/user/<int:user_id>/pdf', methods=['GET'])
 @token_required
@@ -1,3 +1,4 @@
+import logging
 from flask import Blueprint, request, jsonify
 from middlewares.auth import token_required  # Asegúrate de que sea así
 from controllers.users.register_controller import create_user
@@ -9,6 +10,8 @@ from controllers.users.get_user_activities_controller import get_user_activities
 
 user_routes = Blueprint('user_routes', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Ruta para registrar usuarios
 @user_routes.route('/register', methods=['POST'])
 def register_user():
@@ -90,7 +93,7 @@ def get_authenticated_user():
             return jsonify(result), status_code
             
     except Exception as e:
-        print(f"Error en get_authenticated_user: {str(e)}")
+        logger.exception("Error en get_authenticated_user")
         return jsonify({"message": f"Error interno del servidor: {str(e)}"}), 500
 
 # ruta para actualizar usuarios a los que pertenece el token
@@ -119,13 +122,21 @@ def get_user_activities_route():
         # Obtener el ID del usuario desde el token decodificado
         user_id = request.user['iduser']
         
-        # Llamar al controlador
-        return get_user_activities(user_id)
+        # Llamar al controlador (paginación opcional con ?limit= y ?cursor=, campos con ?fields=,
+        # filtros con ?semester=, ?type=, ?date_from=, ?date_to= y ?approved=)
+        return get_user_activities(
+            user_id,
+            limit=request.args.get('limit'),
+            cursor=request.args.get('cursor'),
+            fields=request.args.get('fields'),
+            filters=request.args,
+            if_none_match=request.headers.get('If-None-Match')
+        )
         
     except KeyError:
         return jsonify({"error": "No se pudo obtener la información del usuario del token"}), 401
     except Exception as e:
-        print(f"Error en get_user_activities_route: {str(e)}")
+        logger.exception("Error en get_user_activities_route")
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
 # Ruta para ver todos los usuarios
@@ -156,6 +167,13 @@ def get_user_activities_route_profile():
     """Obtiene las actividades del usuario para el perfil"""
     try:
         user_id = request.user['iduser']
-        return get_user_activities(user_id)
+        return get_user_activities(
+            user_id,
+            limit=request.args.get('limit'),
+            cursor=request.args.get('cursor'),
+            fields=request.args.get('fields'),
+            filters=request.args,
+            if_none_match=request.headers.get('If-None-Match')
+        )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
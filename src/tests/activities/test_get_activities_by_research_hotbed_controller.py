@@ -0,0 +1,302 @@
+import pytest
+from datetime import datetime, date, timedelta
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.projects_researchHotbed import ProjectsResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.users import User
+from models.users_research_hotbed import UsersResearchHotbed
+from models.research_hotbed import ResearchHotbed
+from controllers.activitiesResearchHotbed.get_activities_by_research_hotbed_controller import get_activities_by_research_hotbed
+from db.connection import db
+from utils.query_stats import count_queries
+
+@pytest.fixture
+def setup_hotbed_activities():
+    """Fixture con un semillero, dos miembros y varias actividades con autores"""
+
+    research_hotbed = ResearchHotbed(
+        name_researchHotbed="Semillero de Listados",
+        acronym_researchHotbed="SL",
+        faculty_researchHotbed="Ingeniería",
+        universityBranch_researchHotbed="Principal",
+        status_researchHotbed="Activo",
+        dateCreation_researchHotbed=datetime.now()
+    )
+    db.session.add(research_hotbed)
+    db.session.flush()
+
+    members = []
+    for index, name in enumerate(["Ana Torres", "Luis Mora"]):
+        user = User(
+            name_user=name,
+            email_user=f"user{index}@test.com",
+            password_user="hashed_password",
+            idSigaa_user=f"sigaa-{index}",
+            type_user="Estudiante",
+            status_user="Activo",
+            academicProgram_user="Ingeniería de Sistemas",
+            termsAccepted_user=True,
+            termsAcceptedAt_user=datetime.now(),
+            termsVersion_user="1.0"
+        )
+        db.session.add(user)
+        db.session.flush()
+
+        member = UsersResearchHotbed(
+            user_iduser=user.iduser,
+            researchHotbed_idresearchHotbed=research_hotbed.idresearchHotbed,
+            TypeUser_usersResearchHotbed="Estudiante",
+            status_usersResearchHotbed="Activo",
+            dateEnter_usersResearchHotbed=date.today()
+        )
+        db.session.add(member)
+        db.session.flush()
+        members.append(member)
+
+    db.session.commit()
+
+    return {'research_hotbed': research_hotbed, 'members': members}
+
+def create_activities(members, count):
+    """Crea actividades tipo proyecto con autor principal y co-autor"""
+    for index in range(count):
+        project = ProjectsResearchHotbed(
+            name_projectsResearchHotbed=f"Proyecto {index}",
+            referenceNumber_projectsResearchHotbed=f"REF-{index}",
+            startDate_projectsResearchHotbed=date(2025, 1, 15),
+            principalResearcher_projectsResearchHotbed="Ana Torres"
+        )
+        db.session.add(project)
+        db.session.flush()
+
+        activity = ActivitiesResearchHotbed(
+            title_activitiesResearchHotbed=f"Actividad {index}",
+            responsible_activitiesResearchHotbed="Ana Torres",
+            date_activitiesResearchHotbed=date(2025, 3, 1) + timedelta(days=index),
+            description_activitiesResearchHotbed="Descripción",
+            type_activitiesResearchHotbed="proyecto",
+            duration_activitiesResearchHotbed=2,
+            approvedFreeHours_activitiesResearchHotbed=1.0,
+            semester="semestre-1-2025",
+            usersResearchHotbed_idusersResearchHotbed=members[0].idusersResearchHotbed,
+            projectsResearchHotbed_idprojectsResearchHotbed=project.idprojectsResearchHotbed
+        )
+        db.session.add(activity)
+        db.session.flush()
+
+        db.session.add(ActivityAuthors(
+            activity_id=activity.idactivitiesResearchHotbed,
+            user_research_hotbed_id=members[0].idusersResearchHotbed,
+            is_main_author=True
+        ))
+        db.session.add(ActivityAuthors(
+            activity_id=activity.idactivitiesResearchHotbed,
+            user_research_hotbed_id=members[1].idusersResearchHotbed,
+            is_main_author=False
+        ))
+
+    db.session.commit()
+
+def test_get_activities_by_research_hotbed_payload(client, setup_database, setup_hotbed_activities):
+    """Prueba que el listado conserve la estructura JSON con autores y proyecto"""
+
+    test_data = setup_hotbed_activities
+    create_activities(test_data['members'], 2)
+
+    response, status_code = get_activities_by_research_hotbed(test_data['research_hotbed'].idresearchHotbed)
+
+    assert status_code == 200
+    assert response.json['total_count'] == 2
+
+    activity = response.json['activities'][0]
+    assert activity['research_hotbed_name'] == "Semillero de Listados"
+    assert activity['main_authors'] == ["Ana Torres"]
+    assert activity['co_authors'] == ["Luis Mora"]
+    assert activity['approved_free_hours'] is True
+    assert activity['project']['reference_number'].startswith("REF-")
+    assert activity['project']['start_date'] == "2025-01-15"
+    assert 'product' not in activity
+
+def test_get_activities_by_research_hotbed_constant_queries(client, setup_database, setup_hotbed_activities):
+    """Prueba que el número de consultas no crezca con el número de actividades"""
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+
+    create_activities(test_data['members'], 2)
+    db.session.expire_all()
+    with count_queries() as few_queries:
+        get_activities_by_research_hotbed(research_hotbed_id)
+
+    create_activities(test_data['members'], 10)
+    db.session.expire_all()
+    with count_queries() as many_queries:
+        response, status_code = get_activities_by_research_hotbed(research_hotbed_id)
+
+    assert status_code == 200
+    assert response.json['total_count'] == 12
+    assert many_queries.count == few_queries.count
+    assert many_queries.count <= 5
+
+def test_get_activities_by_research_hotbed_query_budget(client, setup_database, setup_hotbed_activities, max_queries):
+    """Prueba que listar un semillero con 500 actividades use como máximo 6 consultas"""
+
+    test_data = setup_hotbed_activities
+    create_activities(test_data['members'], 500)
+    db.session.expire_all()
+
+    with max_queries(6):
+        response, status_code = get_activities_by_research_hotbed(test_data['research_hotbed'].idresearchHotbed)
+
+    assert status_code == 200
+    assert response.json['total_count'] == 500
+
+def test_get_activities_by_research_hotbed_pagination(client, setup_database, setup_hotbed_activities):
+    """Prueba la paginación por cursor del listado del semillero"""
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    create_activities(test_data['members'], 5)
+
+    seen_titles = []
+    cursor = None
+    while True:
+        response, status_code = get_activities_by_research_hotbed(research_hotbed_id, limit="2", cursor=cursor)
+        assert status_code == 200
+        seen_titles.extend(activity['title'] for activity in response.json['activities'])
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen_titles == [f"Actividad {index}" for index in range(4, -1, -1)]
+
+    # Sin parámetros se conserva la respuesta original
+    response, _ = get_activities_by_research_hotbed(research_hotbed_id)
+    assert 'next_cursor' not in response.json
+    assert response.json['total_count'] == 5
+
+def test_get_activities_by_research_hotbed_sql_filters(client, setup_database, setup_hotbed_activities):
+    """Prueba los filtros del listado del semillero y que 'approved' coincida con los totales"""
+    from utils.activity_stats import get_hotbeds_activity_stats
+    from utils.semester_summary import rebuild_semester_summaries
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    create_activities(test_data['members'], 4)
+
+    # Horas aprobadas: 1.0, 0, sin valor y un ajuste negativo (distinto de cero)
+    activities = ActivitiesResearchHotbed.query.order_by(ActivitiesResearchHotbed.idactivitiesResearchHotbed).all()
+    for activity, approved_hours in zip(activities, [1.0, 0, None, -1.0]):
+        activity.approvedFreeHours_activitiesResearchHotbed = approved_hours
+    activities[3].semester = "semestre-2-2025"
+    db.session.commit()
+    rebuild_semester_summaries()
+
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, filters={'approved': "true"})
+    assert status_code == 200
+    assert [activity['title'] for activity in response.json['activities']] == ["Actividad 0", "Actividad 3"]
+
+    response, _ = get_activities_by_research_hotbed(research_hotbed_id, filters={'approved': "false"})
+    assert [activity['title'] for activity in response.json['activities']] == ["Actividad 1", "Actividad 2"]
+
+    for semester in ("semestre-1-2025", "semestre-2-2025"):
+        response, _ = get_activities_by_research_hotbed(
+            research_hotbed_id, filters={'approved': "true", 'semester': semester}
+        )
+        stats = get_hotbeds_activity_stats([research_hotbed_id], semester)[research_hotbed_id]
+        assert len(response.json['activities']) == stats['approved_activities'] == 1
+
+    response, _ = get_activities_by_research_hotbed(
+        research_hotbed_id, filters={'date_from': "2025-03-02", 'date_to': "2025-03-03", 'type': "proyecto"}
+    )
+    assert [activity['title'] for activity in response.json['activities']] == ["Actividad 1", "Actividad 2"]
+
+    _, status_code = get_activities_by_research_hotbed(research_hotbed_id, filters={'approved': "quizás"})
+    assert status_code == 400
+
+def test_get_activities_by_research_hotbed_sparse_fields(client, setup_database, setup_hotbed_activities):
+    """Prueba que ?fields= limite la respuesta y omita columnas y relaciones no pedidas"""
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    create_activities(test_data['members'], 3)
+    db.session.expire_all()
+
+    with count_queries() as queries:
+        response, status_code = get_activities_by_research_hotbed(research_hotbed_id, fields="title,date,type")
+
+    assert status_code == 200
+    assert all(set(activity) == {'title', 'date', 'type'} for activity in response.json['activities'])
+    # Una consulta para el ETag y una sola para el listado
+    assert queries.count == 2
+    assert 'description_activitiesResearchHotbed' not in queries.statements[-1]
+
+    _, status_code = get_activities_by_research_hotbed(research_hotbed_id, fields="title,no_existe")
+    assert status_code == 400
+
+def test_get_activities_by_research_hotbed_etag(client, setup_database, setup_hotbed_activities):
+    """Prueba el GET condicional: 304 mientras el listado no cambie, 200 tras un cambio"""
+    from controllers.activitiesResearchHotbed.delete_activities_controller import delete_activity
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    create_activities(test_data['members'], 3)
+
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id)
+    etag = response.headers['ETag']
+    assert status_code == 200
+    assert etag
+
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, if_none_match=etag)
+    assert status_code == 304
+    assert response.headers['ETag'] == etag
+
+    # Otros parámetros producen otro ETag
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, limit="2", if_none_match=etag)
+    assert status_code == 200
+
+    # Eliminar una actividad invalida el ETag anterior
+    activity_id = ActivitiesResearchHotbed.query.first().idactivitiesResearchHotbed
+    _, status_code = delete_activity(activity_id)
+    assert status_code == 200
+
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, if_none_match=etag)
+    assert status_code == 200
+    assert response.json['total_count'] == 2
+    assert response.headers['ETag'] != etag
+
+def test_get_activities_by_research_hotbed_etag_after_rename(client, setup_database, setup_hotbed_activities):
+    """Prueba que renombrar un co-autor o el semillero invalide el ETag del listado"""
+    from controllers.users.update_user import update_user
+    from controllers.researchHotbed.update_all_research_hotbed_controller import update_research_hotbed
+
+    test_data = setup_hotbed_activities
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    create_activities(test_data['members'], 2)
+
+    response, _ = get_activities_by_research_hotbed(research_hotbed_id)
+    etag = response.headers['ETag']
+
+    _, status_code = update_user(test_data['members'][1].user_iduser, {'name_user': "Luis Mora Díaz"})
+    assert status_code == 200
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, if_none_match=etag)
+    assert status_code == 200
+    assert response.headers['ETag'] != etag
+    etag = response.headers['ETag']
+
+    _, status_code = update_research_hotbed(research_hotbed_id, {'name_researchHotbed': "Semillero Renombrado"})
+    assert status_code == 200
+    response, status_code = get_activities_by_research_hotbed(research_hotbed_id, if_none_match=etag)
+    assert status_code == 200
+
+def test_bump_listing_versions_upsert(client, setup_database):
+    """Prueba que las versiones se creen en 1 y luego se incrementen con un solo upsert"""
+    from models.listing_version import ListingVersion
+    from utils.listing_versions import bump_listing_versions, HOTBED_SCOPE, USER_SCOPE
+
+    bump_listing_versions([1], [1, 2])
+    bump_listing_versions([1], [2])
+    db.session.commit()
+
+    versions = {(row.scope, row.scope_id): row.version for row in ListingVersion.query.all()}
+    assert versions == {(HOTBED_SCOPE, 1): 2, (USER_SCOPE, 1): 1, (USER_SCOPE, 2): 2}
@@ -0,0 +1,179 @@
+import pytest
+from datetime import datetime, date
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.products_researchHotbed import ProductsResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.users import User
+from models.users_research_hotbed import UsersResearchHotbed
+from models.research_hotbed import ResearchHotbed
+from controllers.activitiesResearchHotbed.get_activities_controller import get_activity_details
+from controllers.activitiesResearchHotbed.update_activities_controller import update_activity
+from controllers.users.update_user import update_user
+from utils.activity_cache import activity_detail_cache
+from db.connection import db
+from utils.query_stats import count_queries
+
+@pytest.fixture
+def setup_activity_detail():
+    """Fixture con una actividad tipo producto, su autor principal y un co-autor"""
+
+    research_hotbed = ResearchHotbed(
+        name_researchHotbed="Semillero de Detalle",
+        acronym_researchHotbed="SD",
+        faculty_researchHotbed="Ingeniería",
+        universityBranch_researchHotbed="Principal",
+        status_researchHotbed="Activo",
+        dateCreation_researchHotbed=datetime.now()
+    )
+    db.session.add(research_hotbed)
+    db.session.flush()
+
+    members = []
+    for index, name in enumerate(["Carla Díaz", "Mario León"]):
+        user = User(
+            name_user=name,
+            email_user=f"detalle{index}@test.com",
+            password_user="hashed_password",
+            idSigaa_user=f"detalle-{index}",
+            type_user="Estudiante",
+            status_user="Activo",
+            academicProgram_user="Ingeniería de Sistemas",
+            termsAccepted_user=True,
+            termsAcceptedAt_user=datetime.now(),
+            termsVersion_user="1.0"
+        )
+        db.session.add(user)
+        db.session.flush()
+
+        member = UsersResearchHotbed(
+            user_iduser=user.iduser,
+            researchHotbed_idresearchHotbed=research_hotbed.idresearchHotbed,
+            TypeUser_usersResearchHotbed="Estudiante",
+            status_usersResearchHotbed="Activo",
+            dateEnter_usersResearchHotbed=date.today()
+        )
+        db.session.add(member)
+        db.session.flush()
+        members.append(member)
+
+    product = ProductsResearchHotbed(
+        category_productsResearchHotbed="Generación de nuevo conocimiento",
+        type_productsResearchHotbed="Artículo",
+        description_productsResearchHotbed="Artículo de revista",
+        datePublication_productsResearchHotbed=date(2025, 5, 20)
+    )
+    db.session.add(product)
+    db.session.flush()
+
+    activity = ActivitiesResearchHotbed(
+        title_activitiesResearchHotbed="Publicación",
+        responsible_activitiesResearchHotbed="Carla Díaz",
+        date_activitiesResearchHotbed=date(2025, 5, 20),
+        description_activitiesResearchHotbed="Descripción",
+        type_activitiesResearchHotbed="producto",
+        duration_activitiesResearchHotbed=4,
+        semester="semestre-1-2025",
+        usersResearchHotbed_idusersResearchHotbed=members[0].idusersResearchHotbed,
+        productsResearchHotbed_idproductsResearchHotbed=product.idproductsResearchHotbed
+    )
+    db.session.add(activity)
+    db.session.flush()
+
+    db.session.add(ActivityAuthors(
+        activity_id=activity.idactivitiesResearchHotbed,
+        user_research_hotbed_id=members[0].idusersResearchHotbed,
+        is_main_author=True
+    ))
+    db.session.add(ActivityAuthors(
+        activity_id=activity.idactivitiesResearchHotbed,
+        user_research_hotbed_id=members[1].idusersResearchHotbed,
+        is_main_author=False
+    ))
+    db.session.commit()
+
+    return {'activity': activity}
+
+def test_get_activity_details_with_relationships(client, setup_database, setup_activity_detail):
+    """Prueba que el detalle incluya producto, autores y co-autores desde las relaciones"""
+
+    activity_id = setup_activity_detail['activity'].idactivitiesResearchHotbed
+    db.session.expire_all()
+
+    response, status_code = get_activity_details(activity_id)
+    details = response.json['activity_details']
+
+    assert status_code == 200
+    assert details['product']['type'] == "Artículo"
+    assert details['product']['date_publication'] == "2025-05-20"
+    assert details['project'] is None
+    assert [author['name'] for author in details['authors']] == ["Carla Díaz"]
+    assert [author['email'] for author in details['co_authors']] == ["detalle1@test.com"]
+
+def test_get_activity_details_not_found(client, setup_database):
+    """Prueba la respuesta cuando la actividad no existe"""
+
+    response, status_code = get_activity_details(9999)
+
+    assert status_code == 404
+    assert response.json['error'] == "Actividad no encontrada"
+
+def test_get_activity_details_sparse_fields(client, setup_database, setup_activity_detail):
+    """Prueba que el detalle devuelva solo los campos pedidos"""
+
+    activity_id = setup_activity_detail['activity'].idactivitiesResearchHotbed
+    db.session.expire_all()
+
+    response, status_code = get_activity_details(activity_id, fields="title,co_authors")
+
+    assert status_code == 200
+    assert response.json['activity_details'] == {
+        'title': "Publicación",
+        'co_authors': [{'id': 2, 'name': "Mario León", 'email': "detalle1@test.com", 'type': "Estudiante"}]
+    }
+
+def test_get_activity_details_cache(client, setup_database, setup_activity_detail):
+    """Prueba que el detalle se sirva desde caché y se invalide al escribir"""
+
+    activity = setup_activity_detail['activity']
+    activity_id = activity.idactivitiesResearchHotbed
+    co_author_user_id = activity.authors[1].user_research_hotbed.user_iduser
+
+    get_activity_details(activity_id)
+    with count_queries() as queries:
+        response, status_code = get_activity_details(activity_id)
+    assert status_code == 200
+    assert queries.count == 0
+    assert activity_detail_cache().stats()['hits'] == 1
+
+    # Actualizar la actividad invalida su detalle
+    update_activity(activity_id, {'title': "Publicación revisada"})
+    response, _ = get_activity_details(activity_id)
+    assert response.json['activity_details']['title'] == "Publicación revisada"
+
+    # Cambiar el nombre de un co-autor invalida las actividades donde aparece
+    update_user(co_author_user_id, {'name_user': "Mario León Ruiz"})
+    response, _ = get_activity_details(activity_id)
+    assert response.json['activity_details']['co_authors'][0]['name'] == "Mario León Ruiz"
+
+def test_get_activity_details_skips_stale_cache_store(client, setup_database, setup_activity_detail, monkeypatch):
+    """Prueba que no se guarde en caché un detalle leído antes de una invalidación concurrente"""
+    from controllers.activitiesResearchHotbed import get_activities_controller
+    from utils.activity_cache import invalidate_activity_details
+
+    activity_id = setup_activity_detail['activity'].idactivitiesResearchHotbed
+    serialize_rows = get_activities_controller.serialize_rows
+
+    def serialize_during_write(plan, rows):
+        # Otra petición confirma un cambio e invalida la actividad mientras se arma la respuesta
+        invalidate_activity_details([activity_id])
+        return serialize_rows(plan, rows)
+
+    monkeypatch.setattr(get_activities_controller, 'serialize_rows', serialize_during_write)
+    response, status_code = get_activity_details(activity_id)
+    assert status_code == 200
+    assert activity_detail_cache().stats()['size'] == 0
+
+    # Sin escrituras concurrentes el detalle sí se guarda
+    monkeypatch.setattr(get_activities_controller, 'serialize_rows', serialize_rows)
+    get_activity_details(activity_id)
+    assert activity_detail_cache().stats()['size'] == 1
@@ -1,3 +1,4 @@
+import logging
 import pytest
 from datetime import datetime, date
 from models.activities_researchHotbed import ActivitiesResearchHotbed
@@ -9,6 +10,10 @@ from models.users import User
 from models.users_research_hotbed import UsersResearchHotbed
 from models.research_hotbed import ResearchHotbed
 from controllers.activitiesResearchHotbed.register_activities_controller import register_activity
+from controllers.activitiesResearchHotbed.update_activities_controller import update_activity
+from controllers.activitiesResearchHotbed.delete_activities_controller import delete_activity
+from models.activity_semester_summary import ActivitySemesterSummary
+from utils.semester_summary import rebuild_semester_summaries, activity_contributions, apply_summary_changes
 from db.connection import db
 
 @pytest.fixture
@@ -386,4 +391,220 @@ def test_create_activity_multiple_authors_and_coauthors(client, setup_database,
     ).all()
     
     assert len(main_authors) == 1
-    assert len(co_authors) == 1
\ No newline at end of file
+    assert len(co_authors) == 1
+
+def test_create_activity_logs_without_payload(client, setup_database, setup_activity_test_data, caplog):
+    """Prueba que el registro use logs por nivel y no escriba el contenido de la solicitud"""
+
+    test_data = setup_activity_test_data
+
+    activity_data = {
+        'title': 'Actividad Confidencial',
+        'date': '2025-06-15',
+        'description': 'Texto privado de la actividad',
+        'type': 'actividad',
+        'semester': 'semestre-1-2025',
+        'userResearchHotbedId': test_data['user_research'].idusersResearchHotbed,
+        'authors_ids': [test_data['user_research'].idusersResearchHotbed],
+        'co_authors_ids': []
+    }
+
+    with caplog.at_level(logging.DEBUG, logger='controllers.activitiesResearchHotbed.register_activities_controller'):
+        response, status_code = register_activity(activity_data)
+
+    assert status_code == 201
+    assert any(record.levelno == logging.INFO for record in caplog.records)
+    assert 'Texto privado de la actividad' not in caplog.text
+
+    # Con el nivel por defecto (INFO) no se emiten los mensajes de depuración
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger='controllers.activitiesResearchHotbed.register_activities_controller'):
+        register_activity({**activity_data, 'title': 'Otra actividad'})
+
+    assert all(record.levelno >= logging.INFO for record in caplog.records)
+
+def test_semester_summary_maintained_on_activity_writes(client, setup_database, setup_activity_test_data):
+    """Prueba que registrar, editar y eliminar actividades actualice la tabla de resumen por semestre"""
+
+    test_data = setup_activity_test_data
+    user_id = test_data['user'].iduser
+    hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    urh_id = test_data['user_research'].idusersResearchHotbed
+
+    def summaries():
+        return semester_summary_rows(lambda row: (
+            row.scope, row.scope_id, row.semester, row.total_activities, row.total_hours, row.projects
+        ))
+
+    activity_data = {
+        'title': 'Proyecto de Prueba',
+        'date': '2025-06-15',
+        'description': 'Proyecto para el resumen',
+        'type': 'proyecto',
+        'duration': 10,
+        'semester': 'semestre-1-2025',
+        'userResearchHotbedId': urh_id,
+        'authors_ids': [urh_id],
+        'co_authors_ids': []
+    }
+    response, status_code = register_activity(activity_data)
+    assert status_code == 201
+    activity_id = response.json['activity_id']
+    register_activity({**activity_data, 'title': 'Otro Proyecto', 'duration': 5})
+
+    # Fila del semillero y fila del usuario
+    assert summaries() == [
+        ('hotbed', hotbed_id, 'semestre-1-2025', 2, 15, 2),
+        ('user', user_id, 'semestre-1-2025', 2, 15, 2)
+    ]
+
+    # Cambiar el semestre actualiza el semestre anterior y el nuevo
+    response, status_code = update_activity(activity_id, {'semester': 'semestre-2-2025', 'type': 'actividad'})
+    assert status_code == 200
+    assert summaries() == [
+        ('hotbed', hotbed_id, 'semestre-1-2025', 1, 5, 1),
+        ('user', user_id, 'semestre-1-2025', 1, 5, 1),
+        ('hotbed', hotbed_id, 'semestre-2-2025', 1, 10, 0),
+        ('user', user_id, 'semestre-2-2025', 1, 10, 0)
+    ]
+
+    response, status_code = delete_activity(activity_id)
+    assert status_code == 200
+    maintained = summaries()
+    assert maintained == [
+        ('hotbed', hotbed_id, 'semestre-1-2025', 1, 5, 1),
+        ('user', user_id, 'semestre-1-2025', 1, 5, 1)
+    ]
+
+    # La reconstrucción completa produce las mismas filas
+    assert rebuild_semester_summaries() == 2
+    assert summaries() == maintained
+
+def semester_summary_rows(as_tuple):
+    rows = ActivitySemesterSummary.query.order_by(
+        ActivitySemesterSummary.semester, ActivitySemesterSummary.scope, ActivitySemesterSummary.scope_id
+    ).all()
+    return [as_tuple(row) for row in rows]
+
+def test_semester_summary_overlapping_writes(client, setup_database, setup_activity_test_data):
+    """
+    Prueba que dos escrituras solapadas (cada una calcula su cambio antes de
+    que la otra lo aplique) dejen los mismos totales que una reconstrucción
+    """
+
+    test_data = setup_activity_test_data
+    urh_id = test_data['user_research'].idusersResearchHotbed
+
+    def all_totals():
+        return semester_summary_rows(lambda row: (
+            row.scope, row.scope_id, row.semester, *(getattr(row, key) for key in (
+                'total_activities', 'total_hours', 'approved_activities', 'projects', 'products', 'recognitions'
+            ))
+        ))
+
+    def add_activity(title, duration, activity_type):
+        activity = ActivitiesResearchHotbed(
+            title_activitiesResearchHotbed=title,
+            date_activitiesResearchHotbed=date(2025, 6, 15),
+            description_activitiesResearchHotbed='Actividad concurrente',
+            type_activitiesResearchHotbed=activity_type,
+            duration_activitiesResearchHotbed=duration,
+            approvedFreeHours_activitiesResearchHotbed=1.0,
+            semester='semestre-1-2025',
+            usersResearchHotbed_idusersResearchHotbed=urh_id
+        )
+        db.session.add(activity)
+        db.session.flush()
+        db.session.add(ActivityAuthors(
+            activity_id=activity.idactivitiesResearchHotbed, user_research_hotbed_id=urh_id, is_main_author=True
+        ))
+        db.session.flush()
+        return activity
+
+    # Dos registros en el mismo semillero y semestre: ambos calculan su aporte
+    # antes de que cualquiera lo aplique, y se aplican en orden inverso
+    first = add_activity('Primera', 10, 'proyecto')
+    second = add_activity('Segunda', 4, 'producto')
+    first_added = activity_contributions([first.idactivitiesResearchHotbed])
+    second_added = activity_contributions([second.idactivitiesResearchHotbed])
+    apply_summary_changes({}, second_added)
+    apply_summary_changes({}, first_added)
+    db.session.commit()
+
+    maintained = all_totals()
+    rebuild_semester_summaries()
+    assert maintained == all_totals()
+    assert maintained[0][:4] == ('hotbed', test_data['research_hotbed'].idresearchHotbed, 'semestre-1-2025', 2)
+
+    # Dos ediciones solapadas: una cambia las horas y la otra el semestre
+    first_before = activity_contributions([first.idactivitiesResearchHotbed])
+    second_before = activity_contributions([second.idactivitiesResearchHotbed])
+    first.duration_activitiesResearchHotbed = 12
+    second.semester = 'semestre-2-2025'
+    db.session.flush()
+    first_after = activity_contributions([first.idactivitiesResearchHotbed])
+    second_after = activity_contributions([second.idactivitiesResearchHotbed])
+    apply_summary_changes(second_before, second_after)
+    apply_summary_changes(first_before, first_after)
+    db.session.commit()
+
+    maintained = all_totals()
+    rebuild_semester_summaries()
+    assert maintained == all_totals()
+    assert len(maintained) == 4
+
+def test_update_and_delete_activity_related_entities(client, setup_database, setup_activity_test_data):
+    """Prueba que editar y eliminar una actividad use las entidades cargadas con ella (preset 'detail')"""
+    from utils.activity_loaders import activity_loader_options, ACTIVITY_ENTITY_LOADS
+    from utils.query_stats import count_queries
+
+    test_data = setup_activity_test_data
+    user_research_id = test_data['user_research'].idusersResearchHotbed
+
+    response, status_code = register_activity({
+        'title': 'Proyecto con entidades',
+        'date': '2025-06-15',
+        'description': 'Proyecto de prueba',
+        'type': 'proyecto',
+        'start_time': '08:00',
+        'end_time': '10:00',
+        'duration': 2,
+        'semester': 'semestre-1-2025',
+        'userResearchHotbedId': user_research_id,
+        'authors_ids': [user_research_id],
+        'co_authors_ids': [],
+        'project': {
+            'name': 'Proyecto inicial',
+            'reference_number': 'PROJ-1',
+            'start_date': '2025-01-15',
+            'end_date': '2025-12-15'
+        }
+    })
+    assert status_code == 201
+    activity_id = response.json['activity_id']
+
+    # Edición: actualiza el proyecto cargado con la actividad
+    _, status_code = update_activity(activity_id, {'project': {'name': 'Proyecto revisado'}})
+    assert status_code == 200
+    db.session.expunge_all()
+
+    # Un solo SELECT trae la actividad con sus entidades asociadas
+    with count_queries() as counter:
+        activity = db.session.get(
+            ActivitiesResearchHotbed, activity_id,
+            options=activity_loader_options('detail', only=ACTIVITY_ENTITY_LOADS)
+        )
+        assert activity.project.name_projectsResearchHotbed == 'Proyecto revisado'
+        assert activity.product is None
+        assert activity.recognition is None
+    assert counter.count == 1
+    project_id = activity.projectsResearchHotbed_idprojectsResearchHotbed
+    db.session.expunge_all()
+
+    _, status_code = delete_activity(activity_id)
+    assert status_code == 200
+    assert db.session.get(ActivitiesResearchHotbed, activity_id) is None
+    assert db.session.get(ProjectsResearchHotbed, project_id) is None
+
+    with pytest.raises(ValueError):
+        activity_loader_options('resumen')
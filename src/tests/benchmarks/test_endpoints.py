@@ -0,0 +1,26 @@
+from benchmarks.seed import main as seed_main
+from benchmarks.endpoints import run_benchmark, compare_reports, build_endpoints
+
+def test_seed_and_endpoint_benchmark(tmp_path, monkeypatch):
+    """Prueba generar una base pequeña y medir algunos endpoints sobre ella"""
+
+    monkeypatch.setenv('EXPORT_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('EXPORT_SPOOL_DIR', str(tmp_path / 'spool'))
+    database = str(tmp_path / 'bench.sqlite')
+    assert seed_main(['--database', database, '--users', '30', '--hotbeds', '3', '--activities', '200']) == 0
+
+    report = run_benchmark(database, runs=2, only='hotbed_activities')
+
+    assert set(report['endpoints']) == {
+        endpoint.name for endpoint in build_endpoints() if 'hotbed_activities' in endpoint.name
+    }
+    for result in report['endpoints'].values():
+        assert result['status'] == [200]
+        assert result['queries'] > 0
+        assert result['p95_ms'] >= result['p50_ms'] > 0
+        assert result['response_bytes'] > 0
+
+    # Muestra elegida de la base y comparación entre reportes
+    assert report['sample']['semester'].startswith('semestre-')
+    lines = compare_reports(report, report)
+    assert any('(+0%)' in line for line in lines)
@@ -1,9 +1,17 @@
 import pytest
 import warnings
+from contextlib import contextmanager
 from flask import Flask
 from db.connection import db
 from models.users import User
+# Tabla que actualizan las escrituras de actividades (debe existir al crear las tablas)
+from models.research_hotbed import ResearchHotbed  # noqa: F401
+from models.activity_semester_summary import ActivitySemesterSummary  # noqa: F401
 from controllers.users.register_controller import create_user
+from utils.cache import clear_caches
+from utils.export_cache import export_file_cache
+from utils.query_stats import count_queries
+from utils.last_login import last_login_buffer
 
 # Suprimir warnings de deprecación para los tests
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -37,11 +45,19 @@ def app():
     with app.app_context():
         # Crear todas las tablas
         db.create_all()
+        # Cada prueba parte con las cachés en proceso vacías
+        clear_caches()
+        last_login_buffer.clear()
         yield app
         # Limpiar después de cada test
         db.session.remove()
         db.drop_all()
 
+# Cada prueba usa su propio directorio para la caché de archivos exportados
+@pytest.fixture(autouse=True)
+def isolated_export_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_file_cache, 'cache_dir', str(tmp_path / 'export_cache'))
+
 # Fixture para el cliente de la aplicación (usado para simular peticiones HTTP)
 @pytest.fixture
 def client(app):
@@ -58,3 +74,16 @@ def setup_database(app):
         yield db
         # Limpiar después de la prueba
         db.session.rollback()
+
+# Límite de consultas SQL de un bloque: falla con la lista de sentencias si se supera
+# Uso: with max_queries(6): get_activities_by_research_hotbed(research_hotbed_id)
+@pytest.fixture
+def max_queries():
+    @contextmanager
+    def guard(limit):
+        with count_queries() as counter:
+            yield counter
+        assert counter.count <= limit, (
+            f"Se ejecutaron {counter.count} consultas (máximo {limit}):\n" + "\n".join(counter.statements)
+        )
+    return guard
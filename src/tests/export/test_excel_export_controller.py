@@ -1,6 +1,10 @@
 import pytest
 from datetime import datetime, date
 from io import BytesIO
+import time
+import zipfile
+import csv
+import json
 import pandas as pd
 from openpyxl import load_workbook
 from models.activities_researchHotbed import ActivitiesResearchHotbed
@@ -10,15 +14,31 @@ from models.research_hotbed import ResearchHotbed
 from models.activity_authors import ActivityAuthors
 from controllers.export.excel_export_controller import (
     export_research_hotbed_excel,
+    export_research_hotbed_pdf,
+    get_standard_styles,
+    get_info_table_style,
     generate_excel_report,
     get_active_members,
     get_activities_by_semester
 )
 from controllers.export.users_pdf_export_controller import (
     export_user_excel,
-    export_multiple_users_excel
+    export_multiple_users_excel,
+    generate_consolidated_users_excel,
+    get_user_activities_by_semester,
+    get_user_research_hotbeds
 )
+from controllers.export.users_bundle_export_controller import export_users_excel_bundle
+from controllers.export.rows_export_controller import export_research_hotbed_rows, export_users_rows
+from controllers.export.preview_export_controller import preview_user_export
+from controllers.export.scope_export_controller import build_scope_excel
+from controllers.export.export_jobs_controller import create_export_job, get_export_job, download_export_job_file
+from utils.export_jobs import ExportJobQueue, ExportError
+from utils.activity_stats import get_users_activity_stats, get_users_hotbed_counts
+from controllers.activitiesResearchHotbed.delete_activities_controller import delete_activity
+from utils.semester_summary import rebuild_semester_summaries
 from db.connection import db
+from utils.query_stats import count_queries
 
 @pytest.fixture
 def setup_export_test_data():
@@ -141,6 +161,9 @@ def setup_export_test_data():
         db.session.add(author_relation)
     
     db.session.commit()
+
+    # Los datos se insertan directamente: carga inicial de la tabla de resumen
+    rebuild_semester_summaries()
     
     return {
         'research_hotbed': research_hotbed,
@@ -199,6 +222,13 @@ def test_export_research_hotbed_excel_success(client, setup_database, setup_expo
                     break
             assert semillero_found, "No se encontró el nombre del semillero en el Excel"
 
+            # Los totales vienen de la fila del semillero en la tabla de resumen
+            info = {row[0]: row[1] for row in info_sheet.iter_rows(values_only=True)}
+            assert info['Total de Actividades Registradas'] == '3 actividades'
+            assert info['Horas Académicas Totales'] == '65.0 horas'
+            assert info['Actividades con Horas Aprobadas'] == '3 actividades'
+            assert info['Proyectos de Investigación'] == '1 proyectos'
+
 def test_export_user_excel_success(client, setup_database, setup_export_test_data):
     """Prueba la exportación exitosa de Excel de usuario individual"""
     
@@ -488,4 +518,455 @@ def test_excel_export_styling_applied(client, setup_database, setup_export_test_
                         has_content = True
                         break
                 
-                assert has_content, "La hoja debe tener contenido aunque no tenga estilos personalizados"
\ No newline at end of file
+                assert has_content, "La hoja debe tener contenido aunque no tenga estilos personalizados"
+
+def test_export_activity_data_shape(client, setup_database, setup_export_test_data):
+    """Prueba los datos de actividades que usan las hojas de exportación"""
+
+    test_data = setup_export_test_data
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+
+    activities = get_activities_by_semester(research_hotbed_id, 'semestre-1-2025')
+    assert sorted(activity['type'] for activity in activities) == ['producto', 'proyecto', 'reconocimiento']
+
+    activity = next(activity for activity in activities if activity['type'] == 'proyecto')
+    assert activity['date'] == date.today()
+    assert activity['approved_free_hours'] is True
+    assert activity['authors'] == {'main_authors': ['Juan Pérez García'], 'co_authors': []}
+    assert 'project_data' not in activity
+
+    user_activities = get_user_activities_by_semester(test_data['users'][1].iduser, 'semestre-1-2025')
+    assert [activity['title'] for activity in user_activities] == ['Artículo sobre IA']
+    assert user_activities[0]['research_hotbed_name'] == "Semillero de Sistemas de Información"
+
+def test_consolidated_users_stats_single_query(client, setup_database, setup_export_test_data):
+    """Prueba que el consolidado calcule los totales de todos los usuarios con consultas agregadas"""
+
+    test_data = setup_export_test_data
+    users = test_data['users']
+    user_ids = [user.iduser for user in users]
+    semester = 'semestre-1-2025'
+
+    # Juan también es co-autor de la actividad de María
+    db.session.add(ActivityAuthors(
+        activity_id=test_data['activities'][1].idactivitiesResearchHotbed,
+        user_research_hotbed_id=test_data['users_research'][0].idusersResearchHotbed,
+        is_main_author=False
+    ))
+    db.session.commit()
+    rebuild_semester_summaries()
+
+    stats = get_users_activity_stats(user_ids, semester)
+    hotbed_counts = get_users_hotbed_counts(user_ids)
+    for user in users:
+        activities = get_user_activities_by_semester(user.iduser, semester)
+        assert stats[user.iduser]['total_activities'] == len(activities)
+        assert stats[user.iduser]['total_hours'] == sum(a['duration'] for a in activities)
+        assert stats[user.iduser]['approved_activities'] == len([a for a in activities if a['approved_free_hours']])
+        assert hotbed_counts[user.iduser] == len(get_user_research_hotbeds(user.iduser))
+    assert stats[users[0].iduser]['projects'] == 1
+    assert stats[users[0].iduser]['products'] == 1
+    assert get_users_activity_stats(user_ids, 'semestre-2-2025') == {}
+
+    with count_queries() as queries:
+        workbook = load_workbook(generate_consolidated_users_excel(users, semester))
+
+    # Una consulta agregada de actividades y una de semilleros, sin importar el número de usuarios
+    assert queries.count == 2
+    rows = list(workbook['Usuarios Consolidado'].iter_rows(values_only=True))
+    header_index = next(i for i, row in enumerate(rows) if row[0] == 'No.')
+    header = rows[header_index]
+    juan = dict(zip(header, rows[header_index + 1]))
+    assert juan['Nombre Completo'] == 'Juan Pérez García'
+    assert juan['Total Actividades'] == 2
+    assert juan['Horas Totales'] == 60
+    assert juan['Semilleros Asociados'] == 1
+
+def test_users_stats_count_each_activity_once(client, setup_database, setup_export_test_data):
+    """Prueba que una actividad ligada al usuario por dos membresías se cuente una sola vez"""
+
+    test_data = setup_export_test_data
+    juan = test_data['users'][0]
+    semester = 'semestre-1-2025'
+
+    # Juan entra a un segundo semillero y figura como co-autor de su propio proyecto desde allí
+    other_hotbed = ResearchHotbed(
+        name_researchHotbed="Semillero de Redes",
+        acronym_researchHotbed="SR",
+        faculty_researchHotbed="Ingeniería",
+        universityBranch_researchHotbed="Sede Principal",
+        status_researchHotbed="Activo",
+        dateCreation_researchHotbed=datetime.now()
+    )
+    db.session.add(other_hotbed)
+    db.session.flush()
+    other_membership = UsersResearchHotbed(
+        user_iduser=juan.iduser,
+        researchHotbed_idresearchHotbed=other_hotbed.idresearchHotbed,
+        TypeUser_usersResearchHotbed="Estudiante",
+        status_usersResearchHotbed="Activo",
+        dateEnter_usersResearchHotbed=date.today()
+    )
+    db.session.add(other_membership)
+    db.session.flush()
+    db.session.add(ActivityAuthors(
+        activity_id=test_data['activities'][0].idactivitiesResearchHotbed,
+        user_research_hotbed_id=other_membership.idusersResearchHotbed,
+        is_main_author=False
+    ))
+    db.session.commit()
+    rebuild_semester_summaries()
+
+    stats = get_users_activity_stats([juan.iduser], semester)[juan.iduser]
+    assert stats['total_activities'] == len(get_user_activities_by_semester(juan.iduser, semester)) == 1
+    assert stats['total_hours'] == 40
+    assert stats['projects'] == 1
+
+def test_export_users_excel_bundle(app, client, setup_database, setup_export_test_data):
+    """Prueba el ZIP con un libro detallado por usuario generado en el pool de procesos"""
+
+    test_data = setup_export_test_data
+    user_ids = [user.iduser for user in test_data['users']]
+
+    with app.test_request_context():
+        response = export_users_excel_bundle(user_ids, 'semestre-1-2025')
+        assert response.mimetype == 'application/zip'
+        assert 'usuarios_semestre-1-2025.zip' in response.headers['Content-Disposition']
+        archive = zipfile.ZipFile(BytesIO(response.get_data()))
+
+    assert sorted(archive.namelist()) == sorted(
+        f"{user.idSigaa_user}_{user.name_user.replace(' ', '_')}_semestre-1-2025.xlsx" for user in test_data['users']
+    )
+
+    workbook = load_workbook(BytesIO(archive.read('20241001_Juan_Pérez_García_semestre-1-2025.xlsx')))
+    assert 'Información Personal' in workbook.sheetnames
+    info = {row[0]: row[1] for row in workbook['Información Personal'].iter_rows(values_only=True)}
+    assert info['Nombre Completo'] == 'Juan Pérez García'
+    assert info['Total de Actividades'] == '1 actividades'
+
+    response, status_code = export_users_excel_bundle(user_ids, 'semestre-invalido')
+    assert status_code == 400
+
+def test_render_workbooks_cancels_pending_on_disconnect():
+    """Prueba que al cerrar el ZIP a medias (cliente desconectado) se cancelen los libros pendientes"""
+    from concurrent.futures import Future
+    from controllers.export.users_bundle_export_controller import render_workbooks
+
+    class FakePool:
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, fn, *args):
+            future = Future()
+            if not self.futures:
+                future.set_result(b'libro')
+            self.futures.append(future)
+            return future
+
+    pool = FakePool()
+    jobs = [(f'usuario_{index}.xlsx', ()) for index in range(5)]
+    workbooks = render_workbooks(pool, jobs, max_in_flight=3)
+
+    assert next(workbooks) == ('usuario_0.xlsx', b'libro')
+    workbooks.close()
+
+    assert len(pool.futures) == 3
+    assert all(future.cancelled() for future in pool.futures[1:])
+
+def test_export_rows_streaming_formats(app, client, setup_database, setup_export_test_data, monkeypatch):
+    """Prueba la exportación por filas en CSV y NDJSON leyendo el cursor por lotes"""
+
+    test_data = setup_export_test_data
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    monkeypatch.setattr('utils.row_stream.STREAM_BATCH_SIZE', 1)
+
+    with app.test_request_context():
+        response = export_research_hotbed_rows(research_hotbed_id, 'semestre-1-2025', 'csv')
+        assert response.mimetype == 'text/csv'
+        assert response.is_streamed
+
+        with count_queries() as queries:
+            chunks = list(response.response)
+
+    # Encabezado + un fragmento por lote de una fila, todo desde un único SELECT
+    assert len(chunks) == 4
+    assert queries.count == 1
+    rows = list(csv.DictReader(''.join(chunks).splitlines()))
+    assert [row['title'] for row in rows] == ['Desarrollo de Sistema Web', 'Artículo sobre IA', 'Premio Mejor Proyecto']
+    assert rows[0]['main_authors'] == 'Juan Pérez García'
+    assert rows[0]['date'] == date.today().isoformat()
+
+    user_ids = [user.iduser for user in test_data['users']]
+    with app.test_request_context():
+        response = export_users_rows(user_ids, 'semestre-1-2025', 'ndjson')
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [record['user_id'] for record in records] == sorted(user_ids)
+    assert records[1]['title'] == 'Artículo sobre IA'
+    assert records[1]['main_authors'] == ['María González López']
+    assert records[1]['co_authors'] == []
+
+    with app.test_request_context():
+        _, status_code = export_research_hotbed_rows(99999, 'semestre-1-2025', 'csv')
+    assert status_code == 404
+
+def test_export_research_hotbed_pdf(app, client, setup_database, setup_export_test_data, monkeypatch):
+    """Prueba el reporte PDF transmitido desde un archivo temporal con estilos compartidos"""
+
+    test_data = setup_export_test_data
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    # Forzar que el PDF pase de memoria a disco
+    monkeypatch.setattr('controllers.export.excel_export_controller.PDF_SPOOL_MAX_BYTES', 1024)
+    base_commands = list(get_info_table_style().getCommands())
+
+    with app.test_request_context():
+        response = export_research_hotbed_pdf(research_hotbed_id, 'semestre-1-2025')
+        assert response.mimetype == 'application/pdf'
+        assert 'SSI_semestre-1-2025_reporte.pdf' in response.headers['Content-Disposition']
+        pdf_data = response.get_data()
+
+    assert pdf_data.startswith(b'%PDF')
+    assert int(response.headers['Content-Length']) == len(pdf_data)
+
+    # Los estilos se crean una vez y las tablas con separadores no los modifican
+    assert get_standard_styles() is get_standard_styles()
+    assert list(get_info_table_style().getCommands()) == base_commands
+
+    _, status_code = export_research_hotbed_pdf(99999, 'semestre-1-2025')
+    assert status_code == 404
+
+def test_preview_user_export_aggregates(app, client, setup_database, setup_export_test_data):
+    """Prueba que la previsualización use consultas agregadas y coincida con los datos del export"""
+
+    test_data = setup_export_test_data
+    user = test_data['users'][0]
+    user_id = user.iduser
+    activities = get_user_activities_by_semester(user_id, 'semestre-1-2025')
+    db.session.expire_all()
+
+    with count_queries() as queries:
+        response, status_code = preview_user_export(user_id, 'semestre-1-2025')
+
+    assert status_code == 200
+    # Usuario, agregado de actividades y COUNT de semilleros
+    assert queries.count == 3
+    data = response.get_json()
+    assert data['user']['name'] == 'Juan Pérez García'
+    assert data['stats'] == {
+        'total_research_hotbeds': 1,
+        'total_activities': len(activities),
+        'total_hours': sum(a['duration'] for a in activities),
+        'approved_activities': len([a for a in activities if a['approved_free_hours']])
+    }
+    assert data['activities_count'] == len(activities)
+
+    response, status_code = preview_user_export(user_id, 'semestre-2-2025')
+    assert response.get_json()['stats']['total_activities'] == 0
+
+    _, status_code = preview_user_export(99999, 'semestre-1-2025')
+    assert status_code == 404
+
+def test_build_scope_excel_bulk_queries(client, setup_database, setup_export_test_data):
+    """Prueba el libro por facultad/institución con consultas en bloque y una hoja por semillero"""
+
+    test_data = setup_export_test_data
+    other_hotbed = ResearchHotbed(
+        name_researchHotbed="Semillero de Biología",
+        acronym_researchHotbed="BIO",
+        faculty_researchHotbed="Ciencias",
+        universityBranch_researchHotbed="Sede Principal",
+        status_researchHotbed="Activo",
+        dateCreation_researchHotbed=datetime.now()
+    )
+    db.session.add(other_hotbed)
+    db.session.commit()
+
+    with count_queries() as queries:
+        buffer, filename = build_scope_excel('all', None, 'semestre-1-2025')
+
+    # Semilleros, miembros, actividades y autores: no depende del número de semilleros
+    assert queries.count == 4
+    assert filename == 'semilleros_institucion_semestre-1-2025.xlsx'
+    workbook = load_workbook(buffer)
+    assert workbook.sheetnames == ['Resumen', 'BIO', 'SSI']
+
+    summary = list(workbook['Resumen'].iter_rows(values_only=True))
+    ssi = dict(zip(summary[0], summary[2]))
+    assert ssi['Miembros'] == 3
+    assert ssi['Actividades'] == 3
+    assert ssi['Horas Totales'] == 65
+    assert summary[-1][0] == 'TOTAL (2 semilleros)'
+
+    ssi_rows = [row[0] for row in workbook['SSI'].iter_rows(values_only=True)]
+    assert 'MIEMBROS (3)' in ssi_rows
+    assert 'ACTIVIDADES DEL SEMESTRE (3)' in ssi_rows
+
+    buffer, filename = build_scope_excel('faculty', 'Ingeniería', 'semestre-1-2025')
+    assert load_workbook(buffer).sheetnames == ['Resumen', 'SSI']
+    assert filename == 'semilleros_facultad_Ingeniería_semestre-1-2025.xlsx'
+
+    with pytest.raises(ExportError) as error:
+        build_scope_excel('branch', 'Sede Norte', 'semestre-1-2025')
+    assert error.value.status_code == 404
+
+def test_generate_excel_report_streamed_styles(client, setup_database, setup_export_test_data):
+    """Prueba que el libro escrito en una sola pasada conserve estilos, anchos y celdas combinadas"""
+
+    test_data = setup_export_test_data
+    research_hotbed = test_data['research_hotbed']
+    members = get_active_members(research_hotbed.idresearchHotbed)
+    activities = get_activities_by_semester(research_hotbed.idresearchHotbed, 'semestre-1-2025')
+
+    workbook = load_workbook(generate_excel_report(research_hotbed, members, activities, 'semestre-1-2025'))
+
+    info_sheet = workbook['Información General']
+    assert 'A2:B2' in {str(cell_range) for cell_range in info_sheet.merged_cells.ranges}
+    assert info_sheet['A2'].font.bold
+    assert info_sheet.column_dimensions['A'].width > 12
+
+    members_sheet = workbook['Miembros']
+    assert members_sheet['A1'].fill.start_color.rgb.endswith('1F4E79')
+    assert members_sheet['A2'].fill.start_color.rgb.endswith('E8F5E8')
+
+    projects_sheet = workbook['Proyectos']
+    assert projects_sheet['A1'].value == 'Título del Informe'
+    assert projects_sheet['A2'].border.left.style == 'thin'
+
+def test_export_job_lifecycle(app, client, setup_database, setup_export_test_data, tmp_path, monkeypatch):
+    """Prueba una exportación asíncrona: encolar, consultar el estado y descargar el archivo"""
+
+    queue = ExportJobQueue(str(tmp_path), max_workers=1, ttl=60)
+    monkeypatch.setattr('controllers.export.export_jobs_controller.export_jobs', queue)
+
+    test_data = setup_export_test_data
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+    owner_id = test_data['users'][0].iduser
+
+    response, status_code = create_export_job(
+        {'type': 'research_hotbed', 'research_hotbed_id': research_hotbed_id, 'semester': 'semestre-1-2025'},
+        owner_id
+    )
+    assert status_code == 202
+    job_id = response.json['job_id']
+
+    assert queue.wait(job_id, timeout=30)['status'] == 'finished'
+
+    response, status_code = get_export_job(job_id, owner_id)
+    assert status_code == 200
+    assert response.json['progress'] == 1.0
+    assert response.json['filename'] == 'SSI_semestre-1-2025_reporte.xlsx'
+
+    # Solo el usuario que creó el trabajo puede consultarlo
+    _, status_code = get_export_job(job_id, owner_id + 1)
+    assert status_code == 404
+
+    with app.test_request_context():
+        response = download_export_job_file(job_id, owner_id)
+        response.direct_passthrough = False
+        workbook = load_workbook(BytesIO(response.get_data()))
+        response.close()
+    assert 'Información General' in workbook.sheetnames
+
+def test_export_job_errors(client, setup_database, setup_export_test_data, tmp_path, monkeypatch):
+    """Prueba la validación al encolar y el estado de un trabajo que falla"""
+
+    queue = ExportJobQueue(str(tmp_path), max_workers=1, ttl=60)
+    monkeypatch.setattr('controllers.export.export_jobs_controller.export_jobs', queue)
+
+    _, status_code = create_export_job({'type': 'desconocido', 'semester': 'semestre-1-2025'}, 1)
+    assert status_code == 400
+
+    _, status_code = create_export_job({'type': 'users', 'user_ids': [], 'semester': 'semestre-1-2025'}, 1)
+    assert status_code == 400
+
+    response, status_code = create_export_job({'type': 'user', 'user_id': 9999, 'semester': 'semestre-1-2025'}, 1)
+    assert status_code == 202
+    job_id = response.json['job_id']
+
+    job = queue.wait(job_id, timeout=30)
+    assert job['status'] == 'failed'
+    assert job['error'] == "Usuario no encontrado"
+
+    # Al vencer el TTL el trabajo terminado se elimina del spool
+    queue.ttl = 0
+    _, status_code = get_export_job(job_id, 1)
+    assert status_code == 404
+    assert list(tmp_path.iterdir()) == []
+
+def test_export_job_abandoned_jobs_expire(tmp_path):
+    """Prueba que los trabajos en cola o en curso de un worker caído venzan por su fecha de creación"""
+
+    queue = ExportJobQueue(str(tmp_path), max_workers=1, ttl=60)
+    now = time.time()
+    for job_id, status, created_at in [
+        ('a' * 32, 'queued', now - 120),
+        ('b' * 32, 'running', now - 120),
+        ('c' * 32, 'running', now - 10)
+    ]:
+        queue._save({'id': job_id, 'status': status, 'created_at': created_at, 'finished_at': None})
+
+    queue.purge_expired()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{'c' * 32}.json"]
+    assert queue.get('c' * 32)['status'] == 'running'
+
+def test_export_research_hotbed_excel_load_error_not_cached(client, setup_database, setup_export_test_data, monkeypatch):
+    """Prueba que un error al cargar los datos responda 500 sin guardar un reporte vacío en caché"""
+    from controllers.export import excel_export_controller
+    from utils.export_cache import export_file_cache, HOTBED_REPORT
+
+    research_hotbed_id = setup_export_test_data['research_hotbed'].idresearchHotbed
+
+    def failing_select(plan):
+        raise RuntimeError("base de datos no disponible")
+
+    monkeypatch.setattr(excel_export_controller, 'select_activities', failing_select)
+    _, status_code = export_research_hotbed_excel(research_hotbed_id, 'semestre-1-2025')
+
+    assert status_code == 500
+    assert export_file_cache.lookup(HOTBED_REPORT, research_hotbed_id, 'semestre-1-2025') is None
+
+def test_export_user_excel_load_error_not_cached(client, setup_database, setup_export_test_data, monkeypatch):
+    """Prueba que un error al cargar los datos del usuario responda 500 sin guardar un reporte vacío en caché"""
+    from controllers.export import users_pdf_export_controller
+    from utils.export_cache import export_file_cache, USER_REPORT
+
+    user_id = setup_export_test_data['users'][0].iduser
+
+    def failing_select(plan):
+        raise RuntimeError("base de datos no disponible")
+
+    monkeypatch.setattr(users_pdf_export_controller, 'select_activities', failing_select)
+    _, status_code = export_user_excel(user_id, 'semestre-1-2025')
+
+    assert status_code == 500
+    assert export_file_cache.lookup(USER_REPORT, user_id, 'semestre-1-2025') is None
+
+def test_export_research_hotbed_excel_disk_cache(app, client, setup_database, setup_export_test_data):
+    """Prueba que una descarga repetida salga del disco sin consultas y que una escritura la invalide"""
+
+    test_data = setup_export_test_data
+    research_hotbed_id = test_data['research_hotbed'].idresearchHotbed
+
+    response, status_code = export_research_hotbed_excel(research_hotbed_id, 'semestre-1-2025')
+    assert status_code == 200
+    first_file = response.get_data()
+
+    with count_queries() as queries, app.test_request_context():
+        response, status_code = export_research_hotbed_excel(research_hotbed_id, 'semestre-1-2025')
+        response.direct_passthrough = False
+        cached_file = response.get_data()
+        response.close()
+
+    assert status_code == 200
+    assert queries.statements == []
+    assert cached_file == first_file
+    assert 'SSI_semestre-1-2025_reporte.xlsx' in response.headers['Content-Disposition']
+
+    # Eliminar una actividad del semillero invalida el archivo cacheado
+    _, status_code = delete_activity(test_data['activities'][0].idactivitiesResearchHotbed)
+    assert status_code == 200
+
+    response, status_code = export_research_hotbed_excel(research_hotbed_id, 'semestre-1-2025')
+    assert status_code == 200
+    assert response.get_data() != first_file
@@ -0,0 +1,9 @@
+from benchmarks.startup_imports import measure_startup, HEAVY_MODULES
+
+def test_app_startup_does_not_import_export_stack():
+    """Prueba que importar la aplicación no cargue pandas, openpyxl ni reportlab"""
+
+    result = measure_startup()
+
+    assert result['heavy_modules'] == [], f"Cargados al iniciar: {result['heavy_modules']} de {HEAVY_MODULES}"
+    assert result['import_ms'] > 0
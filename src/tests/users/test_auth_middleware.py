@@ -0,0 +1,60 @@
+import time
+import jwt
+import pytest
+from flask import jsonify, request
+from middlewares import auth
+from middlewares.auth import token_required, decode_token
+from utils.cache import get_cache, AUTH_TOKEN_CACHE
+
+SECRET = "clave-de-prueba"
+
+def make_token(seconds=3600, **claims):
+    return jwt.encode({"iduser": 7, "exp": int(time.time()) + seconds, **claims}, SECRET, algorithm="HS256")
+
+def test_token_required_caches_decoded_token(app, client, monkeypatch):
+    """Prueba que un token repetido se verifique una sola vez y se cuenten los aciertos"""
+
+    app.config['SECRET_KEY'] = SECRET
+
+    @app.route('/auth-cache-test')
+    @token_required
+    def auth_cache_test():
+        request.user['modificado'] = True  # No debe alterar la entrada de la caché
+        return jsonify({'iduser': request.user['iduser']})
+
+    decodes = []
+    original_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, 'decode', lambda *args, **kwargs: decodes.append(1) or original_decode(*args, **kwargs))
+
+    headers = {'Authorization': f"Bearer {make_token()}"}
+    for _ in range(3):
+        response = client.get('/auth-cache-test', headers=headers)
+        assert response.status_code == 200
+        assert response.json == {'iduser': 7}
+
+    assert len(decodes) == 1
+    stats = get_cache(AUTH_TOKEN_CACHE).stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+    # Un token inválido no se guarda y sigue respondiendo 401
+    response = client.get('/auth-cache-test', headers={'Authorization': "Bearer no-es-un-token"})
+    assert response.status_code == 401
+    assert get_cache(AUTH_TOKEN_CACHE).stats()['size'] == 1
+
+def test_cached_token_expires_with_exp(app, monkeypatch):
+    """Prueba que una entrada de la caché no se use después del 'exp' del token"""
+
+    token = make_token(seconds=60)
+    assert decode_token(token, SECRET)['iduser'] == 7
+
+    # El reloj avanza más allá del 'exp' del token
+    now = time.time()
+    monkeypatch.setattr(auth.time, 'time', lambda: now + 120)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_token(token, SECRET)
+
+    # La misma cadena con otra clave no reutiliza la entrada
+    with pytest.raises(jwt.InvalidSignatureError):
+        decode_token(token, "otra-clave")
@@ -0,0 +1,207 @@
+import pytest
+from datetime import datetime, date, timedelta
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.users import User
+from models.users_research_hotbed import UsersResearchHotbed
+from models.research_hotbed import ResearchHotbed
+from controllers.users.get_user_activities_controller import get_user_activities
+from db.connection import db
+
+@pytest.fixture
+def setup_user_activities():
+    """Fixture con dos miembros de un semillero y actividades creadas por cada uno"""
+
+    research_hotbed = ResearchHotbed(
+        name_researchHotbed="Semillero de Perfiles",
+        acronym_researchHotbed="SPF",
+        faculty_researchHotbed="Ingeniería",
+        universityBranch_researchHotbed="Principal",
+        status_researchHotbed="Activo",
+        dateCreation_researchHotbed=datetime.now()
+    )
+    db.session.add(research_hotbed)
+    db.session.flush()
+
+    users = []
+    members = []
+    for index, name in enumerate(["Sofía Ruiz", "Pedro Gil"]):
+        user = User(
+            name_user=name,
+            email_user=f"perfil{index}@test.com",
+            password_user="hashed_password",
+            idSigaa_user=f"perfil-{index}",
+            type_user="Estudiante",
+            status_user="Activo",
+            academicProgram_user="Ingeniería de Sistemas",
+            termsAccepted_user=True,
+            termsAcceptedAt_user=datetime.now(),
+            termsVersion_user="1.0"
+        )
+        db.session.add(user)
+        db.session.flush()
+        users.append(user)
+
+        member = UsersResearchHotbed(
+            user_iduser=user.iduser,
+            researchHotbed_idresearchHotbed=research_hotbed.idresearchHotbed,
+            TypeUser_usersResearchHotbed="Estudiante",
+            status_usersResearchHotbed="Activo",
+            dateEnter_usersResearchHotbed=date.today()
+        )
+        db.session.add(member)
+        db.session.flush()
+        members.append(member)
+
+    def add_activity(title, activity_date, creator, authors):
+        activity = ActivitiesResearchHotbed(
+            title_activitiesResearchHotbed=title,
+            responsible_activitiesResearchHotbed="Sofía Ruiz",
+            date_activitiesResearchHotbed=activity_date,
+            description_activitiesResearchHotbed="Descripción",
+            type_activitiesResearchHotbed="actividad",
+            duration_activitiesResearchHotbed=3,
+            semester="semestre-1-2025",
+            usersResearchHotbed_idusersResearchHotbed=creator.idusersResearchHotbed
+        )
+        db.session.add(activity)
+        db.session.flush()
+        for member, is_main in authors:
+            db.session.add(ActivityAuthors(
+                activity_id=activity.idactivitiesResearchHotbed,
+                user_research_hotbed_id=member.idusersResearchHotbed,
+                is_main_author=is_main
+            ))
+        return activity
+
+    # Creada y firmada por Sofía (aparece por ambas vías, debe salir una sola vez)
+    add_activity("Taller inicial", date(2025, 2, 10), members[0], [(members[0], True)])
+    # Creada por Pedro con Sofía como co-autora
+    add_activity("Ponencia", date(2025, 4, 5), members[1], [(members[1], True), (members[0], False)])
+    # Creada por Sofía sin autoría registrada
+    add_activity("Reunión", date(2025, 3, 1), members[0], [])
+    # Actividad ajena a Sofía
+    add_activity("Ajena", date(2025, 5, 1), members[1], [(members[1], True)])
+
+    db.session.commit()
+
+    return {'users': users, 'members': members}
+
+def test_get_user_activities_union_and_order(client, setup_database, setup_user_activities):
+    """Prueba que se combinen actividades creadas y firmadas, sin duplicados y por fecha descendente"""
+
+    user = setup_user_activities['users'][0]
+
+    response, status_code = get_user_activities(user.iduser)
+
+    assert status_code == 200
+    titles = [activity['title'] for activity in response.json['activities']]
+    assert titles == ["Ponencia", "Reunión", "Taller inicial"]
+
+def test_get_user_activities_roles_and_authors(client, setup_database, setup_user_activities):
+    """Prueba el rol del usuario, el responsable y los autores de cada actividad"""
+
+    user = setup_user_activities['users'][0]
+
+    response, status_code = get_user_activities(user.iduser)
+    activities = {activity['title']: activity for activity in response.json['activities']}
+
+    assert status_code == 200
+    assert activities["Taller inicial"]['user_role'] == "Autor Principal"
+    assert activities["Ponencia"]['user_role'] == "Co-autor"
+    assert activities["Reunión"]['user_role'] == "Responsable"
+
+    assert activities["Ponencia"]['responsible'] == "Pedro Gil"
+    assert activities["Ponencia"]['main_authors'] == ["Pedro Gil"]
+    assert activities["Ponencia"]['co_authors'] == ["Sofía Ruiz"]
+    assert activities["Ponencia"]['research_hotbed_name'] == "Semillero de Perfiles"
+
+def test_get_user_activities_empty(client, setup_database):
+    """Prueba la respuesta para un usuario sin actividades"""
+
+    response, status_code = get_user_activities(9999)
+
+    assert status_code == 200
+    assert response.json == {"activities": []}
+
+def test_get_user_activities_cursor_pagination(client, setup_database, setup_user_activities):
+    """Prueba que el cursor recorra todas las páginas sin repetir actividades"""
+
+    user = setup_user_activities['users'][0]
+
+    response, status_code = get_user_activities(user.iduser, limit="2")
+    first_page = response.json
+
+    assert status_code == 200
+    assert [activity['title'] for activity in first_page['activities']] == ["Ponencia", "Reunión"]
+    assert first_page['next_cursor']
+
+    response, status_code = get_user_activities(user.iduser, limit="2", cursor=first_page['next_cursor'])
+    second_page = response.json
+
+    assert status_code == 200
+    assert [activity['title'] for activity in second_page['activities']] == ["Taller inicial"]
+    assert second_page['next_cursor'] is None
+
+def test_get_user_activities_query_budget(client, setup_database, setup_user_activities, max_queries):
+    """Prueba que el listado de un usuario con 500 actividades use como máximo 6 consultas"""
+
+    user = setup_user_activities['users'][0]
+    members = setup_user_activities['members']
+
+    # Actividades de Pedro con Sofía como co-autora
+    for index in range(500):
+        activity = ActivitiesResearchHotbed(
+            title_activitiesResearchHotbed=f"Actividad {index}",
+            responsible_activitiesResearchHotbed="Pedro Gil",
+            date_activitiesResearchHotbed=date(2025, 1, 1) + timedelta(days=index % 150),
+            description_activitiesResearchHotbed="Descripción",
+            type_activitiesResearchHotbed="actividad",
+            duration_activitiesResearchHotbed=1,
+            semester="semestre-1-2025",
+            usersResearchHotbed_idusersResearchHotbed=members[1].idusersResearchHotbed
+        )
+        db.session.add(activity)
+        db.session.flush()
+        db.session.add(ActivityAuthors(
+            activity_id=activity.idactivitiesResearchHotbed,
+            user_research_hotbed_id=members[0].idusersResearchHotbed,
+            is_main_author=False
+        ))
+    db.session.commit()
+    db.session.expire_all()
+
+    with max_queries(6):
+        response, status_code = get_user_activities(user.iduser)
+
+    assert status_code == 200
+    assert len(response.json['activities']) == 503
+
+def test_get_user_activities_invalid_page_params(client, setup_database, setup_user_activities):
+    """Prueba que un límite o cursor inválidos respondan 400"""
+
+    user = setup_user_activities['users'][0]
+
+    _, status_code = get_user_activities(user.iduser, limit="0")
+    assert status_code == 400
+
+    _, status_code = get_user_activities(user.iduser, limit="2", cursor="no-es-un-cursor")
+    assert status_code == 400
+
+def test_get_user_activities_sql_filters(client, setup_database, setup_user_activities):
+    """Prueba los filtros por rango de fechas, semestre y aprobación"""
+
+    user = setup_user_activities['users'][0]
+
+    response, status_code = get_user_activities(user.iduser, filters={'date_from': "2025-03-01", 'date_to': "2025-04-30"})
+    assert status_code == 200
+    assert [activity['title'] for activity in response.json['activities']] == ["Ponencia", "Reunión"]
+
+    response, _ = get_user_activities(user.iduser, filters={'semester': "semestre-2-2025"})
+    assert response.json['activities'] == []
+
+    response, _ = get_user_activities(user.iduser, filters={'approved': "false", 'type': "actividad"})
+    assert len(response.json['activities']) == 3
+
+    _, status_code = get_user_activities(user.iduser, filters={'semester': "2025-1"})
+    assert status_code == 400
@@ -6,6 +6,9 @@ from datetime import datetime, UTC
 import pytz
 from models.users import User
 from controllers.users.login_controller import login_user
+from utils.last_login import flush_last_logins, last_login_buffer
+from utils.inactive_users import mark_inactive_users
+from utils.query_stats import count_queries
 from db.connection import db
 
 # Función auxiliar para generar un hash de contraseña (simulando el almacenamiento en la BD)
@@ -47,7 +50,12 @@ def test_login_success(client, setup_database):
     assert response["message"] == "Inicio de sesión exitoso"
     assert "token" in response  # Verifica que el token JWT se genera correctamente
 
+    # La fecha queda pendiente en memoria hasta la escritura en bloque
+    assert user.iduser in last_login_buffer.pending()
+    assert flush_last_logins() == 1
+
     # Verificar que la última fecha de inicio de sesión se haya actualizado
+    db.session.expire_all()
     updated_user = User.query.filter_by(email_user="test@example.com").first()
     assert updated_user.lastDayLogin_user is not None
 
@@ -103,3 +111,74 @@ def test_login_missing_fields(client, setup_database, login_data, expected_messa
 
     assert status_code == 400
     assert response["message"] == expected_message
+
+# Test para la escritura diferida de la fecha del último login
+def test_login_batches_last_login_writes(client, setup_database):
+    users = []
+    for index in range(3):
+        user = User(
+            email_user=f"batch{index}@example.com",
+            password_user=hash_password("SecurePassword123"),
+            idSigaa_user=f"batch-{index}",
+            name_user=f"Batch User {index}",
+            status_user="active",
+            type_user="student",
+            academicProgram_user="Computer Science",
+            termsAccepted_user=True,
+            termsAcceptedAt_user=datetime.now(UTC),
+            termsVersion_user="1.0",
+            lastDayLogin_user=datetime(2020, 1, 1)
+        )
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+
+    # El login no escribe en la base
+    with count_queries() as login_queries:
+        for user in users:
+            _, status_code = login_user({"email_user": user.email_user, "password_user": "SecurePassword123"})
+            assert status_code == 200
+    assert not any(statement.lstrip().upper().startswith("UPDATE") for statement in login_queries.statements)
+
+    # mark_inactive_users escribe antes los logins pendientes en un solo UPDATE
+    with count_queries() as flush_queries:
+        mark_inactive_users()
+
+    updates = [statement for statement in flush_queries.statements if statement.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1
+    assert last_login_buffer.pending() == {}
+
+    db.session.expire_all()
+    for user in User.query.filter(User.email_user.like("batch%")).all():
+        assert user.lastDayLogin_user.year >= 2025
+        assert user.status_user == "active"
+
+# Test: si la escritura en bloque falla, el login responde igual y la fecha queda pendiente
+def test_login_succeeds_when_last_login_flush_fails(client, setup_database, monkeypatch):
+    user = User(
+        email_user="flush@example.com",
+        password_user=hash_password("SecurePassword123"),
+        idSigaa_user="flush-1",
+        name_user="Flush User",
+        status_user="active",
+        type_user="student",
+        academicProgram_user="Computer Science",
+        termsAccepted_user=True,
+        termsAcceptedAt_user=datetime.now(UTC),
+        termsVersion_user="1.0"
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    def failing_commit():
+        raise RuntimeError("base de datos no disponible")
+
+    # Buffer lleno con un solo login: el propio login intenta la escritura
+    monkeypatch.setattr(last_login_buffer, 'max_pending', 1)
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+
+    response, status_code = login_user({"email_user": "flush@example.com", "password_user": "SecurePassword123"})
+
+    assert status_code == 200
+    assert "token" in response
+    assert user.iduser in last_login_buffer.pending()
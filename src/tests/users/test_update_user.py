@@ -137,3 +137,30 @@ def test_update_user_db_error(client, setup_database, mocker):
     # Verificar que la respuesta sea la esperada (error en la base de datos)
     assert response[1] == 500  # Estado 500 (error interno del servidor)
     assert "Error al actualizar el usuario" in response[0]['message']
+
+# Test: un fallo al invalidar las cachés no revierte ni reporta como error un cambio ya guardado
+def test_update_user_cache_invalidation_failure(client, setup_database, monkeypatch):
+    user = User(
+        email_user='cache@example.com',
+        password_user='password',
+        idSigaa_user='54321',
+        name_user='Cache User',
+        status_user='active',
+        type_user='student',
+        academicProgram_user='Computer Science',
+        termsAccepted_user=True,
+        termsAcceptedAt_user=datetime.now(UTC),
+        termsVersion_user='1.0'
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    def failing_invalidation(user_id):
+        raise RuntimeError("cache no disponible")
+
+    monkeypatch.setattr('controllers.users.update_user.invalidate_user_activities', failing_invalidation)
+
+    response = update_user(user.iduser, {'name_user': 'Renamed User'})
+
+    assert response[1] == 200
+    assert db.session.get(User, user.iduser).name_user == 'Renamed User'
@@ -0,0 +1,42 @@
+from flask import jsonify
+from models.users import User
+from utils.query_stats import init_query_stats, count_queries, QUERY_COUNT_HEADER
+from db.connection import db
+
+def test_query_stats_headers(app, client, setup_database):
+    """Prueba que con QUERY_STATS activo la respuesta incluya el conteo y el tiempo de las consultas"""
+
+    app.config['QUERY_STATS'] = True
+    init_query_stats(app)
+
+    @app.route('/query-stats-test')
+    def query_stats_test():
+        User.query.count()
+        User.query.filter_by(email_user='nadie@test.com').first()
+        return jsonify({'ok': True})
+
+    with count_queries() as outer:
+        response = client.get('/query-stats-test')
+
+    assert response.status_code == 200
+    assert response.headers[QUERY_COUNT_HEADER] == '2'
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    assert 'desc="2 consultas"' in response.headers['Server-Timing']
+    # Los contadores se pueden anidar
+    assert outer.count == 2
+
+def test_query_stats_disabled_by_default(app, client, setup_database, monkeypatch):
+    """Prueba que sin QUERY_STATS no se agreguen los headers"""
+
+    monkeypatch.delenv('QUERY_STATS', raising=False)
+    init_query_stats(app)
+
+    @app.route('/query-stats-off')
+    def query_stats_off():
+        db.session.execute(db.select(User)).all()
+        return jsonify({'ok': True})
+
+    response = client.get('/query-stats-off')
+
+    assert response.status_code == 200
+    assert QUERY_COUNT_HEADER not in response.headers
@@ -0,0 +1,49 @@
+from sqlalchemy import select, union
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+from utils.cache import get_cache, ACTIVITY_DETAIL_CACHE
+
+# Invalidación de la caché de detalle de actividades.
+# Las entradas se etiquetan con 'activity:<id>'; los cambios de autores, de
+# membresías o de datos de usuario invalidan las actividades que los muestran.
+# Se invalida después del commit; una lectura que consultó la base antes del
+# commit no vuelve a guardar los datos anteriores porque guarda con la
+# generación de la etiqueta tomada antes de la consulta (ver utils/cache.py).
+
+def activity_detail_cache():
+    return get_cache(ACTIVITY_DETAIL_CACHE)
+
+def activity_tag(activity_id):
+    return f"activity:{activity_id}"
+
+def invalidate_activity_details(activity_ids):
+    """Elimina de la caché el detalle de las actividades indicadas"""
+    activity_detail_cache().invalidate_tags([activity_tag(activity_id) for activity_id in activity_ids])
+
+def member_activity_ids(member_ids):
+    """Actividades creadas o escritas por los miembros (usuario-semillero) indicados"""
+    member_ids = list(member_ids)
+    if not member_ids:
+        return []
+
+    return db.session.execute(union(
+        select(ActivitiesResearchHotbed.idactivitiesResearchHotbed).where(
+            ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed.in_(member_ids)
+        ),
+        select(ActivityAuthors.activity_id).where(
+            ActivityAuthors.user_research_hotbed_id.in_(member_ids)
+        )
+    )).scalars().all()
+
+def invalidate_member_activities(member_ids):
+    """Invalida el detalle de las actividades que dependen de una membresía"""
+    invalidate_activity_details(member_activity_ids(member_ids))
+
+def invalidate_user_activities(user_id):
+    """Invalida el detalle de las actividades de todas las membresías de un usuario"""
+    member_ids = db.session.execute(
+        select(UsersResearchHotbed.idusersResearchHotbed).where(UsersResearchHotbed.user_iduser == user_id)
+    ).scalars().all()
+    invalidate_member_activities(member_ids)
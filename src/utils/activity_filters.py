@@ -0,0 +1,80 @@
+from datetime import date
+from sqlalchemy import and_, or_
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from utils.semester_utils import is_valid_semester
+
+# Filtros de los listados de actividades. Se traducen a condiciones WHERE para
+# que la base de datos (con sus índices) descarte las filas, en lugar de enviar
+# el listado completo al frontend.
+
+TRUE_VALUES = ('true', '1', 'si', 'sí')
+FALSE_VALUES = ('false', '0', 'no')
+
+def _parse_date(value, param):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"El parámetro '{param}' debe tener el formato AAAA-MM-DD")
+
+def parse_activity_filters(args):
+    """
+    Valida los filtros recibidos en la URL (request.args o dict).
+    Devuelve un dict solo con los filtros presentes.
+    """
+    filters = {}
+
+    semester = args.get('semester')
+    if semester:
+        if not is_valid_semester(semester):
+            raise ValueError(f"Semestre inválido: {semester}")
+        filters['semester'] = semester
+
+    activity_type = args.get('type')
+    if activity_type:
+        filters['type'] = activity_type
+
+    if args.get('date_from'):
+        filters['date_from'] = _parse_date(args.get('date_from'), 'date_from')
+
+    if args.get('date_to'):
+        filters['date_to'] = _parse_date(args.get('date_to'), 'date_to')
+
+    if 'date_from' in filters and 'date_to' in filters and filters['date_from'] > filters['date_to']:
+        raise ValueError("'date_from' no puede ser posterior a 'date_to'")
+
+    approved = args.get('approved')
+    if approved:
+        approved = approved.lower()
+        if approved not in TRUE_VALUES + FALSE_VALUES:
+            raise ValueError("El parámetro 'approved' debe ser true o false")
+        filters['approved'] = approved in TRUE_VALUES
+
+    return filters
+
+def apply_activity_filters(stmt, filters):
+    """Agrega a la consulta las condiciones WHERE de los filtros indicados"""
+    if not filters:
+        return stmt
+
+    if 'semester' in filters:
+        stmt = stmt.where(ActivitiesResearchHotbed.semester == filters['semester'])
+
+    if 'type' in filters:
+        stmt = stmt.where(ActivitiesResearchHotbed.type_activitiesResearchHotbed == filters['type'])
+
+    if 'date_from' in filters:
+        stmt = stmt.where(ActivitiesResearchHotbed.date_activitiesResearchHotbed >= filters['date_from'])
+
+    if 'date_to' in filters:
+        stmt = stmt.where(ActivitiesResearchHotbed.date_activitiesResearchHotbed <= filters['date_to'])
+
+    if 'approved' in filters:
+        # Misma regla que los totales (utils/activity_stats.py): una actividad
+        # está aprobada cuando tiene horas libres aprobadas distintas de cero
+        approved_hours = ActivitiesResearchHotbed.approvedFreeHours_activitiesResearchHotbed
+        if filters['approved']:
+            stmt = stmt.where(and_(approved_hours.isnot(None), approved_hours != 0))
+        else:
+            stmt = stmt.where(or_(approved_hours.is_(None), approved_hours == 0))
+
+    return stmt
@@ -0,0 +1,119 @@
+from sqlalchemy import select, union
+from sqlalchemy.orm import selectinload, joinedload
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.users_research_hotbed import UsersResearchHotbed
+
+# Presets de carga para las relaciones de las actividades cuando se trabaja con
+# objetos del ORM (escrituras y procesos que modifican actividades): una consulta
+# por tabla relacionada (selectinload) para varias actividades y JOINs
+# (joinedload) para una sola. Las rutas de solo lectura usan
+# utils/activity_serializer.py, que proyecta columnas sin hidratar objetos.
+
+def _authors_chain(loader):
+    """Autores -> usuario en semillero -> usuario"""
+    return loader(ActivitiesResearchHotbed.authors)\
+        .joinedload(ActivityAuthors.user_research_hotbed)\
+        .joinedload(UsersResearchHotbed.user)
+
+def _creator_hotbed(loader):
+    """Usuario creador -> semillero (para el nombre del semillero)"""
+    return loader(ActivitiesResearchHotbed.creator).joinedload(UsersResearchHotbed.researchHotbed)
+
+def _creator_user(loader):
+    """Usuario creador -> usuario (para el nombre del responsable)"""
+    return loader(ActivitiesResearchHotbed.creator).joinedload(UsersResearchHotbed.user)
+
+# Cada preset agrupa sus cargas con un nombre, para poder pedir solo algunas
+ACTIVITY_LOADER_PRESETS = {
+    'listing': {
+        'authors': lambda: _authors_chain(selectinload),
+        'creator_user': lambda: _creator_user(joinedload),
+        'creator_hotbed': lambda: _creator_hotbed(joinedload),
+        'project': lambda: selectinload(ActivitiesResearchHotbed.project),
+        'product': lambda: selectinload(ActivitiesResearchHotbed.product),
+        'recognition': lambda: selectinload(ActivitiesResearchHotbed.recognition)
+    },
+    'detail': {
+        'authors': lambda: _authors_chain(selectinload),
+        'project': lambda: joinedload(ActivitiesResearchHotbed.project),
+        'product': lambda: joinedload(ActivitiesResearchHotbed.product),
+        'recognition': lambda: joinedload(ActivitiesResearchHotbed.recognition)
+    },
+    'export': {
+        'authors': lambda: _authors_chain(selectinload),
+        'creator_hotbed': lambda: _creator_hotbed(joinedload),
+        'project': lambda: selectinload(ActivitiesResearchHotbed.project),
+        'product': lambda: selectinload(ActivitiesResearchHotbed.product),
+        'recognition': lambda: selectinload(ActivitiesResearchHotbed.recognition)
+    }
+}
+
+# Entidades asociadas de una actividad (proyecto, producto, reconocimiento)
+ACTIVITY_ENTITY_LOADS = {'project', 'product', 'recognition'}
+
+def activity_loader_options(preset, only=None):
+    """
+    Devuelve las opciones de carga del preset indicado ('listing', 'detail' o 'export').
+    Con 'only' se limitan a las cargas nombradas (ej. {'authors', 'project'}).
+    Uso: query.options(*activity_loader_options('listing'))
+    """
+    if preset not in ACTIVITY_LOADER_PRESETS:
+        raise ValueError(f"Preset de carga desconocido: {preset}")
+
+    return [
+        loader() for name, loader in ACTIVITY_LOADER_PRESETS[preset].items()
+        if only is None or name in only
+    ]
+
+# Consultas de los IDs de actividades de uno o varios usuarios (como creador
+# directo o como autor/co-autor), reutilizadas por los listados, los reportes
+# y las versiones de los listados.
+
+def user_activity_ids_query(user_id):
+    """
+    Construye el UNION (sin duplicados) de las actividades donde el usuario es
+    creador directo o aparece como autor/co-autor.
+    """
+    direct_activities = select(
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    ).where(
+        UsersResearchHotbed.user_iduser == user_id
+    )
+
+    authored_activities = select(
+        ActivityAuthors.activity_id.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    ).where(
+        UsersResearchHotbed.user_iduser == user_id
+    )
+
+    return union(direct_activities, authored_activities).subquery()
+
+def users_activity_ids_query(user_ids):
+    """
+    Igual que user_activity_ids_query pero para varios usuarios a la vez:
+    UNION (sin duplicados) de pares (user_id, activity_id).
+    """
+    direct_activities = select(
+        UsersResearchHotbed.user_iduser.label('user_id'),
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    ).where(
+        UsersResearchHotbed.user_iduser.in_(user_ids)
+    )
+
+    authored_activities = select(
+        UsersResearchHotbed.user_iduser.label('user_id'),
+        ActivityAuthors.activity_id.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    ).where(
+        UsersResearchHotbed.user_iduser.in_(user_ids)
+    )
+
+    return union(direct_activities, authored_activities).subquery()
@@ -0,0 +1,449 @@
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.projects_researchHotbed import ProjectsResearchHotbed
+from models.products_researchHotbed import ProductsResearchHotbed
+from models.recognitions_researchHotbed import RecognitionsResearchHotbed
+from models.research_hotbed import ResearchHotbed
+from models.users import User
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+
+# Serializador único de actividades para las rutas de solo lectura.
+# Trabaja sobre filas (Row) de un SELECT que proyecta únicamente las columnas
+# necesarias, sin hidratar objetos del ORM. Cada perfil (listado del semillero,
+# listado del usuario, detalle, exportaciones) declara sus campos y formatos una
+# sola vez; el plan de columnas, JOINs y formateadores de cada combinación de
+# perfil y campos se arma una vez y queda en caché.
+
+Activity = ActivitiesResearchHotbed
+
+creator = aliased(UsersResearchHotbed, name='creator')
+creator_user = aliased(User, name='creator_user')
+creator_hotbed = aliased(ResearchHotbed, name='creator_hotbed')
+
+# JOINs disponibles (LEFT OUTER): nombre -> (destino, condición, JOIN previo requerido)
+JOINS = {
+    'creator': (creator, Activity.usersResearchHotbed_idusersResearchHotbed == creator.idusersResearchHotbed, None),
+    'creator_user': (creator_user, creator.user_iduser == creator_user.iduser, 'creator'),
+    'creator_hotbed': (creator_hotbed, creator.researchHotbed_idresearchHotbed == creator_hotbed.idresearchHotbed, 'creator'),
+    'project': (ProjectsResearchHotbed, Activity.projectsResearchHotbed_idprojectsResearchHotbed == ProjectsResearchHotbed.idprojectsResearchHotbed, None),
+    'product': (ProductsResearchHotbed, Activity.productsResearchHotbed_idproductsResearchHotbed == ProductsResearchHotbed.idproductsResearchHotbed, None),
+    'recognition': (RecognitionsResearchHotbed, Activity.recognitionsResearchHotbed_idrecognitionsResearchHotbed == RecognitionsResearchHotbed.idrecognitionsResearchHotbed, None)
+}
+
+JOIN_ORDER = ('creator', 'creator_user', 'creator_hotbed', 'project', 'product', 'recognition')
+
+# Columnas que se pueden proyectar: etiqueta -> (columna, JOIN requerido)
+COLUMNS = {column.key: (getattr(Activity, column.key), None) for column in Activity.__table__.columns}
+COLUMNS.update({
+    'creator_user_name': (creator_user.name_user, 'creator_user'),
+    'research_hotbed_name': (creator_hotbed.name_researchHotbed, 'creator_hotbed'),
+    'project_id': (ProjectsResearchHotbed.idprojectsResearchHotbed, 'project'),
+    'project_name': (ProjectsResearchHotbed.name_projectsResearchHotbed, 'project'),
+    'project_reference_number': (ProjectsResearchHotbed.referenceNumber_projectsResearchHotbed, 'project'),
+    'project_start_date': (ProjectsResearchHotbed.startDate_projectsResearchHotbed, 'project'),
+    'project_end_date': (ProjectsResearchHotbed.endDate_projectsResearchHotbed, 'project'),
+    'project_principal_researcher': (ProjectsResearchHotbed.principalResearcher_projectsResearchHotbed, 'project'),
+    'project_co_researchers': (ProjectsResearchHotbed.coResearchers_projectsResearchHotbed, 'project'),
+    'product_id': (ProductsResearchHotbed.idproductsResearchHotbed, 'product'),
+    'product_category': (ProductsResearchHotbed.category_productsResearchHotbed, 'product'),
+    'product_type': (ProductsResearchHotbed.type_productsResearchHotbed, 'product'),
+    'product_description': (ProductsResearchHotbed.description_productsResearchHotbed, 'product'),
+    'product_date_publication': (ProductsResearchHotbed.datePublication_productsResearchHotbed, 'product'),
+    'recognition_id': (RecognitionsResearchHotbed.idrecognitionsResearchHotbed, 'recognition'),
+    'recognition_name': (RecognitionsResearchHotbed.name_recognitionsResearchHotbed, 'recognition'),
+    'recognition_project_name': (RecognitionsResearchHotbed.projectName_recognitionsResearchHotbed, 'recognition'),
+    'recognition_participants_names': (RecognitionsResearchHotbed.participantsNames_recognitionsResearchHotbed, 'recognition'),
+    'recognition_organization_name': (RecognitionsResearchHotbed.organizationName_recognitionsResearchHotbed, 'recognition')
+})
+
+# Columnas que siempre se proyectan (identificador y clave de orden/paginación)
+KEY_COLUMNS = ('idactivitiesResearchHotbed', 'date_activitiesResearchHotbed')
+
+# FORMATEADORES
+# Cada formateador recibe (fila, contexto) y declara en .columns las etiquetas
+# que lee, para que el plan proyecte solo esas columnas.
+
+def _uses(*labels):
+    def wrap(format_value):
+        format_value.columns = labels
+        return format_value
+    return wrap
+
+def raw(label):
+    get = attrgetter(label)
+    return _uses(label)(lambda row, context: get(row))
+
+def raw_or(label, default):
+    get = attrgetter(label)
+    return _uses(label)(lambda row, context: get(row) or default)
+
+def as_bool(label):
+    get = attrgetter(label)
+    return _uses(label)(lambda row, context: bool(get(row)))
+
+def iso_date(label, default=None):
+    get = attrgetter(label)
+
+    @_uses(label)
+    def format_value(row, context):
+        value = get(row)
+        return value.isoformat() if value else default
+    return format_value
+
+def hour(label, default=None):
+    get = attrgetter(label)
+
+    @_uses(label)
+    def format_value(row, context):
+        value = get(row)
+        return value.strftime('%H:%M') if value else default
+    return format_value
+
+def block(presence_label, subfields, activity_type=None):
+    """
+    Bloque anidado (proyecto, producto, reconocimiento). Devuelve None si la
+    entidad no existe o, con activity_type, si la actividad es de otro tipo.
+    """
+    present = attrgetter(presence_label)
+    formatters = tuple(subfields.items())
+    labels = {presence_label}
+    for _, format_value in formatters:
+        labels.update(format_value.columns)
+    if activity_type:
+        labels.add('type_activitiesResearchHotbed')
+
+    @_uses(*sorted(labels))
+    def format_value(row, context):
+        if present(row) is None:
+            return None
+        if activity_type and (row.type_activitiesResearchHotbed or '').lower() != activity_type:
+            return None
+        return {key: format_sub(row, context) for key, format_sub in formatters}
+    return format_value
+
+# Formateadores de autores (las filas de autores se cargan aparte, en bloque)
+
+@_uses()
+def main_author_names(row, context):
+    return [author.name_user for author in context['authors'] if author.is_main_author]
+
+@_uses()
+def co_author_names(row, context):
+    return [author.name_user for author in context['authors'] if not author.is_main_author]
+
+@_uses()
+def author_names(row, context):
+    return {
+        'main_authors': main_author_names(row, context),
+        'co_authors': co_author_names(row, context)
+    }
+
+def author_details(main_author):
+    @_uses()
+    def format_value(row, context):
+        return [
+            {
+                "id": author.member_id,
+                "name": author.name_user,
+                "email": author.email_user,
+                "type": author.member_type
+            }
+            for author in context['authors'] if bool(author.is_main_author) == main_author
+        ]
+    return format_value
+
+@_uses()
+def user_role(row, context):
+    """Rol del usuario del contexto en la actividad"""
+    role = "Responsable"  # Rol por defecto
+    for author in context['authors']:
+        if author.user_iduser == context['user_id']:
+            role = "Autor Principal" if author.is_main_author else "Co-autor"
+    return role
+
+# PERFILES
+# Campo -> (formateador, necesita autores, se omite si es None)
+
+FieldSpec = namedtuple('FieldSpec', ['format', 'authors', 'optional'])
+
+def field(format_value, authors=False, optional=False):
+    return FieldSpec(format_value, authors, optional)
+
+def _project_block(date_default=None, activity_type=None, co_researchers=False):
+    subfields = {
+        'name': raw('project_name'),
+        'reference_number': raw('project_reference_number'),
+        'start_date': iso_date('project_start_date', date_default),
+        'end_date': iso_date('project_end_date', date_default),
+        'principal_researcher': raw('project_principal_researcher')
+    }
+    if co_researchers:
+        subfields['co_researchers'] = raw('project_co_researchers')
+    return block('project_id', subfields, activity_type)
+
+def _product_block(date_default=None, activity_type=None):
+    return block('product_id', {
+        'category': raw('product_category'),
+        'type': raw('product_type'),
+        'description': raw('product_description'),
+        'date_publication': iso_date('product_date_publication', date_default)
+    }, activity_type)
+
+def _recognition_block(activity_type=None):
+    return block('recognition_id', {
+        'name': raw('recognition_name'),
+        'project_name': raw('recognition_project_name'),
+        'participants_names': raw('recognition_participants_names'),
+        'organization_name': raw('recognition_organization_name')
+    }, activity_type)
+
+# Listado de actividades del semillero
+HOTBED_LISTING_FIELDS = {
+    'activity_id': field(raw('idactivitiesResearchHotbed')),
+    'title': field(raw('title_activitiesResearchHotbed')),
+    'responsible': field(raw('responsible_activitiesResearchHotbed')),  # Ya es el primer autor seleccionado
+    'date': field(iso_date('date_activitiesResearchHotbed')),
+    'description': field(raw('description_activitiesResearchHotbed')),
+    'type': field(raw('type_activitiesResearchHotbed')),
+    'start_time': field(hour('startTime_activitiesResearchHotbed')),
+    'end_time': field(hour('endTime_activitiesResearchHotbed')),
+    'duration': field(raw('duration_activitiesResearchHotbed')),
+    'approved_free_hours': field(as_bool('approvedFreeHours_activitiesResearchHotbed')),
+    'semester': field(raw('semester')),
+    'research_hotbed_name': field(raw_or('research_hotbed_name', '')),
+    # CRÍTICO: Autores y co-autores SOLO de la tabla activity_authors
+    'main_authors': field(main_author_names, authors=True),
+    'co_authors': field(co_author_names, authors=True),
+    # Información adicional (solo se incluye si existe)
+    'project': field(_project_block(), optional=True),
+    'product': field(_product_block(), optional=True),
+    'recognition': field(_recognition_block(), optional=True)
+}
+
+# Listado de actividades del usuario (creadas o firmadas)
+USER_LISTING_FIELDS = {
+    'activity_id': field(raw('idactivitiesResearchHotbed')),
+    'title': field(raw('title_activitiesResearchHotbed')),
+    'responsible': field(raw_or('creator_user_name', "Usuario no encontrado")),
+    'date': field(iso_date('date_activitiesResearchHotbed')),
+    'description': field(raw('description_activitiesResearchHotbed')),
+    'type': field(raw('type_activitiesResearchHotbed')),
+    'start_time': field(hour('startTime_activitiesResearchHotbed')),
+    'end_time': field(hour('endTime_activitiesResearchHotbed')),
+    'duration': field(raw('duration_activitiesResearchHotbed')),
+    'approved_free_hours': field(raw('approvedFreeHours_activitiesResearchHotbed')),
+    'main_authors': field(main_author_names, authors=True),
+    'co_authors': field(co_author_names, authors=True),
+    'research_hotbed_name': field(raw_or('research_hotbed_name', "Semillero no encontrado")),
+    'user_role': field(user_role, authors=True),  # Rol del usuario en esta actividad
+    # Datos relacionados según el tipo (proyecto, producto, reconocimiento)
+    'project': field(_project_block(activity_type='proyecto', co_researchers=True), optional=True),
+    'product': field(_product_block(activity_type='producto'), optional=True),
+    'recognition': field(_recognition_block(activity_type='reconocimiento'), optional=True)
+}
+
+# Detalle de una actividad
+DETAIL_FIELDS = {
+    'id': field(raw('idactivitiesResearchHotbed')),
+    'title': field(raw('title_activitiesResearchHotbed')),
+    'responsible': field(raw('responsible_activitiesResearchHotbed')),
+    'date': field(iso_date('date_activitiesResearchHotbed')),
+    'description': field(raw('description_activitiesResearchHotbed')),
+    'type': field(raw('type_activitiesResearchHotbed')),
+    'start_time': field(hour('startTime_activitiesResearchHotbed', '')),
+    'end_time': field(hour('endTime_activitiesResearchHotbed', '')),
+    'duration': field(_uses('duration_activitiesResearchHotbed')(
+        lambda row, context: float(row.duration_activitiesResearchHotbed) if row.duration_activitiesResearchHotbed else 0
+    )),
+    'approved_free_hours': field(as_bool('approvedFreeHours_activitiesResearchHotbed')),
+    'semester': field(raw('semester')),
+    'project': field(_project_block(date_default="")),
+    'product': field(_product_block(date_default="")),
+    'recognition': field(_recognition_block()),
+    'authors': field(author_details(main_author=True), authors=True),
+    'co_authors': field(author_details(main_author=False), authors=True)
+}
+
+# Exportación a Excel/PDF (valores sin formatear: las hojas formatean fechas)
+EXPORT_BASE_FIELDS = {
+    'id': field(raw('idactivitiesResearchHotbed')),
+    'title': field(raw('title_activitiesResearchHotbed')),
+    'responsible': field(raw('responsible_activitiesResearchHotbed')),
+    'date': field(raw('date_activitiesResearchHotbed')),
+    'description': field(raw('description_activitiesResearchHotbed')),
+    'type': field(raw('type_activitiesResearchHotbed')),
+    'duration': field(raw_or('duration_activitiesResearchHotbed', 0)),
+    'start_time': field(raw('startTime_activitiesResearchHotbed')),
+    'end_time': field(raw('endTime_activitiesResearchHotbed')),
+    'approved_free_hours': field(as_bool('approvedFreeHours_activitiesResearchHotbed')),
+    'reference_number': field(raw('reference_number')),
+    'publication_date': field(raw('publication_date')),
+    'organization_name': field(raw('organization_name')),
+    'authors': field(author_names, authors=True)
+}
+
+EXPORT_TYPE_FIELDS = {
+    # Datos específicos según el tipo
+    'project_data': field(block('project_id', {
+        'name': raw_or('project_name', 'Sin especificar'),
+        'reference_number': raw('project_reference_number'),
+        'start_date': raw('project_start_date'),
+        'end_date': raw('project_end_date')
+    }, 'proyecto'), optional=True),
+    'product_data': field(block('product_id', {
+        'category': raw('product_category'),
+        'type': raw('product_type'),
+        'description': raw('product_description')
+    }, 'producto'), optional=True),
+    'recognition_data': field(block('recognition_id', {
+        'project_name': raw('recognition_project_name'),
+        'organization_name': raw('recognition_organization_name')
+    }, 'reconocimiento'), optional=True)
+}
+
+PROFILES = {
+    'hotbed_listing': HOTBED_LISTING_FIELDS,
+    'user_listing': USER_LISTING_FIELDS,
+    'detail': DETAIL_FIELDS,
+    'export': {**EXPORT_BASE_FIELDS, **EXPORT_TYPE_FIELDS},
+    'user_export': {
+        **EXPORT_BASE_FIELDS,
+        'research_hotbed_name': field(raw_or('research_hotbed_name', 'Semillero no especificado')),
+        **EXPORT_TYPE_FIELDS
+    }
+}
+
+SerializerPlan = namedtuple('SerializerPlan', ['columns', 'joins', 'authors', 'fields'])
+
+def profile_fields(profile):
+    """Nombres de los campos disponibles en un perfil"""
+    return PROFILES[profile].keys()
+
+def parse_fields(raw_fields, allowed_fields):
+    """
+    Convierte el parámetro ?fields=title,date en un conjunto de campos.
+    Devuelve None cuando no se pidió (respuesta completa).
+    """
+    if not raw_fields:
+        return None
+
+    fields = frozenset(field.strip() for field in raw_fields.split(',') if field.strip())
+    unknown = fields - set(allowed_fields)
+    if unknown:
+        raise ValueError(f"Campos no válidos: {', '.join(sorted(unknown))}")
+
+    return fields
+
+@lru_cache(maxsize=None)
+def get_plan(profile, fields=None):
+    """
+    Plan de serialización de un perfil para un conjunto de campos (None = todos):
+    columnas a proyectar, JOINs necesarios y formateadores en orden.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil de serialización desconocido: {profile}")
+
+    specs = [
+        (name, spec) for name, spec in PROFILES[profile].items()
+        if fields is None or name in fields
+    ]
+
+    labels = set(KEY_COLUMNS)
+    for _, spec in specs:
+        labels.update(spec.format.columns)
+
+    joins = set()
+    for label in labels:
+        join = COLUMNS[label][1]
+        while join:
+            joins.add(join)
+            join = JOINS[join][2]
+
+    return SerializerPlan(
+        columns=tuple(COLUMNS[label][0].label(label) for label in sorted(labels)),
+        joins=tuple(join for join in JOIN_ORDER if join in joins),
+        authors=any(spec.authors for _, spec in specs),
+        fields=tuple((name, spec.format, spec.optional) for name, spec in specs)
+    )
+
+def select_activities(plan):
+    """SELECT de las columnas del plan desde la tabla de actividades con sus JOINs"""
+    stmt = select(*plan.columns).select_from(Activity)
+    for join in plan.joins:
+        target, onclause, _ = JOINS[join]
+        stmt = stmt.outerjoin(target, onclause)
+    return stmt
+
+def aggregated_author_names(main_author, separator='; '):
+    """
+    Subconsulta correlacionada con los nombres de los autores principales (o
+    co-autores) de cada actividad en una sola cadena. Permite leer los autores
+    en el mismo SELECT, sin consultas adicionales (para cursores en streaming).
+    """
+    return select(
+        func.aggregate_strings(User.name_user, separator)
+    ).select_from(ActivityAuthors).join(
+        UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    ).join(
+        User, UsersResearchHotbed.user_iduser == User.iduser
+    ).where(
+        ActivityAuthors.activity_id == Activity.idactivitiesResearchHotbed,
+        ActivityAuthors.is_main_author == main_author
+    ).scalar_subquery()
+
+AUTHOR_BATCH_SIZE = 500
+
+def load_authors(activity_ids):
+    """Autores de varias actividades en bloque: {activity_id: [filas]} en orden de registro"""
+    authors_by_activity = {}
+    activity_ids = list(activity_ids)
+
+    for start in range(0, len(activity_ids), AUTHOR_BATCH_SIZE):
+        rows = db.session.execute(
+            select(
+                ActivityAuthors.activity_id,
+                ActivityAuthors.is_main_author,
+                UsersResearchHotbed.idusersResearchHotbed.label('member_id'),
+                UsersResearchHotbed.user_iduser,
+                UsersResearchHotbed.TypeUser_usersResearchHotbed.label('member_type'),
+                User.name_user,
+                User.email_user
+            ).join(
+                UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+            ).join(
+                User, UsersResearchHotbed.user_iduser == User.iduser
+            ).where(
+                ActivityAuthors.activity_id.in_(activity_ids[start:start + AUTHOR_BATCH_SIZE])
+            ).order_by(ActivityAuthors.id)
+        ).all()
+
+        for row in rows:
+            authors_by_activity.setdefault(row.activity_id, []).append(row)
+
+    return authors_by_activity
+
+def serialize_rows(plan, rows, user_id=None):
+    """Convierte las filas del SELECT en diccionarios según el plan"""
+    authors_by_activity = load_authors(dict.fromkeys(row.idactivitiesResearchHotbed for row in rows)) if plan.authors else {}
+    serialized = []
+
+    for row in rows:
+        context = {
+            'authors': authors_by_activity.get(row.idactivitiesResearchHotbed, ()),
+            'user_id': user_id
+        }
+        data = {}
+        for name, format_value, optional in plan.fields:
+            value = format_value(row, context)
+            if value is None and optional:
+                continue
+            data[name] = value
+        serialized.append(data)
+
+    return serialized
@@ -0,0 +1,118 @@
+from sqlalchemy import select, func, case, and_
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_semester_summary import ActivitySemesterSummary
+from models.research_hotbed import ResearchHotbed
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+from utils.listing_versions import HOTBED_SCOPE, USER_SCOPE
+
+# Conteos y sumas de actividades por usuario y por semillero para los reportes
+# y la previsualización. Los totales se leen de la tabla de resumen por
+# semestre (utils/semester_summary.py), que se mantiene al registrar, editar o
+# eliminar actividades; así no se recorren las actividades en cada consulta.
+
+# Totales de un resumen, en el orden de las columnas
+STAT_KEYS = ('total_activities', 'total_hours', 'approved_activities', 'projects', 'products', 'recognitions')
+
+# Valores de un usuario sin actividades en el semestre
+EMPTY_ACTIVITY_STATS = dict.fromkeys(STAT_KEYS, 0)
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def _type_contains(text):
+    """Mismo criterio que los reportes: el tipo contiene el texto (sin mayúsculas)"""
+    return func.lower(ActivitiesResearchHotbed.type_activitiesResearchHotbed).like(f'%{text}%')
+
+def activity_stat_columns():
+    """Columnas agregadas (con las etiquetas de STAT_KEYS) sobre las actividades del GROUP BY"""
+    approved = ActivitiesResearchHotbed.approvedFreeHours_activitiesResearchHotbed
+    return [
+        func.count().label('total_activities'),
+        func.coalesce(func.sum(func.coalesce(ActivitiesResearchHotbed.duration_activitiesResearchHotbed, 0)), 0).label('total_hours'),
+        _count_where(and_(approved.isnot(None), approved != 0)).label('approved_activities'),
+        _count_where(_type_contains('proyecto')).label('projects'),
+        _count_where(_type_contains('producto')).label('products'),
+        _count_where(_type_contains('reconocimiento')).label('recognitions')
+    ]
+
+def get_users_activity_stats(user_ids, semester):
+    """
+    Devuelve {user_id: {total_activities, total_hours, approved_activities,
+    projects, products, recognitions}} para los usuarios con actividades en el
+    semestre, leyendo su fila de resumen. Los usuarios sin actividades no
+    aparecen (usar EMPTY_ACTIVITY_STATS).
+    """
+    if not user_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(
+            ActivitySemesterSummary.scope_id,
+            *[getattr(ActivitySemesterSummary, key) for key in STAT_KEYS]
+        ).where(
+            ActivitySemesterSummary.scope == USER_SCOPE,
+            ActivitySemesterSummary.semester == semester,
+            ActivitySemesterSummary.scope_id.in_(user_ids)
+        )
+    ).all()
+
+    return {
+        row.scope_id: {key: row._mapping[key] for key in STAT_KEYS}
+        for row in rows
+    }
+
+def get_hotbeds_activity_stats(hotbed_ids, semester):
+    """
+    Igual que get_users_activity_stats pero por semillero (actividades creadas
+    por sus miembros): {hotbed_id: {total_activities, ...}}.
+    """
+    if not hotbed_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(
+            ActivitySemesterSummary.scope_id,
+            *[getattr(ActivitySemesterSummary, key) for key in STAT_KEYS]
+        ).where(
+            ActivitySemesterSummary.scope == HOTBED_SCOPE,
+            ActivitySemesterSummary.semester == semester,
+            ActivitySemesterSummary.scope_id.in_(hotbed_ids)
+        )
+    ).all()
+
+    return {
+        row.scope_id: {key: row._mapping[key] for key in STAT_KEYS}
+        for row in rows
+    }
+
+def summarize_activities(activities):
+    """Los mismos totales calculados sobre actividades ya serializadas"""
+    return {
+        'total_activities': len(activities),
+        'total_hours': sum(a['duration'] for a in activities),
+        'approved_activities': len([a for a in activities if a['approved_free_hours']]),
+        'projects': len([a for a in activities if 'proyecto' in a['type'].lower()]),
+        'products': len([a for a in activities if 'producto' in a['type'].lower()]),
+        'recognitions': len([a for a in activities if 'reconocimiento' in a['type'].lower()])
+    }
+
+def get_users_hotbed_counts(user_ids):
+    """Devuelve {user_id: número de semilleros asociados} en una sola consulta"""
+    if not user_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(
+            UsersResearchHotbed.user_iduser,
+            func.count(UsersResearchHotbed.idusersResearchHotbed)
+        ).join(
+            ResearchHotbed, ResearchHotbed.idresearchHotbed == UsersResearchHotbed.researchHotbed_idresearchHotbed
+        ).where(
+            UsersResearchHotbed.user_iduser.in_(user_ids)
+        ).group_by(
+            UsersResearchHotbed.user_iduser
+        )
+    ).all()
+
+    return {user_id: count for user_id, count in rows}
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Caché de lectura en proceso (LRU con expiración por TTL).
+# Cada entrada puede llevar etiquetas (ej. 'activity:15') para invalidar de una
+# sola vez todas las claves que dependen de un mismo registro. Cada etiqueta
+# lleva un número de generación que sube al invalidarla: quien lee de la base
+# toma generation(tags) antes de la consulta y lo pasa a set(since=...), y el
+# valor se descarta si entretanto una escritura invalidó alguna etiqueta (así
+# una lectura concurrente no vuelve a guardar datos anteriores). El backend es
+# intercambiable: cualquier objeto con get/set/generation/invalidate_tags/
+# clear/stats (por ejemplo uno sobre Redis) puede registrarse con register_cache().
+
+_MISSING = object()
+
+class LRUCache:
+    """Caché LRU con TTL, etiquetas de invalidación y contadores de aciertos/fallos"""
+
+    def __init__(self, maxsize=512, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # clave -> (expira, valor, etiquetas)
+        self._tags = {}  # etiqueta -> conjunto de claves
+        self._generations = {}  # etiqueta -> número de invalidaciones
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = _MISSING
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, tags):
+        """Generación actual de las etiquetas (tomarla antes de leer los datos)"""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key, value, tags=(), ttl=None, since=None):
+        """
+        Guarda el valor; ttl (segundos) acorta la vigencia de esta entrada.
+        Con since (resultado de generation(tags)) no se guarda si alguna
+        etiqueta se invalidó después. Devuelve si el valor quedó guardado.
+        """
+        tags = tuple(tags)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if since is not None and since != tuple(self._generations.get(tag, 0) for tag in tags):
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + ttl, value, frozenset(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+            return True
+
+    def invalidate_tags(self, tags):
+        """Elimina todas las entradas asociadas a alguna de las etiquetas"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tags.get(tag, set()).copy():
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+_caches = {}
+
+def register_cache(name, backend):
+    """Registra (o reemplaza) el backend de una caché con nombre"""
+    _caches[name] = backend
+    return backend
+
+def get_cache(name):
+    return _caches[name]
+
+def cache_stats():
+    """Contadores de todas las cachés registradas"""
+    return {name: backend.stats() for name, backend in _caches.items()}
+
+def clear_caches():
+    for backend in _caches.values():
+        backend.clear()
+
+# Detalle de actividades (modal del frontend)
+ACTIVITY_DETAIL_CACHE = 'activity_details'
+
+register_cache(ACTIVITY_DETAIL_CACHE, LRUCache(
+    maxsize=int(os.getenv('ACTIVITY_CACHE_SIZE', 512)),
+    ttl=int(os.getenv('ACTIVITY_CACHE_TTL', 300))
+))
+
+# Tokens JWT ya verificados (middlewares/auth.py); cada entrada vence con el
+# 'exp' del token o con el TTL, lo que ocurra primero
+AUTH_TOKEN_CACHE = 'auth_tokens'
+
+register_cache(AUTH_TOKEN_CACHE, LRUCache(
+    maxsize=int(os.getenv('AUTH_TOKEN_CACHE_SIZE', 1024)),
+    ttl=int(os.getenv('AUTH_TOKEN_CACHE_TTL', 900))
+))
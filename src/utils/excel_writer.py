@@ -0,0 +1,113 @@
+from collections import namedtuple
+from io import BytesIO
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+# Escritura de libros Excel en una sola pasada (modo write-only de openpyxl).
+# Cada hoja se escribe una vez: los anchos de columna se calculan a partir de
+# los valores antes de emitir las filas, y cada celda se crea ya con su estilo.
+# Así se evita escribir con pandas, volver a leer el archivo con load_workbook
+# para darle formato y serializarlo por segunda vez.
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Estilo de una celda; los atributos en None se dejan con el valor por defecto
+CellStyle = namedtuple('CellStyle', ['font', 'fill', 'alignment', 'border'], defaults=(None, None, None, None))
+
+def records_to_rows(records):
+    """
+    Convierte una lista de diccionarios en (encabezado, filas) como lo haría un
+    DataFrame: columnas en orden de aparición y None donde falta el valor.
+    """
+    header = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                header.append(key)
+
+    rows = [[record.get(key) for key in header] for record in records]
+    return header, rows
+
+def column_width(max_length):
+    """Ancho de columna según la línea más larga de su contenido"""
+    if max_length < 8:
+        return 12
+    if max_length < 20:
+        return max_length + 3
+    if max_length < 40:
+        return max_length + 2
+    return 45
+
+def column_widths(rows):
+    """Anchos de todas las columnas calculados sobre los valores (sin crear celdas)"""
+    max_lengths = []
+    for values in rows:
+        for index, value in enumerate(values):
+            if index == len(max_lengths):
+                max_lengths.append(0)
+            if value is None or value == '':
+                continue
+            length = max(len(line) for line in str(value).split('\n'))
+            if length > max_lengths[index]:
+                max_lengths[index] = length
+
+    return [column_width(length) for length in max_lengths]
+
+class StreamingWorkbook:
+    """Libro Excel que escribe cada hoja una sola vez con sus estilos"""
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+
+    def write_sheet(self, title, rows, styler=None, merge_row=None):
+        """
+        Escribe una hoja completa.
+        :param rows: Filas (listas de valores); la primera es el encabezado.
+        :param styler: Función (encabezado) -> función (fila, columna, valor, valores_fila)
+                       que devuelve el CellStyle de cada celda (o None).
+        :param merge_row: Función (fila, valores_fila) -> bool para combinar la fila completa.
+        """
+        sheet = self.workbook.create_sheet(title)
+        style_cell = styler(rows[0] if rows else []) if styler else None
+
+        # En modo write-only los anchos deben definirse antes de la primera fila
+        for index, width in enumerate(column_widths(rows), 1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+
+        for row_num, values in enumerate(rows, 1):
+            cells = []
+            for col_num, value in enumerate(values, 1):
+                cell = WriteOnlyCell(sheet, value=value)
+                style = style_cell(row_num, col_num, value, values) if style_cell else None
+                if style:
+                    if style.font:
+                        cell.font = style.font
+                    if style.fill:
+                        cell.fill = style.fill
+                    if style.alignment:
+                        cell.alignment = style.alignment
+                    if style.border:
+                        cell.border = style.border
+                cells.append(cell)
+            sheet.append(cells)
+
+            if merge_row and len(values) > 1 and merge_row(row_num, values):
+                sheet.merged_cells.add(f"A{row_num}:{get_column_letter(len(values))}{row_num}")
+
+        return sheet
+
+    def write_records(self, title, records, styler=None):
+        """Escribe una hoja a partir de diccionarios (encabezado con las claves)"""
+        header, rows = records_to_rows(records)
+        return self.write_sheet(title, [header] + rows, styler)
+
+    def save(self, target=None):
+        """Guarda el libro en 'target' (o en un BytesIO nuevo) y lo devuelve"""
+        target = target if target is not None else BytesIO()
+        self.workbook.save(target)
+        if hasattr(target, 'seek'):
+            target.seek(0)
+        return target
@@ -0,0 +1,164 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from io import BytesIO
+from flask import send_file
+from sqlalchemy import select
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+
+# Caché en disco de los archivos de exportación ya generados.
+# Cada reporte (tipo, entidad, semestre) tiene un puntero JSON que indica la
+# huella de los datos con que se generó; el archivo se guarda con esa huella
+# como nombre (direccionado por contenido). Una descarga repetida lee solo el
+# puntero y el archivo, sin consultar la base de datos. Las escrituras sobre
+# actividades, autores, membresías, usuarios o semilleros eliminan los
+# punteros de las entidades afectadas. El tamaño total está acotado y se
+# desalojan primero los archivos usados hace más tiempo (LRU por mtime).
+
+HOTBED_REPORT = 'hotbed'
+USER_REPORT = 'user'
+
+# Cambiar al modificar el formato de los reportes para no servir archivos viejos
+REPORT_FORMAT_VERSION = 1
+
+class ExportFileCache:
+    """Archivos de exportación en disco con punteros por entidad y desalojo LRU"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def lookup(self, kind, entity_id, semester):
+        """Entrada vigente de un reporte ({'path', 'filename'}) o None"""
+        try:
+            with open(self._pointer_path(kind, entity_id, semester), encoding='utf-8') as pointer_file:
+                pointer = json.load(pointer_file)
+        except (OSError, ValueError):
+            return None
+
+        path = self.blob_path(pointer['fingerprint'])
+        try:
+            os.utime(path)  # Marca de uso para el desalojo LRU
+        except OSError:
+            return None
+
+        return {'path': path, 'filename': pointer['filename'], 'fingerprint': pointer['fingerprint']}
+
+    def load_blob(self, fingerprint):
+        """Contenido de un archivo ya generado con la misma huella, o None"""
+        try:
+            with open(self.blob_path(fingerprint), 'rb') as blob:
+                content = blob.read()
+        except OSError:
+            return None
+
+        os.utime(self.blob_path(fingerprint))
+        return BytesIO(content)
+
+    def store(self, kind, entity_id, semester, fingerprint, buffer, filename):
+        """Guarda el archivo (si no existe ya) y apunta el reporte a esa huella"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        blob_path = self.blob_path(fingerprint)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, buffer.getvalue())
+
+        pointer = json.dumps({'fingerprint': fingerprint, 'filename': filename})
+        self._write_atomic(self._pointer_path(kind, entity_id, semester), pointer.encode('utf-8'))
+
+        self._evict()
+
+    def invalidate(self, kind, entity_ids):
+        """Elimina los punteros (todos los semestres) de las entidades indicadas"""
+        for entity_id in entity_ids:
+            for pointer_path in glob.glob(self._pointer_path(kind, entity_id, '*')):
+                try:
+                    os.remove(pointer_path)
+                except FileNotFoundError:
+                    pass
+
+    def blob_path(self, fingerprint):
+        return os.path.join(self.cache_dir, f"{fingerprint}.xlsx")
+
+    def _pointer_path(self, kind, entity_id, semester):
+        return os.path.join(self.cache_dir, f"{kind}-{entity_id}-{semester}.json")
+
+    def _write_atomic(self, path, content):
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as output:
+            output.write(content)
+        os.replace(temp_path, path)
+
+    def _evict(self):
+        """Desaloja los archivos menos usados hasta respetar el tamaño máximo"""
+        with self._lock:
+            blobs = []
+            for path in glob.glob(os.path.join(self.cache_dir, '*.xlsx')):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in blobs)
+            for _, size, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+def data_fingerprint(kind, entity_id, semester, *data):
+    """Huella de los datos con que se genera un reporte"""
+    payload = json.dumps(
+        [REPORT_FORMAT_VERSION, kind, entity_id, semester, data],
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def send_cached_export(entry):
+    """Respuesta que transmite el archivo cacheado directamente desde el disco"""
+    # Import diferido: este módulo lo usan las escrituras de la API (invalidación)
+    # y no debe cargar openpyxl
+    from utils.excel_writer import XLSX_MIMETYPE
+    return send_file(
+        entry['path'],
+        mimetype=XLSX_MIMETYPE,
+        as_attachment=True,
+        download_name=entry['filename'],
+        max_age=0
+    )
+
+def invalidate_hotbed_exports(hotbed_ids):
+    export_file_cache.invalidate(HOTBED_REPORT, hotbed_ids)
+
+def invalidate_user_exports(user_ids):
+    export_file_cache.invalidate(USER_REPORT, user_ids)
+
+def invalidate_user_profile_exports(user_id):
+    """Los datos del usuario aparecen en su reporte y en los de sus semilleros"""
+    hotbed_ids = db.session.execute(
+        select(UsersResearchHotbed.researchHotbed_idresearchHotbed).where(UsersResearchHotbed.user_iduser == user_id)
+    ).scalars().all()
+    invalidate_user_exports([user_id])
+    invalidate_hotbed_exports(hotbed_ids)
+
+def invalidate_hotbed_profile_exports(hotbed_id):
+    """Los datos del semillero aparecen en su reporte y en los de sus miembros"""
+    user_ids = db.session.execute(
+        select(UsersResearchHotbed.user_iduser).where(UsersResearchHotbed.researchHotbed_idresearchHotbed == hotbed_id)
+    ).scalars().all()
+    invalidate_hotbed_exports([hotbed_id])
+    invalidate_user_exports(user_ids)
+
+export_file_cache = ExportFileCache(
+    cache_dir=os.getenv('EXPORT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'sigisi_export_cache')),
+    max_bytes=int(os.getenv('EXPORT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+)
@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# Cola de exportaciones asíncronas sin broker externo.
+# Los trabajos se ejecutan en un pool acotado de hilos (cada uno dentro del
+# contexto de la aplicación) y el resultado se escribe en un directorio de
+# spool. El estado de cada trabajo se guarda como JSON junto al archivo, así
+# cualquier worker del servidor puede consultar el estado o servir la descarga.
+# Los trabajos terminados expiran después de un TTL y se eliminan del spool.
+# Los que siguen en cola o en curso sin un hilo vivo en este proceso (el worker
+# que los tenía se reinició o cayó) expiran por su fecha de creación.
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+class ExportError(Exception):
+    """Error esperado de una exportación (parámetros inválidos o datos inexistentes)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+class ExportQueueFullError(Exception):
+    """La cola alcanzó el máximo de trabajos pendientes"""
+
+class ExportJobQueue:
+    """Pool acotado de trabajos de exportación con estado y archivos en disco"""
+
+    def __init__(self, spool_dir, max_workers=2, max_pending=20, ttl=3600):
+        self.spool_dir = spool_dir
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, params, run, owner_id=None):
+        """
+        Encola un trabajo. 'run' recibe una función progress(fracción, mensaje) y
+        devuelve (buffer, nombre de archivo, mimetype) o lanza ExportError.
+        """
+        self.purge_expired()
+
+        with self._lock:
+            pending = sum(1 for future in self._futures.values() if not future.done())
+            if pending >= self.max_pending:
+                raise ExportQueueFullError("Hay demasiadas exportaciones en curso, intente más tarde")
+
+            job = {
+                'id': uuid.uuid4().hex,
+                'type': kind,
+                'params': params,
+                'owner_id': owner_id,
+                'status': QUEUED,
+                'progress': 0.0,
+                'message': 'En cola',
+                'error': None,
+                'filename': None,
+                'mimetype': None,
+                'created_at': time.time(),
+                'finished_at': None
+            }
+            self._save(job)
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='export')
+            app = current_app._get_current_object()
+            self._futures[job['id']] = self._executor.submit(self._run, app, job, run)
+
+        return job
+
+    def get(self, job_id):
+        """Estado de un trabajo, o None si no existe o ya expiró"""
+        if not _JOB_ID_PATTERN.match(job_id or ''):
+            return None
+
+        try:
+            with open(self._state_path(job_id), encoding='utf-8') as state_file:
+                job = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+
+        if self._is_expired(job):
+            self._delete(job_id)
+            return None
+
+        return job
+
+    def file_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.out")
+
+    def wait(self, job_id, timeout=None):
+        """Espera a que termine un trabajo de este proceso y devuelve su estado"""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def purge_expired(self):
+        """Elimina del spool los trabajos vencidos (terminados o abandonados)"""
+        if not os.path.isdir(self.spool_dir):
+            return
+
+        for name in os.listdir(self.spool_dir):
+            job_id, extension = os.path.splitext(name)
+            if extension == '.json':
+                self.get(job_id)
+
+        with self._lock:
+            self._futures = {job_id: future for job_id, future in self._futures.items() if not future.done()}
+
+    def _run(self, app, job, run):
+        with app.app_context():
+            self._update(job, status=RUNNING, message='Generando archivo')
+
+            def progress(fraction, message=None):
+                self._update(job, progress=round(fraction, 2), message=message or job['message'])
+
+            try:
+                buffer, filename, mimetype = run(progress)
+                self._write_file(job['id'], buffer)
+                self._update(
+                    job, status=FINISHED, progress=1.0, message='Archivo listo',
+                    filename=filename, mimetype=mimetype, finished_at=time.time()
+                )
+            except ExportError as e:
+                self._update(job, status=FAILED, message=e.message, error=e.message, finished_at=time.time())
+            except Exception:
+                logger.exception("Error en el trabajo de exportación %s", job['id'])
+                self._update(
+                    job, status=FAILED, message='Error interno del servidor',
+                    error='Error interno del servidor', finished_at=time.time()
+                )
+
+    def _update(self, job, **changes):
+        job.update(changes)
+        self._save(job)
+
+    def _is_expired(self, job):
+        if job.get('finished_at') is not None:
+            return job['finished_at'] + self.ttl < time.time()
+
+        # En cola o en curso: no vence mientras el hilo de este proceso siga vivo
+        future = self._futures.get(job['id'])
+        if future is not None and not future.done():
+            return False
+        return job['created_at'] + self.ttl < time.time()
+
+    def _state_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.json")
+
+    def _save(self, job):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        temp_path = f"{self._state_path(job['id'])}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as state_file:
+            json.dump(job, state_file)
+        os.replace(temp_path, self._state_path(job['id']))
+
+    def _write_file(self, job_id, buffer):
+        temp_path = f"{self.file_path(job_id)}.tmp"
+        with open(temp_path, 'wb') as output:
+            output.write(buffer.getvalue())
+        os.replace(temp_path, self.file_path(job_id))
+
+    def _delete(self, job_id):
+        for path in (self._state_path(job_id), self.file_path(job_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+export_jobs = ExportJobQueue(
+    spool_dir=os.getenv('EXPORT_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'sigisi_exports')),
+    max_workers=int(os.getenv('EXPORT_WORKERS', 2)),
+    max_pending=int(os.getenv('EXPORT_MAX_PENDING', 20)),
+    ttl=int(os.getenv('EXPORT_JOB_TTL', 3600))
+)
@@ -1,8 +1,15 @@
+import logging
 from datetime import datetime, timedelta
 from models.users import User
 from db.connection import db
+from utils.last_login import flush_last_logins
+
+logger = logging.getLogger(__name__)
 
 def mark_inactive_users():
+    # Escribir primero los inicios de sesión pendientes para no marcar a quien acaba de entrar
+    flush_last_logins()
+
     # Obtener la fecha actual y la fecha límite para inactividad
     current_date = datetime.utcnow()
     threshold_date = current_date - timedelta(days=60)
@@ -16,4 +23,4 @@ def mark_inactive_users():
     
     # Guardar los cambios en la base de datos
     db.session.commit()
-    print(f"Usuarios marcados como inactivos: {len(inactive_users)}")
\ No newline at end of file
+    logger.info("Usuarios marcados como inactivos: %d", len(inactive_users))
\ No newline at end of file
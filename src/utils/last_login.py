@@ -0,0 +1,91 @@
+import atexit
+import logging
+import os
+import threading
+from sqlalchemy import update
+from models.users import User
+from db.connection import db
+
+# Escritura diferida de la fecha del último inicio de sesión.
+# El login solo anota (usuario, fecha) en memoria y responde; un job del
+# scheduler escribe lo pendiente cada LAST_LOGIN_FLUSH_SECONDS con un único
+# UPDATE por clave primaria (executemany), y al apagar el proceso se escribe
+# lo que quede. Si se acumulan LAST_LOGIN_MAX_PENDING usuarios, el login que
+# alcanza el límite hace la escritura. Quien lea lastDayLogin_user para tomar
+# decisiones (mark_inactive_users) debe llamar antes a flush_last_logins.
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = int(os.getenv('LAST_LOGIN_FLUSH_SECONDS', 30))
+MAX_PENDING = int(os.getenv('LAST_LOGIN_MAX_PENDING', 1000))
+
+class LastLoginBuffer:
+    """Últimos inicios de sesión pendientes de escribir, por usuario"""
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._pending = {}  # user_id -> fecha del último login
+        self._lock = threading.Lock()
+        # Serializa las escrituras para no pisar una fecha nueva con una vieja
+        self._flush_lock = threading.Lock()
+
+    def record(self, user_id, login_at):
+        """Anota el login; devuelve True si hay que escribir ya (buffer lleno)"""
+        with self._lock:
+            self._pending[user_id] = login_at
+            return len(self._pending) >= self.max_pending
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def clear(self):
+        """Descarta lo pendiente sin escribirlo"""
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self):
+        """Escribe lo pendiente con un UPDATE en bloque y devuelve cuántos usuarios actualizó"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+
+            if not pending:
+                return 0
+
+            try:
+                db.session.execute(update(User), [
+                    {'iduser': user_id, 'lastDayLogin_user': login_at}
+                    for user_id, login_at in pending.items()
+                ])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Se conservan para el próximo intento (sin pisar logins más recientes)
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                logger.exception("Error escribiendo %d fechas de último login", len(pending))
+                raise
+
+            logger.debug("Fechas de último login escritas: %d", len(pending))
+            return len(pending)
+
+last_login_buffer = LastLoginBuffer(max_pending=MAX_PENDING)
+
+def record_login(user_id, login_at):
+    """Registra el inicio de sesión sin escribir en la base (salvo con el buffer lleno)"""
+    if last_login_buffer.record(user_id, login_at):
+        last_login_buffer.flush()
+
+def flush_last_logins():
+    return last_login_buffer.flush()
+
+def init_last_login_flush(app, scheduler):
+    """Escritura periódica con el scheduler de la aplicación y al apagar el proceso"""
+
+    def flush_job():
+        with app.app_context():
+            flush_last_logins()
+
+    scheduler.add_job(flush_job, 'interval', seconds=FLUSH_INTERVAL_SECONDS)
+    atexit.register(flush_job)
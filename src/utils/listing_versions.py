@@ -0,0 +1,155 @@
+import hashlib
+from flask import make_response
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.http import parse_etags
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.listing_version import ListingVersion
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+from utils.activity_loaders import user_activity_ids_query
+
+# Versiones de los listados de actividades para GET condicional (ETag).
+# Cada escritura sobre una actividad incrementa la versión del semillero y de
+# los usuarios afectados (creador y autores); renombrar un usuario o un
+# semillero incrementa la de los listados donde aparece su nombre. El ETag combina esa versión con
+# el número de actividades y la última modificación (MAX(updated_at)), que se
+# obtienen en una sola consulta barata, sin ejecutar el listado completo.
+
+HOTBED_SCOPE = 'hotbed'
+USER_SCOPE = 'user'
+
+def activity_listing_scopes(activity_ids):
+    """
+    Semilleros y usuarios cuyos listados incluyen las actividades indicadas:
+    el semillero y usuario del creador, y los usuarios autores/co-autores.
+    """
+    activity_ids = list(activity_ids)
+    if not activity_ids:
+        return set(), set()
+
+    creators = db.session.execute(
+        select(
+            UsersResearchHotbed.researchHotbed_idresearchHotbed,
+            UsersResearchHotbed.user_iduser
+        ).join(
+            ActivitiesResearchHotbed,
+            ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+        ).where(ActivitiesResearchHotbed.idactivitiesResearchHotbed.in_(activity_ids))
+    ).all()
+
+    authors = db.session.execute(
+        select(UsersResearchHotbed.user_iduser).join(
+            ActivityAuthors, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+        ).where(ActivityAuthors.activity_id.in_(activity_ids))
+    ).scalars().all()
+
+    hotbed_ids = {hotbed_id for hotbed_id, _ in creators}
+    user_ids = {user_id for _, user_id in creators} | set(authors)
+
+    return hotbed_ids, user_ids
+
+def bump_listing_versions(hotbed_ids=(), user_ids=()):
+    """
+    Incrementa la versión de los listados indicados (dentro de la transacción
+    actual) con un único upsert: las versiones que no existen se crean en 1.
+    """
+    scopes = {(HOTBED_SCOPE, hotbed_id) for hotbed_id in hotbed_ids}
+    scopes |= {(USER_SCOPE, user_id) for user_id in user_ids}
+    if not scopes:
+        return
+
+    # Orden fijo para que dos transacciones bloqueen las filas en el mismo orden
+    values = [{'scope': scope, 'scope_id': scope_id, 'version': 1} for scope, scope_id in sorted(scopes)]
+    changes = {'version': ListingVersion.version + 1, 'updated_at': func.current_timestamp()}
+
+    if db.session.get_bind().dialect.name == 'mysql':
+        stmt = mysql_insert(ListingVersion).values(values).on_duplicate_key_update(**changes)
+    else:
+        # SQLite (pruebas)
+        stmt = sqlite_insert(ListingVersion).values(values).on_conflict_do_update(
+            index_elements=['scope', 'scope_id'], set_=changes
+        )
+    db.session.execute(stmt)
+
+def bump_user_listings(user_id):
+    """Los datos del usuario cambiaron: listados que muestran sus actividades"""
+    activity_ids = db.session.execute(select(user_activity_ids_query(user_id).c.activity_id)).scalars().all()
+    hotbed_ids, user_ids = activity_listing_scopes(activity_ids)
+    bump_listing_versions(hotbed_ids, user_ids | {user_id})
+
+def bump_hotbed_listings(research_hotbed_id):
+    """Los datos del semillero cambiaron: listados que muestran sus actividades"""
+    activity_ids = db.session.execute(hotbed_activity_ids(research_hotbed_id)).scalars().all()
+    hotbed_ids, user_ids = activity_listing_scopes(activity_ids)
+    bump_listing_versions(hotbed_ids | {research_hotbed_id}, user_ids)
+
+def hotbed_activity_ids(research_hotbed_id):
+    """SELECT de las actividades creadas por los miembros del semillero"""
+    return select(ActivitiesResearchHotbed.idactivitiesResearchHotbed).join(
+        UsersResearchHotbed,
+        ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    ).where(UsersResearchHotbed.researchHotbed_idresearchHotbed == research_hotbed_id)
+
+def _listing_state(scope, scope_id, activity_ids):
+    """Versión, número de actividades y última modificación de un listado en una consulta"""
+    return db.session.execute(
+        select(
+            func.count(ActivitiesResearchHotbed.idactivitiesResearchHotbed),
+            func.max(ActivitiesResearchHotbed.updated_at),
+            select(func.max(ActivityAuthors.updated_at)).where(
+                ActivityAuthors.activity_id.in_(activity_ids)
+            ).scalar_subquery(),
+            select(ListingVersion.version).where(
+                ListingVersion.scope == scope,
+                ListingVersion.scope_id == scope_id
+            ).scalar_subquery()
+        ).where(ActivitiesResearchHotbed.idactivitiesResearchHotbed.in_(activity_ids))
+    ).one()
+
+def hotbed_listing_etag(research_hotbed_id, params):
+    """ETag del listado de actividades de un semillero para los parámetros dados"""
+    activity_ids = hotbed_activity_ids(research_hotbed_id)
+
+    return _build_etag(HOTBED_SCOPE, research_hotbed_id, _listing_state(HOTBED_SCOPE, research_hotbed_id, activity_ids), params)
+
+def user_listing_etag(user_id, params):
+    """ETag del listado de actividades de un usuario para los parámetros dados"""
+    activity_ids = select(user_activity_ids_query(user_id).c.activity_id)
+
+    return _build_etag(USER_SCOPE, user_id, _listing_state(USER_SCOPE, user_id, activity_ids), params)
+
+def _build_etag(scope, scope_id, state, params):
+    count, activities_updated, authors_updated, version = state
+    key = f"{scope}:{scope_id}:{version or 0}:{count}:{activities_updated}:{authors_updated}:{params!r}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def etag_matches(if_none_match, etag):
+    """Indica si el encabezado If-None-Match del cliente incluye el ETag actual"""
+    if not if_none_match:
+        return False
+
+    return parse_etags(if_none_match).contains_weak(etag)
+
+def listing_params_key(limit, position, fields, filters):
+    """Representación estable de los parámetros del listado (forman parte del ETag)"""
+    return (
+        limit,
+        position,
+        tuple(sorted(fields)) if fields else None,
+        tuple(sorted(filters.items())) if filters else None
+    )
+
+def not_modified(etag):
+    """Respuesta 304 sin cuerpo para un listado que no cambió"""
+    response = make_response('', 304)
+    response.set_etag(etag)
+    return response, 304
+
+def with_etag(response, etag):
+    """Agrega el ETag a la respuesta y obliga al cliente a revalidar"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
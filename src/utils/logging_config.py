@@ -0,0 +1,65 @@
+import atexit
+import logging
+import os
+import queue
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+
+# Configuración de logs de la aplicación.
+# Los módulos usan logging.getLogger(__name__) con formato diferido
+# (logger.debug("... %s", valor)) para no construir mensajes que el nivel
+# descarta. Los registros se encolan en el hilo de la petición y un
+# QueueListener los escribe en segundo plano, así la E/S no bloquea la respuesta.
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_listener = None
+
+class RequestIdFilter(logging.Filter):
+    """Agrega el id de la petición actual a cada registro ('-' fuera de una petición)"""
+
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+def configure_logging(level=None):
+    """
+    Configura el logger raíz con una cola no bloqueante.
+    El nivel se toma de LOG_LEVEL (por defecto INFO). Es idempotente.
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv('LOG_LEVEL', 'INFO')).upper())
+
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    # El filtro corre en el hilo de la petición, donde existe el contexto de Flask
+    queue_handler.addFilter(RequestIdFilter())
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    return _listener
+
+def init_request_id(app):
+    """Asigna un id a cada petición (o respeta el recibido) y lo devuelve en la respuesta"""
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+
+    @app.after_request
+    def add_request_id_header(response):
+        response.headers[REQUEST_ID_HEADER] = g.get('request_id', '')
+        return response
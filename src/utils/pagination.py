@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import date
+from sqlalchemy import and_, or_
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from db.connection import db
+
+# Paginación por cursor (keyset) para los listados de actividades.
+# El orden es fijo: fecha descendente y, ante empate, id descendente; ambas
+# columnas están cubiertas por índice, así cada página cuesta lo mismo sin
+# importar qué tan atrás esté (a diferencia de OFFSET).
+
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+def encode_cursor(activity_date, activity_id):
+    """Codifica (fecha, id) de la última actividad de la página en un cursor opaco"""
+    payload = json.dumps([activity_date.isoformat(), activity_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decodifica un cursor y devuelve la tupla (fecha, id)"""
+    try:
+        raw_date, activity_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if not isinstance(activity_id, int):
+            raise ValueError
+        return date.fromisoformat(raw_date), activity_id
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Cursor de paginación inválido")
+
+def parse_page_params(limit=None, cursor=None):
+    """
+    Valida los parámetros de paginación recibidos en la URL.
+    Devuelve (limit, (fecha, id) | None), o (None, None) si no se pidió paginar.
+    """
+    if limit is None and cursor is None:
+        return None, None
+
+    if limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        raise ValueError("El parámetro 'limit' debe ser un número entero")
+
+    if limit < 1 or limit > MAX_PAGE_LIMIT:
+        raise ValueError(f"El parámetro 'limit' debe estar entre 1 y {MAX_PAGE_LIMIT}")
+
+    return limit, decode_cursor(cursor) if cursor else None
+
+def order_by_keyset(stmt):
+    """Aplica el orden de la clave de paginación (fecha desc, id desc)"""
+    return stmt.order_by(
+        ActivitiesResearchHotbed.date_activitiesResearchHotbed.desc(),
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed.desc()
+    )
+
+def paginate_activities(stmt, limit, position=None):
+    """
+    Ejecuta el SELECT del listado y devuelve (filas, next_cursor) de una página.
+    Se pide un registro de más para saber si existe una página siguiente.
+    """
+    if position:
+        last_date, last_id = position
+        stmt = stmt.where(or_(
+            ActivitiesResearchHotbed.date_activitiesResearchHotbed < last_date,
+            and_(
+                ActivitiesResearchHotbed.date_activitiesResearchHotbed == last_date,
+                ActivitiesResearchHotbed.idactivitiesResearchHotbed < last_id
+            )
+        ))
+
+    activities = db.session.execute(order_by_keyset(stmt).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(activities) > limit:
+        activities = activities[:limit]
+        last = activities[-1]
+        next_cursor = encode_cursor(last.date_activitiesResearchHotbed, last.idactivitiesResearchHotbed)
+
+    return activities, next_cursor
@@ -0,0 +1,103 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Conteo de sentencias SQL y tiempo en base de datos.
+# Los eventos del motor suman cada sentencia a los contadores activos del
+# contexto actual (el de la petición o el de un bloque count_queries). Con
+# QUERY_STATS=1 cada respuesta incluye X-Query-Count y Server-Timing, visibles
+# en las herramientas de desarrollo del navegador. Las pruebas usan
+# count_queries para fijar un máximo de consultas por endpoint.
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+_active_counters = ContextVar('active_query_counters', default=())
+_hooks_installed = False
+
+class QueryCounter:
+    """Sentencias ejecutadas y tiempo acumulado en base de datos (segundos)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+@contextmanager
+def count_queries():
+    """Cuenta las sentencias ejecutadas dentro del bloque (se pueden anidar)"""
+    install_query_hooks()
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_counters.get():
+        conn.info.setdefault('query_stats_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counters = _active_counters.get()
+    started = conn.info.get('query_stats_started')
+    if not counters or not started:
+        return
+
+    elapsed = time.perf_counter() - started.pop()
+    for counter in counters:
+        counter.count += 1
+        counter.duration += elapsed
+        counter.statements.append(statement)
+
+def install_query_hooks():
+    """Registra los eventos en todos los motores (una sola vez)"""
+    global _hooks_installed
+    if not _hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _hooks_installed = True
+
+def query_stats_enabled(app):
+    return bool(app.config.get('QUERY_STATS')) or os.getenv('QUERY_STATS', '').lower() in ('1', 'true')
+
+def init_query_stats(app):
+    """Agrega X-Query-Count y Server-Timing a las respuestas si QUERY_STATS está activo"""
+    if not query_stats_enabled(app):
+        return
+
+    install_query_hooks()
+
+    @app.before_request
+    def start_query_stats():
+        g.query_counter = QueryCounter()
+        g.query_counter_token = _active_counters.set(_active_counters.get() + (g.query_counter,))
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def add_query_stats_headers(response):
+        counter = g.get('query_counter')
+        if counter is None:
+            return response
+
+        # En las descargas en streaming solo cuenta lo ejecutado antes de enviar los headers
+        total_ms = (time.perf_counter() - g.request_started) * 1000
+        response.headers[QUERY_COUNT_HEADER] = str(counter.count)
+        response.headers['Server-Timing'] = (
+            f'db;dur={counter.duration * 1000:.1f};desc="{counter.count} consultas", app;dur={total_ms:.1f}'
+        )
+        return response
+
+    @app.teardown_request
+    def stop_query_stats(exception=None):
+        token = g.pop('query_counter_token', None)
+        if token is None:
+            return
+        try:
+            _active_counters.reset(token)
+        except ValueError:
+            # El cierre de una respuesta en streaming puede ocurrir en otro contexto
+            pass
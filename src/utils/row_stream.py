@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from datetime import date, time
+from db.connection import db
+
+# Exportación de filas en streaming (CSV o NDJSON) para scripts y cargadores
+# que solo necesitan los datos. El SELECT se ejecuta con yield_per (cursor del
+# lado del servidor en MySQL) y cada lote se codifica y se envía apenas llega,
+# así la memoria no crece con el número de filas.
+
+STREAM_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Filas por lote leídas del cursor
+STREAM_BATCH_SIZE = 500
+
+def stream_query_records(stmt, to_records, batch_size=None):
+    """Ejecuta el SELECT en streaming y genera los registros de cada lote"""
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size or STREAM_BATCH_SIZE))
+    try:
+        for partition in result.partitions():
+            yield to_records(partition)
+    finally:
+        result.close()
+
+def encode_records(batches, fmt, columns):
+    """Codifica lotes de registros (diccionarios) en CSV o NDJSON, un fragmento por lote"""
+    if fmt == 'csv':
+        return _encode_csv(batches, columns)
+    if fmt == 'ndjson':
+        return _encode_ndjson(batches)
+    raise ValueError(f"Formato de exportación desconocido: {fmt}")
+
+def _encode_csv(batches, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # El encabezado se envía antes de ejecutar la consulta
+    writer.writerow(columns)
+    yield _take(buffer)
+
+    for records in batches:
+        writer.writerows([_csv_value(record.get(column)) for column in columns] for record in records)
+        yield _take(buffer)
+
+def _encode_ndjson(batches):
+    for records in batches:
+        if records:
+            yield ''.join(json.dumps(record, default=_json_value, ensure_ascii=False) + '\n' for record in records)
+
+def _take(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return '; '.join(str(item) for item in value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+def _json_value(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
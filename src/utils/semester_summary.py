@@ -0,0 +1,190 @@
+import logging
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select, delete, union, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models.activities_researchHotbed import ActivitiesResearchHotbed
+from models.activity_authors import ActivityAuthors
+from models.activity_semester_summary import ActivitySemesterSummary
+from models.users_research_hotbed import UsersResearchHotbed
+from db.connection import db
+from utils.activity_stats import activity_stat_columns, STAT_KEYS
+from utils.listing_versions import HOTBED_SCOPE, USER_SCOPE
+
+# Tabla de resumen por semestre con los totales de actividades que muestran
+# los reportes: cantidad, horas, aprobadas y por tipo.
+# - Fila del usuario (scope 'user'): actividades que el usuario creó o de las
+#   que es autor o co-autor en cualquiera de sus semilleros, cada una contada
+#   una vez.
+# - Fila del semillero (scope 'hotbed'): actividades creadas por sus
+#   miembros, cada una contada una vez.
+# Las escrituras de actividades toman el aporte de la actividad a cada fila
+# antes y después del cambio (activity_contributions) y aplican la diferencia
+# con apply_summary_changes, un upsert que suma sobre el valor guardado
+# (total = total + cambio). Así dos escrituras concurrentes sobre el mismo
+# semillero y semestre no se pisan: cada una suma solo su parte, sin
+# recalcular desde su propia foto de los datos. El comando
+# `flask rebuild-semester-summaries` recalcula la tabla completa (carga inicial
+# o reparación).
+
+logger = logging.getLogger(__name__)
+
+def _member_activities(user_ids=None, activity_ids=None):
+    """UNION (sin duplicados) de (usuario, actividad) como creador y como autor/co-autor"""
+    created = select(
+        UsersResearchHotbed.user_iduser.label('user_id'),
+        ActivitiesResearchHotbed.idactivitiesResearchHotbed.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    )
+
+    authored = select(
+        UsersResearchHotbed.user_iduser.label('user_id'),
+        ActivityAuthors.activity_id.label('activity_id')
+    ).join(
+        UsersResearchHotbed, ActivityAuthors.user_research_hotbed_id == UsersResearchHotbed.idusersResearchHotbed
+    )
+
+    if user_ids is not None:
+        created = created.where(UsersResearchHotbed.user_iduser.in_(user_ids))
+        authored = authored.where(UsersResearchHotbed.user_iduser.in_(user_ids))
+    if activity_ids is not None:
+        created = created.where(ActivitiesResearchHotbed.idactivitiesResearchHotbed.in_(activity_ids))
+        authored = authored.where(ActivityAuthors.activity_id.in_(activity_ids))
+
+    return union(created, authored).subquery()
+
+def compute_user_summaries(semesters=None, user_ids=None, activity_ids=None):
+    """Filas de resumen por usuario calculadas desde las actividades"""
+    memberships = _member_activities(user_ids, activity_ids)
+    stmt = select(
+        memberships.c.user_id,
+        ActivitiesResearchHotbed.semester,
+        *activity_stat_columns()
+    ).join(
+        ActivitiesResearchHotbed, ActivitiesResearchHotbed.idactivitiesResearchHotbed == memberships.c.activity_id
+    ).group_by(
+        memberships.c.user_id, ActivitiesResearchHotbed.semester
+    )
+    if semesters is not None:
+        stmt = stmt.where(ActivitiesResearchHotbed.semester.in_(semesters))
+
+    return db.session.execute(stmt).all()
+
+def compute_hotbed_summaries(semesters=None, hotbed_ids=None, activity_ids=None):
+    """Filas totales por semillero calculadas desde las actividades"""
+    stmt = select(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed.label('hotbed_id'),
+        ActivitiesResearchHotbed.semester,
+        *activity_stat_columns()
+    ).join(
+        UsersResearchHotbed, ActivitiesResearchHotbed.usersResearchHotbed_idusersResearchHotbed == UsersResearchHotbed.idusersResearchHotbed
+    ).group_by(
+        UsersResearchHotbed.researchHotbed_idresearchHotbed, ActivitiesResearchHotbed.semester
+    )
+    if semesters is not None:
+        stmt = stmt.where(ActivitiesResearchHotbed.semester.in_(semesters))
+    if hotbed_ids is not None:
+        stmt = stmt.where(UsersResearchHotbed.researchHotbed_idresearchHotbed.in_(hotbed_ids))
+    if activity_ids is not None:
+        stmt = stmt.where(ActivitiesResearchHotbed.idactivitiesResearchHotbed.in_(activity_ids))
+
+    return db.session.execute(stmt).all()
+
+def _summary_values(rows):
+    """Filas calculadas -> valores de la tabla (scope, scope_id, semester y totales)"""
+    values = []
+    for row in rows:
+        mapping = row._mapping
+        if 'hotbed_id' in mapping:
+            scope, scope_id = HOTBED_SCOPE, mapping['hotbed_id']
+        else:
+            scope, scope_id = USER_SCOPE, mapping['user_id']
+        values.append({
+            'scope': scope,
+            'scope_id': scope_id,
+            'semester': row.semester,
+            **{key: mapping[key] for key in STAT_KEYS}
+        })
+    return values
+
+def activity_contributions(activity_ids):
+    """
+    Aporte actual de las actividades a la tabla de resumen:
+    {(scope, scope_id, semester): {total_activities, total_hours, ...}}
+    """
+    activity_ids = list(activity_ids)
+    if not activity_ids:
+        return {}
+
+    rows = compute_hotbed_summaries(activity_ids=activity_ids) + compute_user_summaries(activity_ids=activity_ids)
+    return {
+        (value['scope'], value['scope_id'], value['semester']): {key: value[key] for key in STAT_KEYS}
+        for value in _summary_values(rows)
+    }
+
+def apply_summary_changes(before, after):
+    """
+    Aplica a la tabla la diferencia entre dos aportes de activity_contributions
+    (antes y después de la escritura) dentro de la transacción actual, con un
+    único upsert que suma sobre los valores guardados. No hace commit.
+    """
+    changes = []
+    for summary_key in sorted(set(before) | set(after)):
+        old = before.get(summary_key, {})
+        new = after.get(summary_key, {})
+        delta = {key: new.get(key, 0) - old.get(key, 0) for key in STAT_KEYS}
+        if any(delta.values()):
+            scope, scope_id, semester = summary_key
+            changes.append({'scope': scope, 'scope_id': scope_id, 'semester': semester, **delta})
+
+    if not changes:
+        return
+
+    if db.session.get_bind().dialect.name == 'mysql':
+        stmt = mysql_insert(ActivitySemesterSummary).values(changes)
+        stmt = stmt.on_duplicate_key_update(**{
+            key: getattr(ActivitySemesterSummary, key) + stmt.inserted[key] for key in STAT_KEYS
+        })
+    else:
+        # SQLite (pruebas)
+        stmt = sqlite_insert(ActivitySemesterSummary).values(changes)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['scope', 'semester', 'scope_id'],
+            set_={key: getattr(ActivitySemesterSummary, key) + stmt.excluded[key] for key in STAT_KEYS}
+        )
+    db.session.execute(stmt)
+
+    # Las filas que quedaron sin actividades se eliminan (la reconstrucción no las crea)
+    db.session.execute(delete(ActivitySemesterSummary).where(
+        tuple_(ActivitySemesterSummary.scope, ActivitySemesterSummary.scope_id, ActivitySemesterSummary.semester).in_(
+            [(change['scope'], change['scope_id'], change['semester']) for change in changes]
+        ),
+        ActivitySemesterSummary.total_activities <= 0
+    ))
+
+def rebuild_semester_summaries(semester=None):
+    """Recalcula toda la tabla de resumen (o solo un semestre) y hace commit"""
+    semesters = [semester] if semester else None
+
+    stmt = delete(ActivitySemesterSummary)
+    if semester:
+        stmt = stmt.where(ActivitySemesterSummary.semester == semester)
+    db.session.execute(stmt)
+
+    values = _summary_values(compute_user_summaries(semesters) + compute_hotbed_summaries(semesters))
+    if values:
+        db.session.execute(ActivitySemesterSummary.__table__.insert(), values)
+    db.session.commit()
+
+    return len(values)
+
+@click.command('rebuild-semester-summaries')
+@click.option('--semester', default=None, help="Semestre a recalcular (por defecto todos)")
+@with_appcontext
+def rebuild_semester_summaries_command(semester):
+    """Recalcula la tabla de resumen de actividades por semestre."""
+    count = rebuild_semester_summaries(semester)
+    logger.info("Resumen por semestre recalculado: %s filas", count)
+    click.echo(f"Resumen por semestre recalculado: {count} filas")
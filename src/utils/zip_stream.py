@@ -0,0 +1,59 @@
+import zipfile
+
+# Escritura de archivos ZIP en streaming.
+# zipfile admite destinos no posicionables (sin seek/tell): en ese caso escribe
+# cada entrada con su descriptor de datos al final, así los bytes de cada
+# archivo pueden enviarse al cliente apenas se agregan, sin armar el ZIP
+# completo en memoria.
+
+class _ChunkBuffer:
+    """Destino de solo escritura que acumula los bytes hasta que se consumen"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_zip(entries, compression=zipfile.ZIP_STORED):
+    """
+    Genera los bytes de un ZIP a partir de pares (nombre, contenido) a medida
+    que llegan. Por defecto las entradas se guardan sin comprimir: los libros
+    Excel ya son archivos ZIP comprimidos.
+    """
+    buffer = _ChunkBuffer()
+    names = set()
+
+    with zipfile.ZipFile(buffer, 'w', compression=compression) as archive:
+        for name, content in entries:
+            archive.writestr(unique_name(name, names), content)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
+
+def unique_name(name, names):
+    """Agrega un sufijo numérico si el nombre ya existe en el ZIP"""
+    base, dot, extension = name.rpartition('.')
+    if not dot:
+        base, extension = name, ''
+
+    candidate, counter = name, 1
+    while candidate in names:
+        counter += 1
+        candidate = f"{base}_{counter}{dot}{extension}"
+
+    names.add(candidate)
+    return candidate